@@ -0,0 +1,96 @@
+"""Batch CLI throughput benchmark.
+
+Writes generated scenario files (an initial cost, uniform, gradient,
+geometric and irregular series, a rate schedule, and all calculations) to a
+temporary directory and evaluates them with run_batch at 1, 2, 4, ...
+worker processes, up to the CPU count. It runs once without rendering and
+once rendering every diagram to PNG, and prints the files per second of each
+run and the speed-up against one worker. Pass the file counts and worker
+counts to override the defaults:
+
+    python -m benchmarks.batch_throughput
+    python -m benchmarks.batch_throughput --files 20000 --render-files 2000 --workers 1 2 4 8
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from econogram.batch import CALCULATIONS, JsonlSink, run_batch
+from benchmarks.common import default_workers, print_table
+
+DEFAULT_FILES = 2_000
+DEFAULT_RENDER_FILES = 200
+SEED = 0
+
+
+def write_scenarios(directory, count, seed=SEED):
+    """Write count scenario files into directory and return their paths."""
+    rng = np.random.default_rng(seed)
+    paths = []
+    for number in range(count):
+        length = int(rng.integers(10, 60))
+        scenario = {
+            "name": f"Scenario {number}",
+            "interest_rate": round(float(rng.uniform(3, 12)), 2),
+            "rate_schedule": [{"start": length // 2, "end": length, "rate": round(float(rng.uniform(3, 12)), 2)}],
+            "series": [
+                {"type": "single", "name": "Investment", "period": 0, "amount": -float(rng.integers(5, 50)) * 1000},
+                {"type": "uniform", "name": "Revenue", "amount": float(rng.integers(1, 8)) * 500, "start": 1,
+                 "length": length},
+                {"type": "gradient", "name": "Upkeep", "gradient": -float(rng.integers(5, 50)), "start": 1,
+                 "length": length},
+                {"type": "geometric", "name": "Energy", "amount": -float(rng.integers(100, 500)),
+                 "growth": round(float(rng.uniform(0, 5)), 2), "start": 1, "length": length},
+                {"type": "flows", "name": "Overhaul", "periods": [length // 3, 2 * length // 3],
+                 "amounts": [-float(rng.integers(1, 10)) * 1000] * 2},
+            ],
+            "calculations": list(CALCULATIONS),
+        }
+        path = os.path.join(directory, f"scenario_{number:06d}.json")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(scenario, file)
+        paths.append(path)
+    return paths
+
+
+def timed_batch(paths, workers, render_dir=None):
+    """Run one batch into a discarded JSON Lines sink; return (seconds, failed files)."""
+    with open(os.devnull, "w") as devnull:
+        start = time.perf_counter()
+        count, errors = run_batch(paths, JsonlSink(devnull), workers=workers, render_dir=render_dir)
+        seconds = time.perf_counter() - start
+    assert count == len(paths)
+    return seconds, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.batch_throughput")
+    parser.add_argument("--files", type=int, default=DEFAULT_FILES, help="scenario files evaluated without rendering")
+    parser.add_argument("--render-files", type=int, default=DEFAULT_RENDER_FILES,
+                        help="scenario files evaluated and rendered")
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers())
+    args = parser.parse_args(argv)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        scenario_dir = os.path.join(directory, "scenarios")
+        render_dir = os.path.join(directory, "charts")
+        os.makedirs(scenario_dir)
+        os.makedirs(render_dir)
+        paths = write_scenarios(scenario_dir, max(args.files, args.render_files))
+        for label, files, target in (("evaluate", args.files, None), ("render", args.render_files, render_dir)):
+            runs = {workers: timed_batch(paths[:files], workers, target) for workers in args.workers}
+            for workers, (seconds, errors) in runs.items():
+                speed_up = f"{runs[1][0] / seconds:.2f}x" if 1 in runs else "-"
+                rows.append((label, workers, f"{files:,}", f"{seconds:.2f} s", f"{files / seconds:,.1f}", speed_up,
+                             errors))
+    print(f"{os.cpu_count()} CPUs")
+    print_table(("mode", "workers", "files", "time", "files/s", "speed-up", "failed"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Helpers shared by the benchmark scripts.
+
+Each benchmark is run from the repository root as a module, for example
+
+    python -m benchmarks.stacked_bars
+
+and prints a table of timings. Figures vary between machines; compare the
+rows of one run rather than runs on different machines.
+
+The headless stand-ins at the end let the plotting benchmarks (and the
+tests) drive update_plot without a display.
+"""
+import os
+import sys
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import numpy as np
+
+from econogram.core.store import CashFlowStore
+from econogram.core.rates import RateSchedule
+
+
+def best_time(function, repeat=3):
+    """Return the fastest of repeat calls of function(), in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def random_store(rows, periods, series_count=20, seed=0):
+    """Return a store of rows flows, split over series_count series, at random periods in [0, periods)."""
+    rng = np.random.default_rng(seed)
+    store = CashFlowStore(capacity=rows)
+    for series_id, chunk in enumerate(np.array_split(np.arange(rows), series_count), start=1):
+        store.append_series(series_id, f"Series {series_id}", f"C{series_id % 10}",
+                            rng.integers(0, periods, len(chunk)), np.round(rng.normal(0, 100, len(chunk)), 2))
+    return store
+
+
+def print_table(header, rows):
+    """Print rows of cells under header, each column right-aligned to its widest cell."""
+    cells = [list(map(str, header))] + [list(map(str, row)) for row in rows]
+    widths = [max(len(row[column]) for row in cells) for column in range(len(header))]
+    for row in cells:
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+
+
+def milliseconds(seconds):
+    return f"{seconds * 1000:,.1f} ms"
+
+
+def default_workers():
+    """Worker counts 1, 2, 4, ... up to and including the CPU count."""
+    cpus = os.cpu_count() or 1
+    return sorted({1, cpus} | {2 ** power for power in range(cpus.bit_length()) if 2 ** power <= cpus})
+
+
+def rss_bytes():
+    """Return the resident set size of this process, or None where it can't be read."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current size; ru_maxrss is kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _Widget:
+    def pack(self, **options):
+        pass
+
+
+class AggCanvas(FigureCanvasAgg):
+    """An Agg canvas with the one Tk widget method create_canvas calls."""
+
+    def __init__(self, figure, master=None):
+        super().__init__(figure)
+
+    def get_tk_widget(self):
+        return _Widget()
+
+
+def use_agg_canvas(monkeypatch=None):
+    """Make update_plot create AggCanvas instead of FigureCanvasTkAgg (through monkeypatch when given)."""
+    import scripts.Update_Plot as Update_Plot
+    if monkeypatch is not None:
+        monkeypatch.setattr(Update_Plot, "FigureCanvasTkAgg", AggCanvas)
+    else:
+        Update_Plot.FigureCanvasTkAgg = AggCanvas
+
+
+class PlotApp:
+    """The state of CashFlowDiagramApp that update_plot and the selection overlay use."""
+
+    def __init__(self, store=None, rate=0.05):
+        self.store = store if store is not None else CashFlowStore()
+        self.rate_schedule = RateSchedule(rate)
+        self.reference_period = 0
+        self.show_balance = False
+        self.graph_frame = None
+        self.figure = None
+        self.ax = None
+        self.canvas = None
+        self.selected_indices = []
+        self.selection_overlay = None
+        self.selection_background = None
+        self.bar_chunks = {}
+        self.envelope_collection = None
+        self.view_xlim = None
+        self.pan_start = None
+        self.bar_layout = None
+        self.bar_index = None
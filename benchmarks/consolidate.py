@@ -0,0 +1,67 @@
+"""Consolidate All Periods benchmark.
+
+Nets 100k flows to one flow per period with consolidate_periods, in place
+and as a new series. It compares that with combining the flows of each
+period in turn the way combine_cash_flows used to (drop, reset_index,
+concat), which is what cleaning up a diagram took before. That loop is
+timed for REFERENCE_MAX_PERIODS periods at most. The net flows of both
+must agree.
+
+    python -m benchmarks.consolidate
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from econogram.core.operations import consolidate_periods
+from benchmarks.common import best_time, random_store, print_table, milliseconds
+
+FLOWS = 100_000
+PERIOD_COUNTS = (360, 20_000)
+REFERENCE_MAX_PERIODS = 360
+
+
+def combine_each_period(frame):
+    """The old way: one combine per period, each dropping rows and concatenating the total."""
+    for period in frame["Period"].unique():
+        selected = frame.index[frame["Period"] == period]
+        new_entry = pd.DataFrame({"Period": [period], "Cash Flow": [frame.loc[selected, "Cash Flow"].sum()],
+                                  "Color": ["C0"], "Series_ID": [0], "Series_Name": ["Net Cash Flow"]})
+        frame = frame.drop(selected).reset_index(drop=True)
+        frame = pd.concat([frame, new_entry], ignore_index=True)
+    return frame
+
+
+def consolidate_time(periods, make_new_series, repeat=3):
+    """Best time of consolidate_periods, each run on a fresh store built beforehand."""
+    times = []
+    for store in [random_store(FLOWS, periods) for _ in range(repeat)]:
+        start = time.perf_counter()
+        consolidate_periods(store, make_new_series)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    rows = []
+    for periods in PERIOD_COUNTS:
+        in_place = consolidate_time(periods, False)
+        new_series = consolidate_time(periods, True)
+        if periods <= REFERENCE_MAX_PERIODS:
+            frame = random_store(FLOWS, periods).to_frame()
+            per_period = best_time(lambda: combine_each_period(frame), repeat=1)
+            old = combine_each_period(frame).sort_values("Period")
+            old = old[old["Cash Flow"] != 0]
+            store = random_store(FLOWS, periods)
+            consolidate_periods(store)
+            agree = np.array_equal(old["Period"].to_numpy(), store.period) and np.allclose(old["Cash Flow"], store.amount)
+            rows.append((f"{FLOWS:,}", f"{periods:,}", milliseconds(in_place), milliseconds(new_series),
+                         milliseconds(per_period), f"{per_period / in_place:,.0f}x", agree))
+        else:
+            rows.append((f"{FLOWS:,}", f"{periods:,}", milliseconds(in_place), milliseconds(new_series), "-", "-", "-"))
+    print_table(("flows", "periods", "in place", "new series", "combine per period", "speed-up", "same totals"), rows)
+
+
+if __name__ == "__main__":
+    main()
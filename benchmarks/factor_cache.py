@@ -0,0 +1,91 @@
+"""Interest factor cache benchmark.
+
+Repeats PV, FV and AV operations and the status bar's whole-diagram worth
+REPEATS times at a fixed rate. It runs them once with the shared factor cache
+and once with a cache that computes every power afresh, and prints the hit,
+miss and direct counters of the cached run. It then checks the cases the
+cache must not blow up on: one flow 50M periods away and a dense 1M-period
+diagram.
+
+    python -m benchmarks.factor_cache
+"""
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+import econogram.core.operations
+import econogram.core.rates
+import econogram.core.series
+import econogram.core.tvm
+from econogram.core.factors import InterestFactorCache
+from econogram.core.operations import present_worths, future_worths, annual_worth
+from econogram.core.series import UniformSeries, GradientSeries
+from econogram.core.tvm import net_worths
+from benchmarks.common import best_time, random_store, print_table, milliseconds
+
+RATE = 0.07
+REPEATS = 1_000
+MODULES = (econogram.core.operations, econogram.core.rates, econogram.core.series, econogram.core.tvm)
+
+
+class UncachedFactors(InterestFactorCache):
+    """Computes every power directly, as before the cache."""
+
+    def table(self, rate, low, high, count=1):
+        self.direct += 1
+        return None
+
+
+@contextmanager
+def factor_service(cache):
+    """Make every calculation module use cache instead of the shared factor_cache."""
+    previous = [module.factor_cache for module in MODULES]
+    for module in MODULES:
+        module.factor_cache = cache
+    try:
+        yield cache
+    finally:
+        for module, original in zip(MODULES, previous):
+            module.factor_cache = original
+
+
+def repeated_operations(store, series):
+    for _ in range(REPEATS):
+        present_worths(store, store.row_id, RATE)
+        future_worths(store, store.row_id, RATE)
+        annual_worth(1000.0, 0, 360, RATE)
+        net_worths(store.period, store.amount, RATE, 0)
+        for spec in series:
+            spec.present_worth(RATE)
+            spec.future_worth(RATE)
+
+
+def main():
+    store = random_store(2_000, 360)
+    series = [UniformSeries(100, 1, 360), GradientSeries(10, 1, 240)]
+    rows = []
+    for label, cache in (("cached", InterestFactorCache()), ("uncached", UncachedFactors())):
+        with factor_service(cache):
+            seconds = best_time(lambda: repeated_operations(store, series), repeat=1)
+            stats = cache.stats()
+        rows.append((label, milliseconds(seconds), stats["hits"], stats["misses"], stats["direct"]))
+    print(f"{REPEATS:,} rounds of PV, FV, AV and whole-diagram worth on 2,000 flows over 360 periods, "
+          f"plus two parametric series:")
+    print_table(("factors", "time", "hits", "misses", "direct"), rows)
+    print()
+
+    edge_rows = []
+    # Future worths that far out overflow to infinity
+    with factor_service(InterestFactorCache()) as cache, np.errstate(over="ignore"):
+        for label, periods in (("one flow 50M periods out", np.array([0, 50_000_000])),
+                               ("dense 1M periods", np.arange(1_000_000))):
+            start = time.perf_counter()
+            net_worths(periods, np.ones(len(periods)), RATE, 0)
+            seconds = time.perf_counter() - start
+            edge_rows.append((label, milliseconds(seconds), sum(len(table.values) for table in cache.tables.values())))
+    print_table(("net_worths", "time", "cached powers"), edge_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Long-horizon redraw benchmark.
+
+Redraws diagrams of 300 to 1M periods, one flow per period in each of two
+series, through update_plot. Once periods outnumber the axes' pixel columns
+it draws per-column envelopes and lets an adaptive locator pick the ticks,
+so the cost should level off. The reference draws every bar in one
+collection with the old range(...) ticks, and is timed up to
+REFERENCE_MAX_PERIODS.
+
+    python -m benchmarks.long_horizon
+"""
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from scripts.Update_Plot import update_plot
+from econogram.core.store import CashFlowStore
+from econogram.render import compute_bar_layout, bar_vertices
+from benchmarks.common import best_time, print_table, milliseconds, PlotApp, use_agg_canvas
+
+HORIZONS = (300, 1_000, 10_000, 100_000, 1_000_000)
+REFERENCE_MAX_PERIODS = 100_000
+
+
+def horizon_store(periods, seed=0):
+    rng = np.random.default_rng(seed)
+    store = CashFlowStore(capacity=2 * periods)
+    store.append_series(1, "Revenue", "C0", np.arange(periods), rng.uniform(50, 150, periods))
+    store.append_series(2, "Costs", "C1", np.arange(periods), -rng.uniform(20, 120, periods))
+    return store
+
+
+def every_bar_redraw(store):
+    """Draw every bar and one tick per 5 periods, as before level-of-detail rendering."""
+    figure = Figure(figsize=(10, 8))
+    FigureCanvasAgg(figure)
+    figure.subplots_adjust(right=0.7)
+    ax = figure.add_subplot()
+    layout = compute_bar_layout(store)
+    ax.add_collection(PolyCollection(bar_vertices(layout), linewidths=0))
+    max_period = int(store.period.max())
+    ax.set_xticks(range(0, max_period + 6, 5))
+    ax.set_xlim(-0.5, max_period + 5.5)
+    ax.autoscale_view(scalex=False)
+    figure.canvas.draw()
+
+
+def main():
+    use_agg_canvas()
+    rows = []
+    for periods in HORIZONS:
+        store = horizon_store(periods)
+        app = PlotApp(store)
+        update_plot(app)
+        redraw = best_time(lambda: update_plot(app))
+        mode = "envelopes" if app.envelope_collection is not None else "bars"
+        ticks = len(app.ax.get_xticks())
+        if periods <= REFERENCE_MAX_PERIODS:
+            reference = milliseconds(best_time(lambda: every_bar_redraw(store), repeat=1))
+        else:
+            reference = "-"
+        rows.append((f"{periods:,}", mode, ticks, milliseconds(redraw), reference))
+    print_table(("periods", "mode", "x ticks", "update_plot", "every bar + range ticks"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Monte Carlo scaling benchmark.
+
+Runs the same seeded simulation of a 40-period diagram with 1, 2, 4, ...
+worker processes, up to the CPU count. Workers are started with "spawn", as
+the simulation panel does. Reports the speed-up and the parallel efficiency
+against one worker, and checks that every run returns exactly the same
+trials. Pass the trial count and worker counts to override the defaults:
+
+    python -m benchmarks.monte_carlo_scaling
+    python -m benchmarks.monte_carlo_scaling --trials 4000000 --workers 1 2 4 8
+"""
+import argparse
+import multiprocessing
+import os
+
+import numpy as np
+
+from econogram.core.monte_carlo import Distribution, SimulationModel, run_simulation
+from econogram.core.store import CashFlowStore
+from benchmarks.common import best_time, print_table, default_workers
+
+DEFAULT_TRIALS = 1_000_000
+SEED = 12345
+
+
+def simulation_model():
+    store = CashFlowStore()
+    store.append_series(1, "Plant", "C0", [0], [-250_000.0])
+    store.append_series(2, "Revenue", "C1", np.arange(1, 41), 30_000.0)
+    store.append_series(3, "Operating cost", "C2", np.arange(1, 41), -9_000.0)
+    store.append_series(4, "Overhaul", "C3", [10, 20, 30], [-40_000.0] * 3)
+    return SimulationModel.from_store(store, Distribution("triangular", 0.9, 1, 1.1), Distribution("normal", 0, 0.01),
+                                      Distribution("triangular", 0.05, 0.07, 0.09))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.monte_carlo_scaling")
+    parser.add_argument("--trials", type=int, default=DEFAULT_TRIALS)
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers())
+    args = parser.parse_args(argv)
+
+    model = simulation_model()
+    context = multiprocessing.get_context("spawn")
+    runs = {}
+
+    def simulate(workers):
+        runs[workers] = run_simulation(model, args.trials, SEED, workers=workers, mp_context=context).npv
+
+    # One worker runs in this process; it is the reference for the speed-up and the trials
+    single = best_time(lambda: simulate(1), repeat=1)
+    rows = []
+    for workers in args.workers:
+        seconds = single if workers == 1 else best_time(lambda: simulate(workers), repeat=1)
+        speed_up = single / seconds
+        rows.append((workers, f"{seconds:.2f} s", f"{args.trials / seconds:,.0f}", f"{speed_up:.2f}x",
+                     f"{speed_up / workers:.0%}", np.array_equal(runs[workers], runs[1])))
+    print(f"{args.trials:,} trials on {os.cpu_count()} CPUs")
+    print_table(("workers", "time", "trials/s", "speed-up", "efficiency", "same trials"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Stacked bar rendering benchmark.
+
+Redraws a 360-period diagram of 1k, 10k and 100k flows through update_plot,
+which stacks every flow in one vectorized pass and draws the bars as
+PolyCollections, and compares it with the per-row ax.bar loop update_plot
+used before. The old loop is only timed up to BASELINE_MAX_ROWS; beyond
+that it takes minutes. Both must produce the same bars.
+
+    python -m benchmarks.stacked_bars
+"""
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from scripts.Update_Plot import update_plot
+from econogram.render import compute_bar_layout
+from benchmarks.common import best_time, random_store, print_table, milliseconds, PlotApp, use_agg_canvas
+
+SIZES = (1_000, 10_000, 100_000)
+PERIODS = 360
+BASELINE_MAX_ROWS = 10_000
+
+
+def per_row_bars(ax, frame):
+    """The old create_bars: filter and sort each period, then one ax.bar per flow."""
+    for period in frame["Period"].unique():
+        period_cash_flows = frame[frame["Period"] == period].sort_values(by="Cash Flow", ascending=False)
+        bottom_positive, bottom_negative = 0, 0
+        for i, row in period_cash_flows.iterrows():
+            cash_flow = row["Cash Flow"]
+            bottom = bottom_positive if cash_flow >= 0 else bottom_negative
+            bar = ax.bar(period, cash_flow, bottom=bottom, color=row["Color"], align="center")[0]
+            if cash_flow >= 0:
+                bottom_positive += cash_flow
+            else:
+                bottom_negative += cash_flow
+            bar.set_gid(i)
+
+
+def per_row_redraw(frame):
+    figure = Figure(figsize=(10, 8))
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+    per_row_bars(ax, frame)
+    figure.canvas.draw()
+    return ax
+
+
+def same_bars(store):
+    """Check that the vectorized layout draws the same rectangles as the per-row loop.
+
+    Rectangles are compared as a whole rather than by row id: flows of equal
+    amount in one period may be stacked in either order.
+    """
+    ax = per_row_redraw(store.to_frame())
+    old = sorted((bar.get_x() + bar.get_width() / 2, bar.get_y(), bar.get_height()) for bar in ax.patches)
+    layout = compute_bar_layout(store)
+    new = sorted(zip(layout.periods.tolist(), layout.bottoms.tolist(), layout.heights.tolist()))
+    return len(old) == len(new) and np.allclose(old, new)
+
+
+def main():
+    use_agg_canvas()
+    print(f"Same bars as the per-row loop: {same_bars(random_store(2_000, 40))}")
+    rows = []
+    for size in SIZES:
+        store = random_store(size, PERIODS)
+        app = PlotApp(store)
+        update_plot(app)
+        vectorized = best_time(lambda: update_plot(app))
+        if size <= BASELINE_MAX_ROWS:
+            frame = store.to_frame()
+            per_row = best_time(lambda: per_row_redraw(frame), repeat=1)
+            rows.append((f"{size:,}", milliseconds(vectorized), milliseconds(per_row), f"{per_row / vectorized:,.0f}x"))
+        else:
+            rows.append((f"{size:,}", milliseconds(vectorized), "-", "-"))
+    print_table(("flows", "update_plot", "per-row ax.bar", "speed-up"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Cash flow insert benchmark.
+
+Builds a diagram of 100 series of 1,000 periods each in a CashFlowStore, both
+from materialized rows (append_series) and by parameters (add_uniform_series),
+then reads it back as a DataFrame. The references grow a DataFrame with
+pd.concat: once per series, and once per period as Uniform_Series used to.
+The per-period loop is O(n^2) and is only run for the first
+PER_PERIOD_SERIES series.
+
+    python -m benchmarks.store_appends
+"""
+import numpy as np
+import pandas as pd
+
+from econogram.core.store import CashFlowStore
+from econogram.core.operations import add_uniform_series
+from benchmarks.common import best_time, print_table, milliseconds
+
+SERIES = 100
+PERIODS = 1_000
+PER_PERIOD_SERIES = 10
+COLUMNS = ["Period", "Cash Flow", "Color", "Series_ID", "Series_Name"]
+
+
+def append_rows():
+    store = CashFlowStore()
+    for series_id in range(1, SERIES + 1):
+        store.append_series(series_id, f"Series {series_id}", "C0", np.arange(PERIODS), 100.0)
+    return store
+
+
+def append_parametric():
+    store = CashFlowStore()
+    for series_id in range(1, SERIES + 1):
+        add_uniform_series(store, series_id, f"Series {series_id}", "C0", 100.0, 0, PERIODS)
+    return store
+
+
+def concat_per_series():
+    frame = pd.DataFrame(columns=COLUMNS)
+    for series_id in range(1, SERIES + 1):
+        series = pd.DataFrame({"Period": np.arange(PERIODS), "Cash Flow": 100.0, "Color": ["C0"] * PERIODS,
+                               "Series_ID": series_id, "Series_Name": f"Series {series_id}"})
+        frame = pd.concat([frame.dropna(axis=1, how="all"), series], ignore_index=True)
+    return frame
+
+
+def concat_per_period(series_count):
+    """The old Uniform_Series loop: one single-row concat per period."""
+    frame = pd.DataFrame(columns=COLUMNS)
+    for series_id in range(1, series_count + 1):
+        for period in range(PERIODS):
+            entry = pd.DataFrame({"Period": [period], "Cash Flow": [100.0], "Color": ["C0"],
+                                  "Series_ID": [series_id], "Series_Name": [f"Series {series_id}"]})
+            frame = frame.dropna(axis=1, how="all")
+            frame = pd.concat([frame, entry.dropna(axis=1, how="all")], ignore_index=True)
+    return frame
+
+
+def first_frame_time(build):
+    """Return the time of the first to_frame() of a freshly built store; later calls are cached."""
+    best = float("inf")
+    for _ in range(3):
+        store = build()
+        best = min(best, best_time(store.to_frame, repeat=1))
+    return best
+
+
+def main():
+    rows = [
+        ("CashFlowStore.append_series", f"{SERIES * PERIODS:,}", milliseconds(best_time(append_rows))),
+        ("add_uniform_series (parametric)", f"{SERIES * PERIODS:,}", milliseconds(best_time(append_parametric))),
+        ("to_frame() after append_series", "", milliseconds(first_frame_time(append_rows))),
+        ("to_frame() after add_uniform_series", "", milliseconds(first_frame_time(append_parametric))),
+        ("pd.concat per series", f"{SERIES * PERIODS:,}", milliseconds(best_time(concat_per_series))),
+        ("pd.concat per period (old)", f"{PER_PERIOD_SERIES * PERIODS:,}",
+         milliseconds(best_time(lambda: concat_per_period(PER_PERIOD_SERIES), repeat=1))),
+    ]
+    print_table(("insert", "flows", "time"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Present and future worth benchmark.
+
+Moves 100k selected flows, in 1 and in 100 series, to their present and
+future worth with present_worths/future_worths. Each series' factors are
+built as one vector and all series are reduced in one grouped pass. The
+reference is the old iterrows loop over each series calling
+calculate_present_value/calculate_future_value per row. The worths of
+both must agree.
+
+    python -m benchmarks.tvm_engine
+"""
+from econogram.core.operations import present_worths, future_worths
+from benchmarks.common import best_time, random_store, print_table, milliseconds
+
+FLOWS = 100_000
+SERIES_COUNTS = (1, 100)
+RATE = 0.05
+
+
+def calculate_present_value(cash_flow, rate, periods):
+    return cash_flow * ((1 + rate) ** periods)
+
+
+def calculate_future_value(cash_flow, rate, periods):
+    return cash_flow * ((1 + rate) ** periods)
+
+
+def per_row_worths(frame, forward):
+    """The old loop: each series is moved one row at a time with iterrows."""
+    worths = {}
+    for series_id in frame["Series_ID"].unique():
+        series_cash_flows = frame[frame["Series_ID"] == series_id]
+        if forward:
+            new_period = series_cash_flows["Period"].max()
+        else:
+            new_period = series_cash_flows["Period"].min() - 1
+        combined_value = 0
+        for _, row in series_cash_flows.iterrows():
+            if forward:
+                combined_value += calculate_future_value(row["Cash Flow"], RATE, new_period - row["Period"])
+            else:
+                combined_value += calculate_present_value(row["Cash Flow"], RATE, new_period - row["Period"])
+        worths[int(series_id)] = combined_value
+    return worths
+
+
+def main():
+    rows = []
+    for series_count in SERIES_COUNTS:
+        store = random_store(FLOWS, 360, series_count=series_count)
+        frame = store.to_frame()
+        for label, worths, forward in (("PV", present_worths, False), ("FV", future_worths, True)):
+            engine = best_time(lambda: worths(store, store.row_id, RATE), repeat=5)
+            per_row = best_time(lambda: per_row_worths(frame, forward), repeat=1)
+            expected = per_row_worths(frame, forward)
+            difference = max(abs(equivalent.value - expected[equivalent.series_id]) / max(1.0, abs(equivalent.value))
+                             for equivalent in worths(store, store.row_id, RATE))
+            rows.append((label, f"{FLOWS:,}", series_count, milliseconds(engine), milliseconds(per_row),
+                         f"{per_row / engine:,.0f}x", f"{difference:.1e}"))
+    print_table(("worth", "flows", "series", "engine", "iterrows", "speed-up", "max rel. difference"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Undo journal benchmark.
+
+Makes 10,000 small edits to a 100k-flow diagram (changing an amount,
+adding a flow, deleting a flow, inverting a 50-flow series, in turn),
+closing each into an undo step with no memory budget. It then undoes and
+redoes all of them, and reports the latency of each step and the memory the
+history holds. The reference is the old state_history: after each edit,
+compare the whole DataFrame with the last snapshot and store a full copy.
+It is timed over SNAPSHOT_EDITS edits, and its memory for 10,000 steps is
+extrapolated from one snapshot.
+
+    python -m benchmarks.undo_journal
+"""
+import time
+
+import numpy as np
+
+from econogram.core.journal import EditJournal
+from benchmarks.common import random_store, print_table, milliseconds, rss_bytes
+
+ROWS = 100_000
+EDITS = 10_000
+SNAPSHOT_EDITS = 200
+SERIES_LENGTH = 50
+
+
+def edit(store, step, rng):
+    """Make the step-th edit: change an amount, add a flow, delete a flow or invert a series."""
+    kind = step % 4
+    if kind == 0:
+        store.set_amounts([rng.choice(store.row_id)], [float(rng.normal(0, 100))])
+    elif kind == 1:
+        store.append_series(100 + step, f"Flow {step}", "C1", [int(rng.integers(0, 360))], [100.0])
+    elif kind == 2:
+        store.remove_rows([rng.choice(store.row_id)])
+    else:
+        store.scale_series([1 + step % SERIES_LENGTH], -1)
+
+
+def diagram():
+    return random_store(ROWS, 360, series_count=ROWS // SERIES_LENGTH)
+
+
+def timed_steps(step, count):
+    """Return the latency of each of count calls of step(i), in seconds."""
+    latencies = np.empty(count)
+    for i in range(count):
+        start = time.perf_counter()
+        step(i)
+        latencies[i] = time.perf_counter() - start
+    return latencies
+
+
+def latency_row(label, latencies):
+    return (label, f"{len(latencies):,}", milliseconds(latencies.mean()), milliseconds(np.percentile(latencies, 99)),
+            milliseconds(latencies.max()))
+
+
+def journal_rows():
+    store = diagram()
+    journal = EditJournal(store, memory_budget=None)
+    rng = np.random.default_rng(0)
+    original = store.to_frame().copy()
+    rss_before = rss_bytes()
+
+    def edit_and_checkpoint(step):
+        edit(store, step, rng)
+        journal.checkpoint()
+
+    edits = timed_steps(edit_and_checkpoint, EDITS)
+    rss_after = rss_bytes()
+    edited = store.to_frame()
+    undos = timed_steps(lambda step: journal.undo(), EDITS)
+    restored = store.to_frame().equals(original)
+    redos = timed_steps(lambda step: journal.redo(), EDITS)
+    print(f"Undoing every step restores the diagram: {restored}; "
+          f"redoing them restores the edits: {store.to_frame().equals(edited)}")
+    rows = [latency_row("edit + checkpoint", edits), latency_row("undo", undos), latency_row("redo", redos)]
+    memory = [("journal history", f"{journal.nbytes / 2 ** 20:,.1f} MB")]
+    if rss_before is not None:
+        memory.append(("RSS growth over the edits", f"{(rss_after - rss_before) / 2 ** 20:,.1f} MB"))
+    return rows, memory
+
+
+def snapshot_rows():
+    store = diagram()
+    rng = np.random.default_rng(0)
+    history = [store.to_frame().copy()]
+
+    def edit_and_snapshot(step):
+        edit(store, step, rng)
+        frame = store.to_frame()
+        if not frame.equals(history[-1]):
+            history.append(frame.copy())
+
+    snapshots = timed_steps(edit_and_snapshot, SNAPSHOT_EDITS)
+    snapshot_bytes = history[-1].memory_usage(deep=True).sum()
+    memory = [("one snapshot", f"{snapshot_bytes / 2 ** 20:,.1f} MB"),
+              (f"{EDITS:,} snapshots (extrapolated)", f"{EDITS * snapshot_bytes / 2 ** 30:,.1f} GB")]
+    return [latency_row("edit + snapshot (old)", snapshots)], memory
+
+
+def main():
+    journal_latency, journal_memory = journal_rows()
+    snapshot_latency, snapshot_memory = snapshot_rows()
+    print_table(("step", "count", "mean", "p99", "max"), journal_latency + snapshot_latency)
+    print()
+    print_table(("history", "memory"), journal_memory + snapshot_memory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""Econogram: cash flow diagrams and engineering economy calculations.
+
+The calculations live in econogram.core and need only NumPy and pandas; the
+Tk interface in scripts/ is built on top of them.
+"""
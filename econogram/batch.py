@@ -0,0 +1,262 @@
+"""Batch scenario evaluation module.
+
+Evaluates many scenario files without the interface and streams one result
+record per file to a CSV or JSON Lines file as soon as it is ready. Files are
+handed to a process pool in chunks; each worker process keeps one
+DiagramRenderer, so rendering diagrams with the Agg canvas reuses one figure per
+worker. Throughput is reported on stderr at the end.
+
+    python -m econogram.batch scenarios/ -o results.csv --workers 4 --render charts/
+
+A scenario is a JSON file; rates and growth are percentages, as in the dialogs:
+
+    {
+      "name": "Pump replacement",
+      "interest_rate": 8,
+      "rate_schedule": [{"start": 6, "end": 10, "rate": 12}],
+      "reference_period": 0,
+      "series": [
+        {"type": "single", "name": "Pump", "period": 0, "amount": -5000},
+        {"type": "uniform", "name": "Savings", "amount": 1200, "start": 1, "length": 10},
+        {"type": "gradient", "name": "Upkeep", "gradient": -50, "start": 1, "length": 10},
+        {"type": "geometric", "name": "Energy", "amount": 300, "growth": 3, "start": 1, "length": 10},
+        {"type": "flows", "name": "Overhaul", "periods": [4, 8], "amounts": [-400, -400]}
+      ],
+      "calculations": ["pv", "fv", "av", "irr", "payback"]
+    }
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from econogram.core import (CashFlowStore, RateSchedule, add_single_flow, add_uniform_series, add_gradient_series,
+                            add_geometric_series, net_worths, solve_irr, payback_periods)
+
+CALCULATIONS = ("pv", "fv", "av", "irr", "payback")
+DEFAULT_CALCULATIONS = ("pv", "fv", "av")
+RESULT_FIELDS = ["file", "name", "flows", "reference_period", "last_period", "pv", "fv", "av", "irr",
+                 "simple_payback", "discounted_payback", "image", "error"]
+DEFAULT_CHUNK_SIZE = 16  # scenario files sent to a worker at a time
+SCENARIO_EXTENSION = ".json"
+
+_renderer = None  # DiagramRenderer of this process, created on first use
+
+
+def load_scenario(path):
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def build_store(scenario):
+    """Return a CashFlowStore holding the series of a scenario."""
+    store = CashFlowStore()
+    for series_id, series in enumerate(scenario["series"], start=1):
+        kind = series.get("type", "single")
+        name = series.get("name", f"Series {series_id}")
+        # Matplotlib's default color cycle, for rendering
+        color = series.get("color", f"C{(series_id - 1) % 10}")
+        if kind == "single":
+            add_single_flow(store, series_id, name, color, series["period"], series["amount"])
+        elif kind == "uniform":
+            add_uniform_series(store, series_id, name, color, series["amount"], series["start"], series["length"])
+        elif kind == "gradient":
+            add_gradient_series(store, series_id, name, color, series["gradient"], series["start"],
+                                series["length"])
+        elif kind == "geometric":
+            add_geometric_series(store, series_id, name, color, series["amount"], series["growth"] / 100,
+                                 series["start"], series["length"])
+        elif kind == "flows":
+            if len(series["periods"]) != len(series["amounts"]):
+                raise ValueError(f"Series {name!r} has {len(series['periods'])} periods "
+                                 f"but {len(series['amounts'])} amounts.")
+            store.append_series(series_id, name, color, series["periods"], series["amounts"])
+        else:
+            raise ValueError(f"Unknown series type {kind!r}.")
+    return store
+
+
+def build_rate_schedule(scenario):
+    """Return the RateSchedule of a scenario."""
+    schedule = RateSchedule(scenario.get("interest_rate", 0) / 100)
+    for segment in scenario.get("rate_schedule", ()):
+        schedule.set_segment(segment["start"], segment["end"], segment["rate"] / 100)
+    return schedule
+
+
+def evaluate_scenario(scenario, calculations=None):
+    """Return the requested calculations of a scenario, as a dict keyed by RESULT_FIELDS, and its store."""
+    calculations = calculations or scenario.get("calculations", DEFAULT_CALCULATIONS)
+    unknown = set(calculations) - set(CALCULATIONS)
+    if unknown:
+        raise ValueError(f"Unknown calculations: {', '.join(sorted(unknown))}.")
+    store = build_store(scenario)
+    rate = build_rate_schedule(scenario)
+    reference = int(scenario.get("reference_period", 0))
+    periods, amounts = store.period, store.amount
+
+    result = {"name": scenario.get("name"), "flows": len(store), "reference_period": reference}
+    if {"pv", "fv", "av"} & set(calculations):
+        present, future, annual, last_period = net_worths(periods, amounts, rate, reference)
+        result["last_period"] = last_period
+        for key, value in (("pv", present), ("fv", future), ("av", annual)):
+            if key in calculations:
+                result[key] = value
+    if "irr" in calculations:
+        result["irr"] = [float(root) for root in solve_irr(periods, amounts).roots]
+    if "payback" in calculations:
+        result["simple_payback"], result["discounted_payback"] = payback_periods(periods, amounts, rate, 0.0,
+                                                                                 reference)
+    return result, store
+
+
+def evaluate_file(path, calculations=None, render_dir=None, image_format="png"):
+    """Evaluate one scenario file, rendering its diagram into render_dir if given.
+
+    Errors are reported in the "error" field of the record rather than raised,
+    so one bad file does not stop a batch.
+    """
+    global _renderer
+    record = {"file": path}
+    try:
+        scenario = load_scenario(path)
+        result, store = evaluate_scenario(scenario, calculations)
+        record.update(result)
+        if render_dir is not None:
+            if _renderer is None:
+                # Imported here so evaluating without rendering never loads matplotlib
+                from econogram.render import DiagramRenderer
+                _renderer = DiagramRenderer()
+            stem = os.path.splitext(os.path.basename(path))[0]
+            image = os.path.join(render_dir, f"{stem}.{image_format}")
+            _renderer.save(store, image, title=scenario.get("name") or "Cash Flow Diagram")
+            record["image"] = image
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+
+def evaluate_files(paths, calculations=None, render_dir=None, image_format="png"):
+    """Evaluate a chunk of scenario files; the unit of work sent to a worker process."""
+    return [evaluate_file(path, calculations, render_dir, image_format) for path in paths]
+
+
+def scenario_paths(inputs):
+    """Expand directories among inputs to the scenario files inside them, sorted by name."""
+    paths = []
+    for path in inputs:
+        if os.path.isdir(path):
+            paths.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                if name.endswith(SCENARIO_EXTENSION)))
+        else:
+            paths.append(path)
+    return paths
+
+
+class CsvSink:
+    """Writes result records as CSV rows; lists are joined with ";"."""
+
+    def __init__(self, file):
+        self.file = file
+        self.writer = csv.DictWriter(file, fieldnames=RESULT_FIELDS)
+        self.writer.writeheader()
+
+    def write(self, record):
+        row = {key: ";".join(map(str, value)) if isinstance(value, list) else value for key, value in record.items()}
+        self.writer.writerow(row)
+        self.file.flush()
+
+
+class JsonlSink:
+    """Writes result records as one JSON object per line."""
+
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, record):
+        self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+
+SINKS = {"csv": CsvSink, "jsonl": JsonlSink}
+
+
+def run_batch(paths, sink, calculations=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, render_dir=None,
+              image_format="png"):
+    """Evaluate every scenario file in paths and write each record to sink as it finishes.
+
+    Runs in this process when workers is 1, otherwise in chunks of chunk_size
+    files across a process pool. workers defaults to the CPU count. Returns the
+    number of files and the number that failed.
+    """
+    chunks = [paths[start:start + chunk_size] for start in range(0, len(paths), chunk_size)]
+    count = errors = 0
+
+    def write_records(records):
+        nonlocal count, errors
+        for record in records:
+            sink.write(record)
+            count += 1
+            errors += "error" in record
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            write_records(evaluate_files(chunk, calculations, render_dir, image_format))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(evaluate_files, chunk, calculations, render_dir, image_format)
+                       for chunk in chunks]
+            # Records are written in the order chunks finish
+            for future in as_completed(futures):
+                write_records(future.result())
+    return count, errors
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m econogram.batch",
+                                     description="Evaluate cash flow scenario files in parallel.")
+    parser.add_argument("inputs", nargs="+", help="scenario files, or directories of *.json scenario files")
+    parser.add_argument("-o", "--output", default="-", help="result file (.csv or .jsonl); default: stdout")
+    parser.add_argument("--format", choices=sorted(SINKS), help="result format; default: from the output extension")
+    parser.add_argument("--calculations", help=f"comma-separated list of {', '.join(CALCULATIONS)}; "
+                                               "overrides the scenario files")
+    parser.add_argument("-w", "--workers", type=int, help="worker processes; default: the CPU count")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="files per unit of work")
+    parser.add_argument("--render", metavar="DIR", help="also render each diagram into DIR")
+    parser.add_argument("--image-format", default="png", choices=("png", "svg", "pdf"))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    paths = scenario_paths(args.inputs)
+    calculations = args.calculations.split(",") if args.calculations else None
+    if calculations and set(calculations) - set(CALCULATIONS):
+        raise SystemExit(f"Unknown calculations: {args.calculations}. Choose from {', '.join(CALCULATIONS)}.")
+    sink_format = args.format or ("jsonl" if args.output.endswith(".jsonl") else "csv")
+    workers = args.workers or os.cpu_count() or 1
+    if args.render:
+        os.makedirs(args.render, exist_ok=True)
+
+    file = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        start = time.perf_counter()
+        count, errors = run_batch(paths, SINKS[sink_format](file), calculations, workers, args.chunk_size,
+                                  args.render, args.image_format)
+        elapsed = time.perf_counter() - start
+    finally:
+        if file is not sys.stdout:
+            file.close()
+
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    print(f"{count} scenarios ({errors} failed) in {elapsed:.2f} s: {rate:,.1f} files/s with {workers} workers",
+          file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
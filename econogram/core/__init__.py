@@ -0,0 +1,45 @@
+"""Calculation core of Econogram.
+
+Pure functions and data types for building cash flow diagrams and working out
+their worth, without Tk or matplotlib, so they can be used from scripts,
+notebooks and services:
+
+    from econogram.core import CashFlowStore, add_uniform_series, present_value
+
+    store = CashFlowStore()
+    add_uniform_series(store, 1, "Rent", "#1f77b4", 1000, start=1, length=10)
+    present_value(store, store.series_rows(1), rate=0.05)
+"""
+from econogram.core.store import CashFlowStore, SeriesInfo
+from econogram.core.journal import EditJournal
+from econogram.core.factors import factor_cache
+from econogram.core.series import UniformSeries, GradientSeries, GeometricSeries
+from econogram.core.rates import RateSchedule
+from econogram.core.tvm import compounding_factors, equivalent_value, net_flows, net_worths, npv_profile
+from econogram.core.irr import IRRResult, solve_irr, mirr
+from econogram.core.payback import simple_balance, discounted_balance, crossing_period, payback_periods
+from econogram.core.monte_carlo import Distribution, SimulationModel, SimulationResult, run_simulation
+from econogram.core.operations import (
+    DEFAULT_COLOR, NET_SERIES_NAME, Equivalent,
+    add_single_flow, add_uniform_series, add_gradient_series, add_geometric_series,
+    needs_target_period, present_worths, future_worths, apply_equivalents, present_value, future_value,
+    annual_worth, annual_value,
+    combine_flows, consolidate_periods, segment_cuts, split_segments, split_series, invert_series,
+)
+
+__all__ = [
+    "CashFlowStore", "SeriesInfo",
+    "EditJournal",
+    "factor_cache",
+    "UniformSeries", "GradientSeries", "GeometricSeries",
+    "RateSchedule",
+    "compounding_factors", "equivalent_value", "net_flows", "net_worths", "npv_profile",
+    "IRRResult", "solve_irr", "mirr",
+    "simple_balance", "discounted_balance", "crossing_period", "payback_periods",
+    "Distribution", "SimulationModel", "SimulationResult", "run_simulation",
+    "DEFAULT_COLOR", "NET_SERIES_NAME", "Equivalent",
+    "add_single_flow", "add_uniform_series", "add_gradient_series", "add_geometric_series",
+    "needs_target_period", "present_worths", "future_worths", "apply_equivalents", "present_value", "future_value",
+    "annual_worth", "annual_value",
+    "combine_flows", "consolidate_periods", "segment_cuts", "split_segments", "split_series", "invert_series",
+]
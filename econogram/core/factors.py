@@ -0,0 +1,152 @@
+"""Interest factor module.
+
+Caches the powers (1 + i) ** k for each interest rate in use as contiguous
+vectors, so the standard factors (F/P, P/F, P/A, A/P, P/G, A/G) are looked up
+instead of recomputed. Tables grow as longer horizons are asked for, up to a
+limit, and the least recently used rates are evicted. Powers beyond the limit
+are computed directly, so a few far-apart flows never build a huge table.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_MAX_RATES = 16
+DEFAULT_MAX_HORIZON = 65_536  # exponents cached on either side of zero, whatever the request
+DENSE_EXPONENT_FACTOR = 4  # a request for n exponents may cache a range of up to this many times n
+
+
+class FactorTable:
+    """Powers of (1 + rate) for exponents low .. high (low <= 0 <= high) in one contiguous vector."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.low = 0
+        self.high = 0
+        self.values = np.ones(1)  # values[k - low] = (1 + rate) ** k
+
+    def covers(self, low, high):
+        return self.low <= low and high <= self.high
+
+    def power(self, k):
+        """(1 + rate) ** k for a whole number k within the table."""
+        return float(self.values[k - self.low])
+
+    def powers(self, exponents):
+        """(1 + rate) ** k for an integer array of exponents within the table."""
+        return self.values[exponents - self.low]
+
+    def extend(self, low, high):
+        """Compute the powers down to low and up to high; each side only grows when asked to."""
+        low, high = min(low, self.low), max(high, self.high)
+        if low == self.low and high == self.high:
+            return
+        # Only the new exponents are computed, each directly rather than by repeated
+        # multiplication, so the values are identical to (1 + rate) ** k
+        self.values = np.concatenate((np.power(1 + self.rate, np.arange(low, self.low, dtype=np.float64)),
+                                      self.values,
+                                      np.power(1 + self.rate, np.arange(self.high + 1, high + 1, dtype=np.float64))))
+        self.low, self.high = low, high
+
+
+class InterestFactorCache:
+    """Factor tables keyed by rate, with LRU eviction and hit/miss counters.
+
+    A lookup is a hit when the rate's table already covers the requested
+    exponents and a miss when the table has to be created or extended. Each
+    side of a table doubles as it grows, up to max_horizon exponents, or
+    DENSE_EXPONENT_FACTOR times the number of exponents asked for when that is
+    more. Requests spanning further are computed directly and counted as direct.
+    """
+
+    def __init__(self, max_rates=DEFAULT_MAX_RATES, max_horizon=DEFAULT_MAX_HORIZON):
+        self.max_rates = max_rates
+        self.max_horizon = max_horizon
+        self.tables = OrderedDict()  # rate -> FactorTable, least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.direct = 0
+
+    def table(self, rate, low, high, count=1):
+        """Return the table for rate covering exponents low .. high, or None if that is too far to cache.
+
+        count is the number of exponents wanted from the range.
+        """
+        low, high = min(low, 0), max(high, 0)
+        limit = max(self.max_horizon, DENSE_EXPONENT_FACTOR * count)
+        if -low > limit or high > limit:
+            self.direct += 1
+            return None
+
+        table = self.tables.get(rate)
+        if table is None:
+            table = FactorTable(float(rate))
+            self.tables[table.rate] = table
+            if len(self.tables) > self.max_rates:
+                self.tables.popitem(last=False)
+        else:
+            self.tables.move_to_end(rate)
+
+        if table.covers(low, high):
+            self.hits += 1
+        else:
+            self.misses += 1
+            table.extend(max(min(low, 2 * table.low), -limit), min(max(high, 2 * table.high), limit))
+        return table
+
+    def power(self, rate, k):
+        """Return (1 + rate) ** k for a whole number k (negative allowed)."""
+        table = self.table(rate, k, k)
+        if table is None:
+            return float(np.power(1 + float(rate), float(k)))
+        return table.power(k)
+
+    def powers(self, rate, exponents):
+        """Return (1 + rate) ** k for an integer exponent k or array of exponents (negative allowed)."""
+        exponents = np.asarray(exponents, dtype=np.int64)
+        if exponents.size == 0:
+            return np.empty(exponents.shape)
+        table = self.table(rate, int(exponents.min()), int(exponents.max()), exponents.size)
+        if table is None:
+            # Too far apart to cache; compute just the requested powers
+            return np.power(1 + float(rate), exponents.astype(np.float64))
+        return table.powers(exponents)
+
+    def fp(self, rate, n):
+        """F/P: future worth of 1 today after n periods."""
+        return self.power(rate, n)
+
+    def pf(self, rate, n):
+        """P/F: present worth of 1 received after n periods."""
+        return self.power(rate, -n)
+
+    def pa(self, rate, n):
+        """P/A: present worth of 1 per period for n periods."""
+        if rate == 0:
+            return n * 1.0
+        growth = self.fp(rate, n)
+        return (growth - 1) / (rate * growth)
+
+    def ap(self, rate, n):
+        """A/P: capital recovery, the uniform amount per period repaying 1 over n periods."""
+        if rate == 0:
+            return 1 / n
+        return rate / (1 - self.pf(rate, n))
+
+    def pg(self, rate, n):
+        """P/G: present worth of an arithmetic gradient 0, 1, 2, ... over n periods."""
+        if rate == 0:
+            return n * (n - 1) / 2
+        growth = self.fp(rate, n)
+        return (growth - rate * n - 1) / (rate ** 2 * growth)
+
+    def ag(self, rate, n):
+        """A/G: uniform amount per period equivalent to an arithmetic gradient over n periods."""
+        return self.pg(rate, n) * self.ap(rate, n)
+
+    def stats(self):
+        """Return the hit/miss/direct counters and the number of cached rates."""
+        return {"hits": self.hits, "misses": self.misses, "direct": self.direct, "rates": len(self.tables)}
+
+
+# Shared by every calculation module
+factor_cache = InterestFactorCache()
@@ -0,0 +1,138 @@
+"""Internal rate of return solver module.
+
+Finds every internal rate of return of a set of cash flows and the modified
+internal rate of return. Only NumPy is used, so the functions work without Tk.
+
+When the net flows change sign more than once, roots are bracketed by evaluating
+the net present worth across a dense grid of rates in one matrix operation. Each
+bracket is refined with Newton steps using the analytic derivative, falling back
+to bisection whenever a step would leave the bracket.
+"""
+import numpy as np
+from econogram.core.tvm import equivalent_value, net_flows
+
+GRID_SIZE = 400  # rates scanned when bracketing roots
+MIN_RATE = -0.99
+MAX_RATE = 10.0
+TOLERANCE = 1e-12
+MAX_ITERATIONS = 100
+
+
+class IRRResult:
+    """Internal rates of return of a cash flow diagram.
+
+    roots are the rates (as decimals) at which the net present worth is zero,
+    in increasing order. sign_changes is the number of sign changes in the net
+    flow per period; by Descartes' rule of signs there can be at most that many
+    positive-growth roots, so more than one change means the IRR may not be unique.
+    """
+
+    def __init__(self, roots, sign_changes):
+        self.roots = roots
+        self.sign_changes = sign_changes
+
+    @property
+    def multiple(self):
+        """True if more than one rate of return was found or is possible."""
+        return len(self.roots) > 1 or self.sign_changes > 1
+
+    @property
+    def irr(self):
+        """The internal rate of return if it is unique, otherwise None."""
+        return self.roots[0] if len(self.roots) == 1 else None
+
+
+def count_sign_changes(amounts):
+    signs = np.sign(amounts[amounts != 0])
+    return int(np.count_nonzero(signs[1:] != signs[:-1]))
+
+
+def solve_irr(periods, amounts, min_rate=MIN_RATE, max_rate=MAX_RATE, grid_size=GRID_SIZE):
+    """Find every rate in [min_rate, max_rate] where the net present worth of the flows is zero."""
+    periods, amounts = net_flows(periods, amounts)
+    sign_changes = count_sign_changes(amounts)
+    if sign_changes == 0:
+        return IRRResult([], 0)
+
+    # Work with time measured from the first flow
+    times = (periods - periods[0]).astype(np.float64)
+
+    if sign_changes == 1:
+        # Net present worth is a polynomial in 1 / (1 + i) with one sign change, so by
+        # Descartes' rule it has exactly one root above -100% and checking the ends is enough
+        log_growth = np.array([np.log1p(min_rate), np.log1p(max_rate)])
+    else:
+        # Rates evenly spaced in log(1 + i), which spreads them over both small and large rates
+        log_growth = np.linspace(np.log1p(min_rate), np.log1p(max_rate), grid_size)
+    values = _scaled_npw(times, amounts, log_growth)
+    signs = np.sign(values)
+
+    roots = []
+    exact = np.flatnonzero(signs == 0)
+    roots.extend(np.expm1(log_growth[exact]).tolist())
+    brackets = np.flatnonzero(signs[:-1] * signs[1:] < 0)
+    for k in brackets:
+        roots.append(_refine(times, amounts, log_growth[k], log_growth[k + 1]))
+    return IRRResult(sorted(roots), sign_changes)
+
+
+def mirr(periods, amounts, finance_rate, reinvestment_rate):
+    """Modified internal rate of return.
+
+    Outflows are discounted to the first period at finance_rate and inflows are
+    compounded to the last period at reinvestment_rate. Returns None when there
+    are no outflows, no inflows, or only one period.
+    """
+    periods, amounts = net_flows(periods, amounts)
+    if len(periods) < 2:
+        return None
+    outflows = amounts < 0
+    if not outflows.any() or outflows.all():
+        return None
+
+    first_period, last_period = int(periods[0]), int(periods[-1])
+    present_outflows = -equivalent_value(periods[outflows], amounts[outflows], finance_rate, first_period)
+    future_inflows = equivalent_value(periods[~outflows], amounts[~outflows], reinvestment_rate, last_period)
+    return (future_inflows / present_outflows) ** (1 / (last_period - first_period)) - 1
+
+
+def _scaled_npw(times, amounts, log_growth):
+    """Net present worth at each rate, each divided by a positive scale so nothing overflows.
+
+    Dividing by a positive number keeps the sign, which is all the bracketing needs.
+    log_growth holds log(1 + i) for each rate.
+    """
+    exponents = -np.outer(log_growth, times)
+    exponents -= exponents.max(axis=1, keepdims=True)
+    return np.exp(exponents) @ amounts
+
+
+def _refine(times, amounts, low, high):
+    """Refine a root of the net present worth between log(1 + i) = low and high and return the rate."""
+    last_time = times[-1]
+
+    def npw_and_slope(x):
+        # Scale by the largest discount factor, e^(-x * t) at t = 0 or the last time, and
+        # differentiate the scaled function, which has the same roots
+        shift_slope = 0.0 if x >= 0 else -last_time
+        terms = amounts * np.exp(-x * times - max(0.0, -x * last_time))
+        return terms.sum(), ((-times - shift_slope) * terms).sum()
+
+    f_low, _ = npw_and_slope(low)
+    x = (low + high) / 2
+    for _ in range(MAX_ITERATIONS):
+        f, slope = npw_and_slope(x)
+        if f == 0:
+            break
+        # Keep the bracket around the sign change
+        if (f < 0) == (f_low < 0):
+            low, f_low = x, f
+        else:
+            high = x
+        step = x - f / slope if slope != 0 else None
+        next_x = step if step is not None and low < step < high else (low + high) / 2
+        if abs(next_x - x) <= TOLERANCE * max(1.0, abs(x)):
+            x = next_x
+            break
+        x = next_x
+    return float(np.expm1(x))
@@ -0,0 +1,86 @@
+"""Edit journal module.
+
+Keeps undo and redo history as the row-level changes each action made to the
+cash flow store, so stepping back or forward costs time proportional to the
+size of the edit rather than the size of the diagram.
+"""
+from econogram.core.store import CashFlowStore
+
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024  # bytes of recorded changes kept for undo
+
+
+class EditJournal:
+    """Undo and redo stacks of recorded store changes.
+
+    checkpoint() closes the changes made since the previous checkpoint into one
+    undo step. The store's version counter tells whether anything changed.
+    Old steps are dropped once the history exceeds memory_budget bytes
+    (None keeps everything).
+    """
+
+    def __init__(self, store, memory_budget=DEFAULT_MEMORY_BUDGET):
+        self.store = store
+        self.memory_budget = memory_budget
+        self.undo_stack = []  # (changes, nbytes), oldest first
+        self.redo_stack = []
+        self.nbytes = 0
+        self._version = store.version
+        store.take_changes()
+
+    def checkpoint(self):
+        """Record everything changed since the last checkpoint as one undo step."""
+        if self.store.version == self._version:
+            return
+        self._version = self.store.version
+        changes = self.store.take_changes()
+        if not changes:
+            return
+
+        # A new edit makes the redo history unreachable
+        self._drop(self.redo_stack)
+        self._push(self.undo_stack, changes)
+        if self.memory_budget is not None:
+            while self.nbytes > self.memory_budget and len(self.undo_stack) > 1:
+                self.nbytes -= self.undo_stack.pop(0)[1]
+
+    def can_undo(self):
+        return bool(self.undo_stack) or self.store.version != self._version
+
+    def can_redo(self):
+        return bool(self.redo_stack) and self.store.version == self._version
+
+    def undo(self):
+        """Revert the most recent step; return False if there is nothing to undo."""
+        self.checkpoint()
+        if not self.undo_stack:
+            return False
+        changes, nbytes = self.undo_stack.pop()
+        self.store.apply_changes(changes, reverse=True)
+        self.redo_stack.append((changes, nbytes))
+        self._sync()
+        return True
+
+    def redo(self):
+        """Reapply the most recently undone step; return False if there is nothing to redo."""
+        self.checkpoint()
+        if not self.redo_stack:
+            return False
+        changes, nbytes = self.redo_stack.pop()
+        self.store.apply_changes(changes)
+        self.undo_stack.append((changes, nbytes))
+        self._sync()
+        return True
+
+    def _push(self, stack, changes):
+        nbytes = CashFlowStore.changes_nbytes(changes)
+        stack.append((changes, nbytes))
+        self.nbytes += nbytes
+
+    def _drop(self, stack):
+        self.nbytes -= sum(nbytes for _, nbytes in stack)
+        stack.clear()
+
+    def _sync(self):
+        # Replaying changes is not itself an edit to record
+        self.store.take_changes()
+        self._version = self.store.version
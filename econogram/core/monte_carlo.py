@@ -0,0 +1,210 @@
+"""Monte Carlo simulation module.
+
+Treats the series on the diagram as templates whose amounts, growth and the
+interest rate are random, and estimates the distribution of the net present
+worth (and optionally the IRR). Samples are drawn in vectorized NumPy batches,
+each from its own seed spawned from one master seed, so a run is reproducible
+whatever the number of worker processes. Batches are spread over a
+ProcessPoolExecutor. Only NumPy is used, so this works without Tk.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+DEFAULT_BATCH_SIZE = 4096  # samples evaluated together in one batch
+FLOW_BLOCK = 256  # flows per block when building per-sample net flows, to bound memory
+IRR_ITERATIONS = 60
+MIN_LOG_GROWTH = np.log1p(-0.99)
+MAX_LOG_GROWTH = np.log1p(10.0)
+
+
+class Distribution:
+    """A random parameter.
+
+    kind is "fixed" (value), "uniform" (low, high), "triangular" (low, mode, high)
+    or "normal" (mean, standard deviation).
+    """
+
+    PARAMETER_COUNTS = {"fixed": 1, "uniform": 2, "triangular": 3, "normal": 2}
+
+    def __init__(self, kind, *params):
+        if kind not in self.PARAMETER_COUNTS:
+            raise ValueError(f"Unknown distribution '{kind}'")
+        if len(params) != self.PARAMETER_COUNTS[kind]:
+            raise ValueError(f"A {kind} distribution takes {self.PARAMETER_COUNTS[kind]} parameters")
+        if kind == "triangular" and not params[0] <= params[1] <= params[2]:
+            raise ValueError("A triangular distribution needs low <= mode <= high")
+        self.kind = kind
+        self.params = tuple(float(param) for param in params)
+
+    def sample(self, rng, size):
+        if self.kind == "fixed":
+            return np.full(size, self.params[0])
+        if self.kind == "uniform":
+            return rng.uniform(*self.params, size)
+        if self.kind == "triangular":
+            low, mode, high = self.params
+            if low == high:
+                return np.full(size, low)
+            return rng.triangular(low, mode, high, size)
+        return rng.normal(*self.params, size)
+
+    @property
+    def is_zero(self):
+        return self.kind == "fixed" and self.params[0] == 0
+
+
+class SimulationModel:
+    """Cash flows grouped by series, with a random amount multiplier and growth rate per series.
+
+    Sampled flow k of series s is amount_k * multiplier_s * (1 + growth_s) ** (period_k - first period of s),
+    discounted to reference_period at a sampled interest rate.
+    """
+
+    def __init__(self, periods, amounts, series_index, series_ids, amount_factors, growth_rates, rate,
+                 reference_period=0):
+        self.periods = np.asarray(periods, dtype=np.int64)
+        self.amounts = np.asarray(amounts, dtype=np.float64)
+        self.series_index = np.asarray(series_index, dtype=np.intp)
+        self.series_ids = list(series_ids)
+        self.amount_factors = list(amount_factors)
+        self.growth_rates = list(growth_rates)
+        self.rate = rate
+        self.reference_period = reference_period
+
+        # Net flow per period is what NPV and IRR need
+        self.unique_periods, self.period_index = np.unique(self.periods, return_inverse=True)
+        first_periods = np.full(len(self.series_ids), np.iinfo(np.int64).max)
+        np.minimum.at(first_periods, self.series_index, self.periods)
+        self.elapsed = (self.periods - first_periods[self.series_index]).astype(np.float64)
+        # Flows in period order, so the flows of one period are adjacent within each block
+        self.period_order = np.argsort(self.period_index, kind="stable")
+
+    @classmethod
+    def from_store(cls, store, amount_factor, growth_rate, rate, reference_period=0):
+        """Build a model from a CashFlowStore with the same amount and growth distribution for every series."""
+        series_ids, series_index = np.unique(store.series_id, return_inverse=True)
+        count = len(series_ids)
+        return cls(store.period.copy(), store.amount.copy(), series_index, series_ids.tolist(),
+                   [amount_factor] * count, [growth_rate] * count, rate, reference_period)
+
+    def sample_net_flows(self, rng, size):
+        """Draw size samples and return (rates, net flow per sample and period)."""
+        rates = self.rate.sample(rng, size)
+        multipliers = np.column_stack([factor.sample(rng, size) for factor in self.amount_factors])
+        period_count = len(self.unique_periods)
+
+        if all(growth.is_zero for growth in self.growth_rates):
+            # Without growth each series' flows scale together: net flows = multipliers @ per-series period sums
+            weights = np.zeros((len(self.series_ids), period_count))
+            np.add.at(weights, (self.series_index, self.period_index), self.amounts)
+            return rates, multipliers @ weights
+
+        log_growth = np.log1p(np.column_stack([growth.sample(rng, size) for growth in self.growth_rates]))
+        net = np.zeros((size, period_count))
+        for start in range(0, len(self.amounts), FLOW_BLOCK):
+            flows = self.period_order[start:start + FLOW_BLOCK]
+            series = self.series_index[flows]
+            values = multipliers[:, series] * np.exp(log_growth[:, series] * self.elapsed[flows]) * self.amounts[flows]
+            # Sum each run of same-period flows, then add the totals to their (distinct) period columns
+            periods = self.period_index[flows]
+            runs = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+            net[:, periods[runs]] += np.add.reduceat(values, runs, axis=1)
+        return rates, net
+
+
+class SimulationResult:
+    """Sampled net present worths (and IRRs, NaN where a sample has none)."""
+
+    def __init__(self, npv, irr=None):
+        self.npv = npv
+        self.irr = irr
+
+    @property
+    def trials(self):
+        return len(self.npv)
+
+    @property
+    def probability_negative(self):
+        return float(np.mean(self.npv < 0))
+
+    def percentiles(self, q=(5, 25, 50, 75, 95)):
+        return np.percentile(self.npv, q)
+
+    def histogram(self, bins=50):
+        return np.histogram(self.npv, bins=bins)
+
+
+def evaluate_batch(model, seed, size, compute_irr=False):
+    """Evaluate one batch of samples drawn from its own seed; returns (npv, irr or None)."""
+    rng = np.random.default_rng(seed)
+    rates, net = model.sample_net_flows(rng, size)
+    offsets = (model.unique_periods - model.reference_period).astype(np.float64)
+    npv = np.einsum("ij,ij->i", net, np.exp(-np.outer(np.log1p(rates), offsets)))
+    irr = batch_irr(model.unique_periods, net) if compute_irr else None
+    return npv, irr
+
+
+def batch_irr(periods, net):
+    """Solve the IRR of every row of net flows at once with safeguarded Newton steps.
+
+    Rows whose flows never change sign, or that do not converge inside -99% .. 1000%, give NaN.
+    """
+    times = (periods - periods[0]).astype(np.float64)
+    last_time = times[-1] if len(times) else 0.0
+    signs = np.sign(net)
+    has_root = (signs > 0).any(axis=1) & (signs < 0).any(axis=1)
+
+    x = np.full(len(net), np.log1p(0.1))
+    converged = np.zeros(len(net), dtype=bool)
+    for _ in range(IRR_ITERATIONS):
+        # Scale each row by its largest discount factor so nothing overflows
+        shift = np.maximum(0.0, -x * last_time)
+        terms = net * np.exp(-np.outer(x, times) - shift[:, None])
+        value = terms.sum(axis=1)
+        shift_slope = np.where(x >= 0, 0.0, -last_time)
+        slope = ((-times[None, :] - shift_slope[:, None]) * terms).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = np.where(slope != 0, value / slope, 0.0)
+        step = np.clip(step, -0.5, 0.5)  # damp steps far from the root
+        x = np.clip(x - step, MIN_LOG_GROWTH, MAX_LOG_GROWTH)
+        converged = np.abs(step) < 1e-10
+        if converged[has_root].all():
+            break
+    return np.where(has_root & converged, np.expm1(x), np.nan)
+
+
+def run_simulation(model, trials, seed=None, batch_size=DEFAULT_BATCH_SIZE, workers=None, compute_irr=False,
+                   mp_context=None):
+    """Run trials samples in batches, across worker processes when workers > 1.
+
+    Each batch gets its own seed spawned from seed, so the same seed gives the
+    same result for any number of workers. workers defaults to the CPU count.
+    mp_context is the multiprocessing context the workers are started with
+    (default: the platform's); callers running other threads should pass a
+    "spawn" context, since forking a threaded process is unsafe.
+    """
+    batch_sizes = [min(batch_size, trials - start) for start in range(0, trials, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batch_sizes))
+    starts = np.concatenate(([0], np.cumsum(batch_sizes)))
+    npv = np.empty(trials)
+    irr = np.empty(trials) if compute_irr else None
+
+    def store_batch(index, batch):
+        npv[starts[index]:starts[index + 1]] = batch[0]
+        if compute_irr:
+            irr[starts[index]:starts[index + 1]] = batch[1]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(batch_sizes) == 1:
+        for index, (batch_seed, size) in enumerate(zip(seeds, batch_sizes)):
+            store_batch(index, evaluate_batch(model, batch_seed, size, compute_irr))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+            futures = {executor.submit(evaluate_batch, model, batch_seed, size, compute_irr): index
+                       for index, (batch_seed, size) in enumerate(zip(seeds, batch_sizes))}
+            # Results are written into place as they arrive
+            for future in as_completed(futures):
+                store_batch(futures[future], future.result())
+    return SimulationResult(npv, irr)
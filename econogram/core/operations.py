@@ -0,0 +1,329 @@
+"""Diagram operations module.
+
+Edits a cash flow store the way the diagram's menus do: adding series, moving
+selected flows to their present or future worth, spreading a flow over an
+annual series, combining, consolidating, splitting and inverting. Nothing here
+touches the interface; callers decide what counts as one undo step and when to
+redraw.
+
+Operations that create series take next_series_id and next_color, callables
+returning the id and color of each new series. Without them, ids continue from
+the largest id in the store and every new series gets DEFAULT_COLOR. Wherever a
+rate is taken it may be a single rate or a RateSchedule.
+"""
+import numpy as np
+from econogram.core.factors import factor_cache
+from econogram.core.rates import RateSchedule
+from econogram.core.series import UniformSeries, GradientSeries, GeometricSeries
+from econogram.core.tvm import equivalent_value, group_flows, group_period_range, grouped_equivalent_values, net_flows
+
+DEFAULT_COLOR = "#1f77b4"
+NET_SERIES_NAME = "Net Cash Flow"  # name of the series holding consolidated net flows
+
+PV_DIRECTION_ERROR = ("You cannot move your cash flow forward in time using the present value function. "
+                      "Please select the future value function instead.")
+FV_DIRECTION_ERROR = ("You cannot move your cash flow backward in time using the future value function. "
+                      "Please select the present value function instead.")
+
+
+class Equivalent:
+    """The worth of some flows of one series, moved to a single period."""
+
+    def __init__(self, series_id, row_ids, period, value):
+        self.series_id = series_id
+        self.row_ids = row_ids
+        self.period = period
+        self.value = value
+
+
+def _allocators(store, next_series_id, next_color):
+    """Fill in the default series id and color allocators."""
+    if next_series_id is None:
+        last_id = [max(store.series, default=0)]
+
+        def next_series_id():
+            last_id[0] += 1
+            return last_id[0]
+    if next_color is None:
+        def next_color():
+            return DEFAULT_COLOR
+    return next_series_id, next_color
+
+
+def _single_rate(rate):
+    """Return the rate applying to every period, or None when it varies by period."""
+    if isinstance(rate, RateSchedule):
+        return rate.base_rate if rate.uniform else None
+    return rate
+
+
+def _check_series(name, length=1):
+    if not str(name).strip():
+        raise ValueError("Series name cannot be empty.")
+    if length < 1:
+        raise ValueError("Length of Series must be at least 1.")
+
+
+# Series generation
+
+def add_single_flow(store, series_id, name, color, period, amount):
+    """Add a series of one flow."""
+    _check_series(name)
+    store.append_series(series_id, name, color, [int(period)], [float(amount)])
+
+
+def add_uniform_series(store, series_id, name, color, amount, start, length):
+    """Add amount in each of length periods from start, stored by its parameters."""
+    _check_series(name, length)
+    store.append_spec(series_id, name, color, UniformSeries(amount, start, length))
+
+
+def add_gradient_series(store, series_id, name, color, gradient, start, length):
+    """Add flows of 0, gradient, 2 gradient, ... over length periods from start."""
+    _check_series(name, length)
+    store.append_spec(series_id, name, color, GradientSeries(gradient, start, length))
+
+
+def add_geometric_series(store, series_id, name, color, initial_amount, growth_rate, start, length):
+    """Add flows growing by growth_rate (a fraction) per period over length periods from start."""
+    _check_series(name, length)
+    store.append_spec(series_id, name, color, GeometricSeries(initial_amount, growth_rate, start, length))
+
+
+# Present, future and annual worth
+
+def needs_target_period(store, row_ids):
+    """Return True when no series has more than one of row_ids, so the target period must be given."""
+    _, _, counts = group_flows(store.series_id[store.positions(row_ids)])
+    return not (counts > 1).any()
+
+
+def present_worths(store, row_ids, rate, period=None):
+    """Return an Equivalent for the present worth of the selected flows.
+
+    Each series with more than one selected flow is moved to the period before
+    its first flow; other selected flows are left out. When no series has more
+    than one, all the selected flows are moved together to period, which must
+    not be after any of them.
+    """
+    return _worths(store, row_ids, rate, period, forward=False)
+
+
+def future_worths(store, row_ids, rate, period=None):
+    """Return an Equivalent for the future worth of the selected flows.
+
+    Each series with more than one selected flow is moved to the period of its
+    last flow; other selected flows are left out. When no series has more than
+    one, all the selected flows are moved together to period, which must not be
+    before any of them.
+    """
+    return _worths(store, row_ids, rate, period, forward=True)
+
+
+def _worths(store, row_ids, rate, period, forward):
+    row_ids = np.asarray(row_ids, dtype=np.int64)
+    positions = store.positions(row_ids)
+    periods = store.period[positions]
+    amounts = store.amount[positions]
+    series_ids, groups, counts = group_flows(store.series_id[positions])
+
+    if not (counts > 1).any():
+        # Single flows are moved together, to the period asked for
+        if period is None:
+            raise ValueError("Enter the period to move the cash flow to.")
+        if forward and period < periods.max():
+            raise ValueError(FV_DIRECTION_ERROR)
+        if not forward and period > periods.min():
+            raise ValueError(PV_DIRECTION_ERROR)
+        value = equivalent_value(periods, amounts, rate, period)
+        return [Equivalent(int(store.series_id[positions[0]]), row_ids, int(period), float(value))]
+
+    first_periods, last_periods = group_period_range(periods, groups, len(series_ids))
+    targets = last_periods if forward else first_periods - 1
+
+    # A whole uniform/gradient/geometric series has a closed-form worth (only while a single rate
+    # applies to every period); the other series are moved flow by flow in one grouped pass
+    single_rate = _single_rate(rate)
+    specs = [store.whole_series_spec(series_id, count) if single_rate is not None and count > 1 else None
+             for series_id, count in zip(series_ids.tolist(), counts.tolist())]
+    reduced = (counts > 1) & np.array([spec is None for spec in specs])
+    values = np.zeros(len(series_ids))
+    if reduced.any():
+        rows = reduced[groups]
+        values = grouped_equivalent_values(periods[rows], amounts[rows], groups[rows], rate, targets)
+
+    # Rows of each series, in selection order
+    order = np.argsort(groups, kind="stable")
+    bounds = np.concatenate(([0], np.cumsum(counts)))
+
+    equivalents = []
+    for group, series_id in enumerate(series_ids.tolist()):
+        count = int(counts[group])
+        if count < 2:
+            continue
+        spec = specs[group]
+        if spec is not None:
+            value = spec.future_worth(single_rate) if forward else spec.present_worth(single_rate)
+        else:
+            value = values[group]
+        equivalents.append(Equivalent(series_id, row_ids[order[bounds[group]:bounds[group + 1]]],
+                                      int(targets[group]), float(value)))
+    return equivalents
+
+
+def apply_equivalents(store, equivalents, prefix, make_new_series=False, next_series_id=None, next_color=None):
+    """Put each equivalent on the diagram as one flow at its period.
+
+    It replaces the flows it was worked out from, or with make_new_series it is
+    added as a new series named "<prefix> of <series name>" and the flows stay.
+    """
+    next_series_id, next_color = _allocators(store, next_series_id, next_color)
+    infos = [store.series[equivalent.series_id] for equivalent in equivalents]
+    if not make_new_series and equivalents:
+        # Remove the replaced flows of every series in one pass
+        store.remove_rows(np.concatenate([equivalent.row_ids for equivalent in equivalents]))
+
+    for equivalent, info in zip(equivalents, infos):
+        if make_new_series:
+            store.append_series(next_series_id(), f"{prefix} of {info.name}", next_color(),
+                                [equivalent.period], [equivalent.value])
+        else:
+            store.append_series(equivalent.series_id, info.name, info.color, [equivalent.period], [equivalent.value])
+
+
+def present_value(store, row_ids, rate, period=None, make_new_series=False, next_series_id=None, next_color=None):
+    """Replace the selected flows with their present worth (see present_worths) and return the equivalents."""
+    equivalents = present_worths(store, row_ids, rate, period)
+    apply_equivalents(store, equivalents, "PV", make_new_series, next_series_id, next_color)
+    return equivalents
+
+
+def future_value(store, row_ids, rate, period=None, make_new_series=False, next_series_id=None, next_color=None):
+    """Replace the selected flows with their future worth (see future_worths) and return the equivalents."""
+    equivalents = future_worths(store, row_ids, rate, period)
+    apply_equivalents(store, equivalents, "FV", make_new_series, next_series_id, next_color)
+    return equivalents
+
+
+def annual_worth(amount, period, num_periods, rate):
+    """Return the uniform amount over the num_periods periods after period that is worth amount at period."""
+    if isinstance(rate, RateSchedule):
+        return amount * rate.ap(period, num_periods)
+    return amount * factor_cache.ap(rate, num_periods)
+
+
+def annual_value(store, row_id, num_periods, rate, make_new_series=False, next_series_id=None, next_color=None):
+    """Spread one flow over an equivalent uniform series starting the period after it.
+
+    The uniform flows form a new series named "AV of <series name>". It replaces
+    the flow and keeps its color, or with make_new_series is added beside it in
+    a new color. Returns the id of the new series.
+    """
+    if num_periods is None or num_periods <= 0:
+        raise ValueError("Please enter a valid number of periods.")
+    next_series_id, next_color = _allocators(store, next_series_id, next_color)
+    position = store.positions([row_id])[0]
+    period = int(store.period[position])
+    info = store.series[int(store.series_id[position])]
+    annual = annual_worth(float(store.amount[position]), period, num_periods, rate)
+
+    if make_new_series:
+        color = next_color()
+    else:
+        # The rest of the flow's series keeps its name; only the uniform flows are "AV of"
+        color = info.color
+        store.remove_rows([row_id])
+    new_series_id = next_series_id()
+    store.append_series(new_series_id, f"AV of {info.name}", color, period + 1 + np.arange(num_periods), annual)
+    return new_series_id
+
+
+# Combine, consolidate, split and invert
+
+def combine_flows(store, row_ids, next_series_id=None, next_color=None):
+    """Replace flows of one period with a single flow of their total, in a new series.
+
+    The series is named after the combined series, joined by " + ". Returns its id.
+    """
+    positions = store.positions(row_ids)
+    periods = store.period[positions]
+    if len(periods) and (periods != periods[0]).any():
+        raise ValueError("Selected cash flows must be in the same period to be combined.")
+    next_series_id, next_color = _allocators(store, next_series_id, next_color)
+
+    total = float(store.amount[positions].sum())
+    # Combine series names into a single name, in selection order
+    series_ids = store.series_id[positions].tolist()
+    name = " + ".join(dict.fromkeys(store.series[series_id].name for series_id in series_ids))
+
+    new_series_id = next_series_id()
+    color = next_color()
+    store.remove_rows(row_ids)
+    store.append_series(new_series_id, name, color, [int(periods[0])], [total])
+    return new_series_id
+
+
+def consolidate_periods(store, make_new_series=False, next_series_id=None, next_color=None):
+    """Replace every flow with one net flow per period, in a series named NET_SERIES_NAME.
+
+    With make_new_series the net flows are added and the existing flows stay.
+    Periods that net to zero get no flow. Returns the id of the net series, or
+    None if there is none.
+    """
+    next_series_id, next_color = _allocators(store, next_series_id, next_color)
+    periods, totals = net_flows(store.period, store.amount)
+    if not make_new_series:
+        store.clear()
+    if not len(periods):
+        return None
+    series_id = next_series_id()
+    store.append_series(series_id, NET_SERIES_NAME, next_color(), periods, totals)
+    return series_id
+
+
+def segment_cuts(periods, segment_length):
+    """Return the cut periods that break periods into segments of segment_length periods from the first one."""
+    first, last = int(np.min(periods)), int(np.max(periods))
+    return np.arange(first + segment_length - 1, last, segment_length)
+
+
+def split_segments(periods, cut_periods):
+    """Return the segment number of each period, cutting after each of cut_periods.
+
+    Segments are numbered 0, 1, ... in period order; cuts that leave a segment
+    empty are skipped.
+    """
+    # The number of cuts before a period is its segment, found for every period in one binary search
+    segments = np.searchsorted(np.unique(np.asarray(cut_periods, dtype=np.int64)), periods, side="left")
+    _, segments = np.unique(segments, return_inverse=True)
+    return segments
+
+
+def split_series(store, series_id, cut_periods=(), segment_length=None, next_series_id=None, next_color=None):
+    """Split a series after each of cut_periods, or into segments of segment_length periods.
+
+    The parts are named after the series with _1, _2, ... appended; the first
+    keeps the series' color. Returns the new series ids.
+    """
+    row_ids = store.series_rows(series_id)
+    periods = store.period[store.positions(row_ids)]
+    if segment_length is not None:
+        if segment_length < 1:
+            raise ValueError("Segment length must be at least 1.")
+        cut_periods = segment_cuts(periods, segment_length)
+    segments = split_segments(periods, cut_periods)
+    segment_count = int(segments.max()) + 1 if len(segments) else 0
+    if segment_count < 2:
+        raise ValueError("The cut periods do not split the series.")
+
+    next_series_id, next_color = _allocators(store, next_series_id, next_color)
+    original = store.series[series_id]
+    series = [(next_series_id(), f"{original.name}_{number}", original.color if number == 1 else next_color())
+              for number in range(1, segment_count + 1)]
+    store.assign_segments(row_ids, segments, series)
+    return [series_id for series_id, _, _ in series]
+
+
+def invert_series(store, row_ids):
+    """Flip the sign of every flow of each series with a flow among row_ids."""
+    store.scale_series(store.series_of(row_ids), -1)
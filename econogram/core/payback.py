@@ -0,0 +1,42 @@
+"""Payback period module.
+
+Finds the simple and discounted payback periods of a set of cash flows, and the
+period at which the cumulative balance first reaches any target, from the net
+flow of each period. The cumulative balances are vectorized running sums and
+the crossing is found with a binary search.
+"""
+import numpy as np
+from econogram.core.tvm import net_flows, compounding_factors
+
+
+def simple_balance(periods, amounts):
+    """Return the periods with flows and the running total of the net flows up to each."""
+    periods, totals = net_flows(periods, amounts)
+    return periods, np.cumsum(totals)
+
+
+def discounted_balance(periods, amounts, rate, reference_period=0):
+    """Return the periods with flows and the running total of their worth at reference_period.
+
+    rate may be a single rate or a RateSchedule.
+    """
+    periods, totals = net_flows(periods, amounts)
+    return periods, np.cumsum(totals * compounding_factors(periods, rate, reference_period))
+
+
+def crossing_period(periods, balances, target=0.0):
+    """Return the first period at which the balance reaches target, or None if it never does."""
+    if not len(balances):
+        return None
+    # The running maximum never decreases, so the first crossing is a binary search
+    index = np.searchsorted(np.maximum.accumulate(balances), target, side="left")
+    return int(periods[index]) if index < len(periods) else None
+
+
+def payback_periods(periods, amounts, rate, target=0.0, reference_period=0):
+    """Return (simple, discounted) periods at which the cumulative balance first reaches target."""
+    periods, totals = net_flows(periods, amounts)
+    simple = crossing_period(periods, np.cumsum(totals), target)
+    worths = totals * compounding_factors(periods, rate, reference_period)
+    discounted = crossing_period(periods, np.cumsum(worths), target)
+    return simple, discounted
@@ -0,0 +1,152 @@
+"""Interest rate schedule module.
+
+Lets the interest rate vary from period to period: a base rate that applies
+everywhere, overridden on segments of periods. The cumulative compounding
+factors over the overridden window are computed once, so moving a flow from
+period a to period b needs only two stored values. They are kept as logarithms
+so long windows do not overflow.
+"""
+import numpy as np
+from econogram.core.factors import factor_cache
+
+
+class RateSchedule:
+    """Interest rate per period.
+
+    The rate of period t applies from period t - 1 to period t. log_growth[j]
+    is the log of the product of (1 + rate) over the periods first + 1 .. first + j,
+    so the factor that moves a flow from period a to period b is
+    exp(log_growth(b) - log_growth(a)). Outside the window first .. first + len(rates)
+    the base rate applies.
+    """
+
+    def __init__(self, base_rate=0.0):
+        self.base_rate = float(base_rate)
+        self.first = 0
+        self.rates = np.empty(0)  # rates[j] is the rate of period first + 1 + j
+        self.overridden = np.zeros(0, dtype=bool)
+        self.log_growth = np.zeros(1)
+        self.version = 0  # Bumped on every change, for callers caching results
+
+    @property
+    def uniform(self):
+        """True when no period overrides the base rate."""
+        return not self.overridden.any()
+
+    @property
+    def last(self):
+        """Last period covered by the window."""
+        return self.first + len(self.rates)
+
+    def set_base_rate(self, rate):
+        rate = float(rate)
+        if rate == self.base_rate:
+            return
+        self.base_rate = rate
+        self.rates[~self.overridden] = rate
+        self._recompute(self.first)
+        self.version += 1
+
+    def set_segment(self, start, end, rate):
+        """Use rate for periods start .. end."""
+        start, end = int(start), int(end)
+        if end < start:
+            raise ValueError("The segment must end at or after its start.")
+        if rate <= -1:
+            raise ValueError("The rate must be greater than -100%.")
+        self._cover(start, end)
+        positions = slice(start - self.first - 1, end - self.first)
+        self.rates[positions] = rate
+        self.overridden[positions] = True
+        self._recompute(start)
+        self.version += 1
+
+    def clear_segment(self, start, end):
+        """Return periods start .. end to the base rate."""
+        start, end = max(int(start), self.first + 1), min(int(end), self.last)
+        if end < start:
+            return
+        positions = slice(start - self.first - 1, end - self.first)
+        self.rates[positions] = self.base_rate
+        self.overridden[positions] = False
+        if self.uniform:
+            self.clear()
+        else:
+            self._recompute(start)
+        self.version += 1
+
+    def clear(self):
+        """Remove every override."""
+        self.first = 0
+        self.rates = np.empty(0)
+        self.overridden = np.zeros(0, dtype=bool)
+        self.log_growth = np.zeros(1)
+        self.version += 1
+
+    def segments(self):
+        """Return the overridden runs of periods as (start, end, rate), in period order."""
+        if not len(self.rates):
+            return []
+        values = np.where(self.overridden, self.rates, np.nan)
+        # A run ends wherever the rate (or whether it is overridden) changes
+        changes = np.flatnonzero((values[1:] != values[:-1]) & ~(np.isnan(values[1:]) & np.isnan(values[:-1])))
+        starts = np.concatenate(([0], changes + 1))
+        ends = np.concatenate((changes, [len(values) - 1]))
+        return [(self.first + 1 + int(s), self.first + 1 + int(e), float(self.rates[s]))
+                for s, e in zip(starts, ends) if self.overridden[s]]
+
+    def rate_of(self, periods):
+        """Return the rate of each period."""
+        positions = np.asarray(periods, dtype=np.int64) - self.first - 1
+        inside = (positions >= 0) & (positions < len(self.rates))
+        rates = np.full(positions.shape, self.base_rate)
+        rates[inside] = self.rates[positions[inside]]
+        return rates
+
+    def log_growth_at(self, periods):
+        """Return the log of the cumulative compounding factor at each period, relative to period first."""
+        positions = np.asarray(periods, dtype=np.int64) - self.first
+        clipped = np.clip(positions, 0, len(self.rates))
+        # Beyond the window the base rate compounds from the nearest edge
+        return self.log_growth[clipped] + (positions - clipped) * np.log1p(self.base_rate)
+
+    def factors(self, periods, target):
+        """Return the factors that move flows at periods to target (one period or one per flow)."""
+        if self.uniform:
+            exponents = np.asarray(target, dtype=np.int64) - np.asarray(periods, dtype=np.int64)
+            return factor_cache.powers(self.base_rate, exponents)
+        return np.exp(self.log_growth_at(target) - self.log_growth_at(periods))
+
+    def ap(self, period, n):
+        """Capital recovery factor: the uniform amount over periods period + 1 .. period + n per unit at period."""
+        if self.uniform:
+            return factor_cache.ap(self.base_rate, n)
+        discount = self.factors(np.arange(period + 1, period + n + 1), period)
+        return 1 / float(discount.sum())
+
+    def _cover(self, start, end):
+        """Grow the window so it holds the rates of periods start .. end."""
+        if not len(self.rates):
+            self.first = start - 1
+            self.rates = np.full(end - start + 1, self.base_rate)
+            self.overridden = np.zeros(end - start + 1, dtype=bool)
+            self.log_growth = np.zeros(end - start + 2)
+            return
+        before = max(self.first - (start - 1), 0)
+        after = max(end - self.last, 0)
+        if before or after:
+            self.rates = np.concatenate((np.full(before, self.base_rate), self.rates, np.full(after, self.base_rate)))
+            self.overridden = np.concatenate((np.zeros(before, dtype=bool), self.overridden,
+                                              np.zeros(after, dtype=bool)))
+            self.log_growth = np.concatenate((np.zeros(before), self.log_growth, np.zeros(after)))
+            old_last = self.last - after
+            self.first -= before
+            # log_growth is relative to the first period, so a new first period changes all of it;
+            # new periods at the end only need their own values
+            self._recompute(self.first if before else old_last)
+
+    def _recompute(self, period):
+        """Recompute the cumulative factors from period onward; earlier ones are unchanged."""
+        j = max(period - self.first, 1)
+        if j <= len(self.rates):
+            self.log_growth[j:] = self.log_growth[j - 1] + np.cumsum(np.log1p(self.rates[j - 1:]))
@@ -0,0 +1,105 @@
+"""Parametric series module.
+
+Describes uniform, gradient and geometric series by their parameters rather than
+by one row per period, and evaluates their worth with the textbook closed-form
+interest factors so the cost does not depend on the length of the series.
+"""
+from abc import ABC, abstractmethod
+
+import numpy as np
+from econogram.core.factors import factor_cache
+
+
+class ParametricSeries(ABC):
+    """Base class for a series of flows at periods start, start + 1, ..., start + length - 1."""
+
+    def __init__(self, start, length):
+        self.start = int(start)
+        self.length = int(length)
+
+    @property
+    def end(self):
+        """Period of the last flow in the series."""
+        return self.start + self.length - 1
+
+    def periods(self):
+        return np.arange(self.start, self.start + self.length, dtype=np.int64)
+
+    @abstractmethod
+    def amounts(self):
+        """The flow of every period, in period order."""
+
+    @abstractmethod
+    def present_worth(self, rate):
+        """Equivalent worth at period start - 1."""
+
+    def future_worth(self, rate):
+        """Equivalent worth at the period of the last flow."""
+        return self.present_worth(rate) * factor_cache.fp(rate, self.length)
+
+    def worth_at(self, rate, period):
+        """Equivalent worth moved to any period."""
+        return self.present_worth(rate) * factor_cache.powers(rate, period - (self.start - 1))
+
+    @abstractmethod
+    def scaled(self, factor):
+        """Return the same series with every flow multiplied by factor."""
+
+
+class UniformSeries(ParametricSeries):
+    """A constant amount in every period."""
+
+    def __init__(self, amount, start, length):
+        super().__init__(start, length)
+        self.amount = float(amount)
+
+    def amounts(self):
+        return np.full(self.length, self.amount)
+
+    def present_worth(self, rate):
+        # P = A (P/A, i, n)
+        return self.amount * factor_cache.pa(rate, self.length)
+
+    def scaled(self, factor):
+        return UniformSeries(self.amount * factor, self.start, self.length)
+
+
+class GradientSeries(ParametricSeries):
+    """Flows of 0, G, 2G, ... that grow by a constant amount each period."""
+
+    def __init__(self, gradient, start, length):
+        super().__init__(start, length)
+        self.gradient = float(gradient)
+
+    def amounts(self):
+        return self.gradient * np.arange(self.length, dtype=np.float64)
+
+    def present_worth(self, rate):
+        # P = G (P/G, i, n)
+        return self.gradient * factor_cache.pg(rate, self.length)
+
+    def scaled(self, factor):
+        return GradientSeries(self.gradient * factor, self.start, self.length)
+
+
+class GeometricSeries(ParametricSeries):
+    """Flows of A1, A1(1+g), A1(1+g)^2, ... that grow by a constant percentage each period."""
+
+    def __init__(self, initial_amount, growth_rate, start, length):
+        super().__init__(start, length)
+        self.initial_amount = float(initial_amount)
+        self.growth_rate = float(growth_rate)
+
+    def amounts(self):
+        return self.initial_amount * (1 + self.growth_rate) ** np.arange(self.length, dtype=np.float64)
+
+    def present_worth(self, rate):
+        # P = A1 (P/A, g, i, n)
+        n = self.length
+        g = self.growth_rate
+        if rate == g:
+            return self.initial_amount * n / (1 + rate)
+        return self.initial_amount * (1 - ((1 + g) / (1 + rate)) ** n) / (rate - g)
+
+    def scaled(self, factor):
+        return GeometricSeries(self.initial_amount * factor, self.growth_rate, self.start, self.length)
@@ -0,0 +1,523 @@
+"""Cash flow storage module.
+
+Holds every cash flow on the diagram in growable NumPy column arrays, with the
+name and color of each series kept once per series rather than once per row.
+Uniform, gradient and geometric series also keep their parametric description,
+and their rows are only expanded when something reads them.
+Every edit is recorded as a list of row-level changes that the edit journal turns
+into undo and redo steps.
+A pandas DataFrame view is built on demand for code that reads flows as a table.
+"""
+import numpy as np
+import pandas as pd
+
+COLUMNS = ["Period", "Cash Flow", "Color", "Series_ID", "Series_Name"]
+
+
+class SeriesInfo:
+    """Attributes shared by every cash flow of one series.
+
+    spec is the parametric description of the series (see econogram.core.series), or
+    None once an edit has broken the pattern and only the rows describe it.
+    SeriesInfo objects are not modified once stored; edits replace them, so the
+    change log can keep references to the old ones.
+    """
+
+    def __init__(self, name, color, spec=None):
+        self.name = name
+        self.color = color
+        self.spec = spec
+
+    def replace(self, **changes):
+        """Return a copy with the given attributes changed."""
+        attributes = {"name": self.name, "color": self.color, "spec": self.spec}
+        attributes.update(changes)
+        return SeriesInfo(**attributes)
+
+
+class CashFlowStore:
+    """Column store of cash flows with amortized appends and stable row ids.
+
+    Row ids are handed out in increasing order and the row id column is kept
+    sorted, so a row's position can be found with a binary search. An index
+    from series id to the sorted row ids of that series is kept up to date by
+    every edit, so series lookups never scan the whole table.
+
+    Edits are built from a few primitive changes (insert rows, delete rows, set
+    row values, replace one or several series, add a parametric series). Each
+    one is added to a change log that take_changes() hands out and
+    apply_changes() replays forwards or backwards.
+    """
+
+    def __init__(self, capacity=64):
+        self._period = np.empty(capacity, dtype=np.int64)
+        self._amount = np.empty(capacity, dtype=np.float64)
+        self._series_id = np.empty(capacity, dtype=np.int32)
+        self._row_id = np.empty(capacity, dtype=np.int64)
+        self._size = 0
+        self._next_row_id = 0
+        self.series = {}  # series id -> SeriesInfo
+        self._members = {}  # series id -> sorted row ids of that series
+        self.version = 0  # bumped on every change
+        self._pending = {}  # parametric series not expanded yet: series id -> first reserved row id
+
+        self._changes = []  # primitive changes since the last take_changes()
+        self._recording = True
+
+        self._frame = None
+        self._frame_version = -1
+
+    # Column views ----------------------------------------------------------
+
+    @property
+    def period(self):
+        self._expand_pending()
+        return self._period[:self._size]
+
+    @property
+    def amount(self):
+        self._expand_pending()
+        return self._amount[:self._size]
+
+    @property
+    def series_id(self):
+        self._expand_pending()
+        return self._series_id[:self._size]
+
+    @property
+    def row_id(self):
+        self._expand_pending()
+        return self._row_id[:self._size]
+
+    def __len__(self):
+        self._expand_pending()
+        return self._size
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    def positions(self, row_ids):
+        """Return the array positions of the given row ids (which must exist)."""
+        return np.searchsorted(self.row_id, np.asarray(row_ids, dtype=np.int64))
+
+    def contains(self, row_ids):
+        """Return a boolean array telling which of the given row ids exist."""
+        row_ids = np.asarray(row_ids, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self.row_id, row_ids), max(self._size - 1, 0))
+        return (self._size > 0) & (self.row_id[positions] == row_ids)
+
+    # Series index ----------------------------------------------------------
+
+    def series_rows(self, series_id):
+        """Return the row ids of a series in ascending order (empty if it does not exist)."""
+        self._expand_pending()
+        return self._members.get(int(series_id), np.empty(0, dtype=np.int64))
+
+    def series_size(self, series_id):
+        """Return the number of flows in a series without expanding a parametric one."""
+        series_id = int(series_id)
+        if series_id in self._pending:
+            return self.series[series_id].spec.length
+        return len(self._members.get(series_id, ()))
+
+    def series_of(self, row_ids):
+        """Return the distinct series ids of the given rows (which must exist), sorted."""
+        return np.unique(self.series_id[self.positions(row_ids)])
+
+    def check_consistency(self):
+        """Rebuild the series index from the columns and raise ValueError if it disagrees."""
+        self._expand_pending()
+        expected = self._build_members(self._series_id[:self._size], self._row_id[:self._size])
+        if expected.keys() != self._members.keys():
+            raise ValueError(f"Series index has ids {sorted(self._members)}, columns have {sorted(expected)}")
+        if expected.keys() != self.series.keys():
+            raise ValueError(f"Series attributes have ids {sorted(self.series)}, columns have {sorted(expected)}")
+        for series_id, row_ids in expected.items():
+            if not np.array_equal(row_ids, self._members[series_id]):
+                raise ValueError(f"Series index for series {series_id} does not match its rows")
+        if self._size and np.any(np.diff(self._row_id[:self._size]) <= 0):
+            raise ValueError("Row ids are not strictly increasing")
+
+    def whole_series_spec(self, series_id, row_count):
+        """Return the parametric form of a series if row_count rows cover all of it, else None."""
+        info = self.series.get(int(series_id))
+        if info is None or info.spec is None or row_count != info.spec.length:
+            return None
+        return info.spec
+
+    def colors(self):
+        """Return the color of every row, looked up from its series."""
+        return self._series_attribute("color")
+
+    def names(self):
+        """Return the series name of every row."""
+        return self._series_attribute("name")
+
+    def _series_attribute(self, attribute):
+        series_ids, inverse = np.unique(self.series_id, return_inverse=True)
+        values = np.empty(len(series_ids), dtype=object)
+        for i, series_id in enumerate(series_ids.tolist()):
+            values[i] = getattr(self.series[series_id], attribute)
+        return values[inverse]
+
+    # Edits -----------------------------------------------------------------
+
+    def append_series(self, series_id, name, color, periods, amounts):
+        """Append the flows of one series in bulk and return their new row ids."""
+        series_id = int(series_id)
+        periods = np.array(periods, dtype=np.int64)
+        amounts = np.array(np.broadcast_to(np.asarray(amounts, dtype=np.float64), periods.shape))
+        row_ids = np.arange(self._next_row_id, self._next_row_id + len(periods), dtype=np.int64)
+        self._next_row_id += len(periods)
+
+        self._set_series(series_id, SeriesInfo(name, color))
+        self._insert(row_ids, periods, amounts, np.full(len(row_ids), series_id, dtype=np.int32))
+        self._changed()
+        return row_ids
+
+    def append_spec(self, series_id, name, color, spec):
+        """Add a parametric series; its rows are expanded the first time rows are read."""
+        series_id = int(series_id)
+        # Row ids are reserved now so the rows get the same ids whenever they are expanded
+        first_row_id = self._next_row_id
+        self._next_row_id += spec.length
+
+        self._set_series(series_id, SeriesInfo(name, color, spec))
+        self._add_pending(series_id, first_row_id)
+        self._changed()
+
+    def remove_rows(self, row_ids):
+        """Remove the given rows, dropping any series left without flows."""
+        positions = self.positions(row_ids)
+        if len(positions) == 0:
+            return
+        affected_series = np.unique(self._series_id[positions])
+        self._delete(positions)
+        self._release_series(affected_series)
+        self._changed()
+
+    def set_amounts(self, row_ids, amounts):
+        """Overwrite the amounts of the given rows."""
+        positions = self.positions(row_ids)
+        self._set_rows(positions, np.broadcast_to(np.asarray(amounts, dtype=np.float64), positions.shape),
+                       self._series_id[positions])
+        self._break_pattern(np.unique(self._series_id[positions]))
+        self._changed()
+
+    def scale_series(self, series_ids, factor):
+        """Multiply every flow of the given series by factor, in one pass over all of them."""
+        series_ids = np.unique(np.asarray(series_ids)).tolist()
+        members = []
+        scaled = {}
+        for series_id in series_ids:
+            members.append(self.series_rows(series_id))
+            info = self.series.get(series_id)
+            if info is not None and info.spec is not None:
+                scaled[series_id] = info.replace(spec=info.spec.scaled(factor))
+        if members:
+            positions = self.positions(np.concatenate(members))
+            self._set_rows(positions, self._amount[positions] * factor, self._series_id[positions])
+        self._set_many_series(scaled)
+        self._changed()
+
+    def assign_series(self, row_ids, series_id, name, color):
+        """Move the given rows into the series series_id with the given name and color."""
+        self.assign_segments(row_ids, np.zeros(len(row_ids), dtype=np.intp), [(series_id, name, color)])
+
+    def assign_segments(self, row_ids, segments, series):
+        """Move each row into the series series[segments[k]], in one pass.
+
+        series is a list of (series id, name, color) triples.
+        """
+        positions = self.positions(row_ids)
+        new_ids = np.array([series_id for series_id, _, _ in series], dtype=np.int32)
+        old_series = np.unique(self._series_id[positions])
+        for series_id, name, color in series:
+            self._set_series(int(series_id), SeriesInfo(name, color))
+        self._set_rows(positions, self._amount[positions], new_ids[np.asarray(segments)])
+        self._release_series(np.setdiff1d(old_series, new_ids))
+        self._changed()
+
+    def rename_series(self, series_id, name):
+        series_id = int(series_id)
+        self._set_series(series_id, self.series[series_id].replace(name=name))
+        self._changed()
+
+    def clear(self):
+        self._delete(np.arange(len(self)))
+        for series_id in list(self.series):
+            self._set_series(series_id, None)
+        self._changed()
+
+    def _release_series(self, series_ids):
+        """After rows left the given series, drop the empty ones and mark the rest as edited."""
+        for series_id in np.asarray(series_ids).tolist():
+            if series_id in self._members:
+                self._break_pattern([series_id])
+            else:
+                self._set_series(series_id, None)
+
+    def _break_pattern(self, series_ids):
+        """Forget the parametric form of series whose rows no longer follow it."""
+        for series_id in np.asarray(series_ids).tolist():
+            info = self.series[series_id]
+            if info.spec is not None:
+                self._set_series(series_id, info.replace(spec=None))
+
+    def _changed(self):
+        self.version += 1
+
+    # Change log ------------------------------------------------------------
+
+    def take_changes(self):
+        """Return the primitive changes recorded since the last call and start a new list."""
+        changes, self._changes = self._changes, []
+        return changes
+
+    def apply_changes(self, changes, reverse=False):
+        """Replay recorded changes, or undo them (last first) when reverse is True."""
+        self._recording = False
+        try:
+            for change in (reversed(changes) if reverse else changes):
+                kind = change[0]
+                if kind in ("insert", "delete"):
+                    _, row_ids, periods, amounts, series_ids = change
+                    if (kind == "insert") != reverse:
+                        self._insert(row_ids, periods, amounts, series_ids)
+                    else:
+                        self._delete(self.positions(row_ids))
+                elif kind == "set":
+                    _, row_ids, old_amounts, new_amounts, old_series_ids, new_series_ids = change
+                    if reverse:
+                        self._set_rows(self.positions(row_ids), old_amounts, old_series_ids)
+                    else:
+                        self._set_rows(self.positions(row_ids), new_amounts, new_series_ids)
+                elif kind == "series":
+                    _, series_id, old_info, new_info = change
+                    self._set_series(series_id, old_info if reverse else new_info)
+                elif kind == "series_many":
+                    _, old_infos, new_infos = change
+                    self._set_many_series(old_infos if reverse else new_infos)
+                elif kind == "spec":
+                    _, series_id, first_row_id, length = change
+                    if not reverse:
+                        self._add_pending(series_id, first_row_id)
+                    elif series_id in self._pending:
+                        del self._pending[series_id]
+                    else:
+                        # Later changes were undone first, so all of the expanded rows are present
+                        self._delete(self.positions(np.arange(first_row_id, first_row_id + length)))
+        finally:
+            self._recording = True
+        self._changed()
+
+    @staticmethod
+    def changes_nbytes(changes):
+        """Approximate memory held by a list of recorded changes."""
+        total = 0
+        for change in changes:
+            total += 64 + sum(part.nbytes for part in change if isinstance(part, np.ndarray))
+        return total
+
+    def _record(self, change):
+        if self._recording:
+            self._changes.append(change)
+
+    # Primitive changes -----------------------------------------------------
+
+    def _insert(self, row_ids, periods, amounts, series_ids):
+        """Insert rows at their sorted row id positions."""
+        if len(row_ids) == 0:
+            return
+        self._record(("insert", row_ids, periods, amounts, series_ids))
+        self._insert_rows(row_ids, periods, amounts, series_ids)
+
+    def _delete(self, positions):
+        """Delete the rows at the given positions."""
+        if len(positions) == 0:
+            return
+        size = self._size
+        row_ids = self._row_id[positions]
+        series_ids = self._series_id[positions]
+        self._record(("delete", row_ids, self._period[positions], self._amount[positions], series_ids))
+        self._unindex_rows(row_ids, series_ids)
+
+        # Only rows after the first deleted one move
+        start = int(positions.min())
+        keep = np.ones(size - start, dtype=bool)
+        keep[positions - start] = False
+        count = start + int(keep.sum())
+        for column in (self._period, self._amount, self._series_id, self._row_id):
+            column[start:count] = column[start:size][keep]
+        self._size = count
+
+    def _set_rows(self, positions, amounts, series_ids):
+        """Overwrite the amount and series id of the rows at the given positions."""
+        if len(positions) == 0:
+            return
+        row_ids = self._row_id[positions]
+        old_series_ids = self._series_id[positions]
+        amounts = np.array(amounts, dtype=np.float64)
+        series_ids = np.array(series_ids, dtype=np.int32)
+        self._record(("set", row_ids, self._amount[positions], amounts, old_series_ids, series_ids))
+
+        self._amount[positions] = amounts
+        moved = old_series_ids != series_ids
+        if moved.any():
+            self._unindex_rows(row_ids[moved], old_series_ids[moved])
+            self._series_id[positions] = series_ids
+            self._index_rows(row_ids[moved], series_ids[moved])
+
+    def _set_series(self, series_id, info):
+        """Store the attributes of a series, or remove them when info is None."""
+        old_info = self.series.get(series_id)
+        if old_info is None and info is None:
+            return
+        self._record(("series", series_id, old_info, info))
+        if info is None:
+            del self.series[series_id]
+        else:
+            self.series[series_id] = info
+
+    def _set_many_series(self, infos):
+        """Store the attributes of several series (series id -> SeriesInfo or None) as one change."""
+        if not infos:
+            return
+        self._record(("series_many", {series_id: self.series.get(series_id) for series_id in infos}, infos))
+        for series_id, info in infos.items():
+            if info is None:
+                self.series.pop(series_id, None)
+            else:
+                self.series[series_id] = info
+
+    def _add_pending(self, series_id, first_row_id):
+        self._record(("spec", series_id, first_row_id, self.series[series_id].spec.length))
+        self._pending[series_id] = first_row_id
+
+    # Storage helpers -------------------------------------------------------
+
+    def _insert_rows(self, row_ids, periods, amounts, series_ids):
+        order = np.argsort(row_ids, kind="stable")
+        values = (np.asarray(periods, dtype=np.int64)[order], np.asarray(amounts, dtype=np.float64)[order],
+                  np.asarray(series_ids, dtype=np.int32)[order], np.asarray(row_ids, dtype=np.int64)[order])
+        row_ids = values[3]
+        count = len(row_ids)
+        size = self._size
+        self._reserve(size + count)
+        columns = (self._period, self._amount, self._series_id, self._row_id)
+
+        if size == 0 or row_ids[0] > self._row_id[size - 1]:
+            # New rows come after every existing row, so this is a plain append
+            for column, column_values in zip(columns, values):
+                column[size:size + count] = column_values
+        else:
+            # Only rows after the first insertion point move
+            where = np.searchsorted(self._row_id[:size], row_ids)
+            start = int(where[0])
+            for column, column_values in zip(columns, values):
+                column[start:size + count] = np.insert(column[start:size], where - start, column_values)
+        self._size = size + count
+        self._index_rows(row_ids, values[2])
+
+    def _index_rows(self, row_ids, series_ids):
+        """Add rows to the series index, touching only the series they belong to."""
+        # Group the rows by series once rather than masking all of them per series
+        for series_id, new_rows in self._build_members(series_ids, row_ids).items():
+            new_rows = np.sort(new_rows)
+            existing = self._members.get(series_id)
+            if existing is None:
+                self._members[series_id] = new_rows
+            elif new_rows[0] > existing[-1]:
+                self._members[series_id] = np.concatenate((existing, new_rows))
+            else:
+                self._members[series_id] = np.union1d(existing, new_rows)
+
+    def _unindex_rows(self, row_ids, series_ids):
+        """Take rows out of the series index, touching only the series they belong to."""
+        for series_id, old_rows in self._build_members(series_ids, row_ids).items():
+            members = self._members[series_id]
+            remaining = members[~np.isin(members, old_rows, assume_unique=True)]
+            if len(remaining):
+                self._members[series_id] = remaining
+            else:
+                del self._members[series_id]
+
+    @staticmethod
+    def _build_members(series_ids, row_ids):
+        """Group row ids by series id; row ids stay ascending within each group."""
+        order = np.argsort(series_ids, kind="stable")
+        grouped_ids = series_ids[order]
+        starts = np.flatnonzero(np.r_[True, grouped_ids[1:] != grouped_ids[:-1]]) if len(order) else []
+        groups = np.split(row_ids[order], starts[1:]) if len(order) else []
+        return {int(grouped_ids[start]): group for start, group in zip(starts, groups)}
+
+    def _expand_pending(self):
+        """Materialize the rows of parametric series added since the last read.
+
+        Expansion does not change what the diagram holds, so it is not recorded.
+        """
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        parts = []
+        for series_id, first_row_id in pending.items():
+            spec = self.series[series_id].spec
+            parts.append((np.arange(first_row_id, first_row_id + spec.length, dtype=np.int64), spec.periods(),
+                          spec.amounts(), np.full(spec.length, series_id, dtype=np.int32)))
+        self._insert_rows(*(np.concatenate(column) for column in zip(*parts)))
+
+    def _reserve(self, capacity):
+        """Grow the column arrays geometrically so appends are amortized O(1) per row."""
+        if capacity <= len(self._period):
+            return
+        new_capacity = max(capacity, 2 * len(self._period))
+        for attr in ("_period", "_amount", "_series_id", "_row_id"):
+            old = getattr(self, attr)
+            new = np.empty(new_capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, attr, new)
+
+    # DataFrame view --------------------------------------------------------
+
+    def to_frame(self):
+        """Return the flows as a DataFrame indexed by row id.
+
+        The frame is cached until the next change and must be treated as read-only;
+        edits go through the store methods.
+        """
+        self._expand_pending()
+        if self._frame_version != self.version:
+            self._frame = pd.DataFrame({
+                "Period": self.period.copy(),
+                "Cash Flow": self.amount.copy(),
+                "Color": self.colors(),
+                "Series_ID": self.series_id.copy(),
+                "Series_Name": self.names(),
+            }, index=pd.Index(self.row_id.copy()), columns=COLUMNS)
+            self._frame_version = self.version
+        return self._frame
+
+    @classmethod
+    def from_frame(cls, frame):
+        """Build a store from a DataFrame with the standard cash flow columns."""
+        store = cls(capacity=max(len(frame), 64))
+        if frame.empty:
+            return store
+
+        frame = frame.sort_index()
+        count = len(frame)
+        store._period[:count] = frame["Period"].to_numpy(dtype=np.int64)
+        store._amount[:count] = frame["Cash Flow"].to_numpy(dtype=np.float64)
+        store._series_id[:count] = frame["Series_ID"].to_numpy(dtype=np.int32)
+        store._row_id[:count] = frame.index.to_numpy(dtype=np.int64)
+        store._size = count
+        store._next_row_id = int(store._row_id[count - 1]) + 1
+        store._members = cls._build_members(store._series_id[:count].copy(), store._row_id[:count].copy())
+
+        first_rows = frame.drop_duplicates("Series_ID")
+        for series_id, name, color in zip(first_rows["Series_ID"].tolist(), first_rows["Series_Name"].tolist(),
+                                          first_rows["Color"].tolist()):
+            store.series[int(series_id)] = SeriesInfo(name, color)
+        store._changed()
+        return store
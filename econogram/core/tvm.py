@@ -0,0 +1,137 @@
+"""Time value of money engine.
+
+Moves whole arrays of cash flows to a target period with one vector of
+compounding factors, and evaluates several series at once by grouping their
+flows, instead of looping over rows in Python. Wherever a rate is taken it may
+also be a RateSchedule, for rates that vary from period to period.
+"""
+import numpy as np
+from econogram.core.factors import factor_cache
+from econogram.core.rates import RateSchedule
+
+PROFILE_BLOCK = 500  # rates per block in npv_profile, to bound the size of the factor matrix
+POWER_BLOCK = 32  # periods per block when npv_profile evaluates dense periods as a polynomial
+DENSE_SPAN_FACTOR = 4  # periods count as dense when they span at most this many times their number
+
+
+def compounding_factors(periods, rate, target):
+    """Return (1 + rate) ** (target - period) for each flow; target may be one period or one per flow."""
+    if isinstance(rate, RateSchedule):
+        return rate.factors(periods, target)
+    exponents = np.asarray(target) - np.asarray(periods)
+    if exponents.dtype.kind in "iu":
+        # Whole periods are looked up in the cached factor table for this rate
+        return factor_cache.powers(rate, exponents)
+    return (1 + rate) ** exponents.astype(np.float64)
+
+
+def equivalent_value(periods, amounts, rate, target):
+    """Return the combined worth of the flows moved to the target period."""
+    return float(np.dot(np.asarray(amounts, dtype=np.float64), compounding_factors(periods, rate, target)))
+
+
+def net_flows(periods, amounts):
+    """Return the periods with flows and the net amount in each, dropping periods that net to zero."""
+    periods = np.asarray(periods, dtype=np.int64)
+    amounts = np.asarray(amounts, dtype=np.float64)
+    if len(periods) == 0:
+        return periods, amounts
+    first_period = periods.min()
+    span = int(periods.max() - first_period) + 1
+    if span <= DENSE_SPAN_FACTOR * len(periods):
+        # Dense periods are summed straight into one slot per period, without sorting
+        totals = np.bincount(periods - first_period, weights=amounts, minlength=span)
+        nonzero = np.flatnonzero(totals)
+        return nonzero + first_period, totals[nonzero]
+    unique_periods, inverse = np.unique(periods, return_inverse=True)
+    totals = np.bincount(inverse, weights=amounts, minlength=len(unique_periods))
+    nonzero = totals != 0
+    return unique_periods[nonzero], totals[nonzero]
+
+
+def group_flows(keys):
+    """Group flows by key (e.g. series id).
+
+    Returns the distinct keys, the group number of each flow and the number of flows in each group.
+    """
+    return np.unique(np.asarray(keys), return_inverse=True, return_counts=True)
+
+
+def group_period_range(periods, groups, group_count):
+    """Return the first and last period of each group."""
+    periods = np.asarray(periods, dtype=np.int64)
+    first = np.full(group_count, np.iinfo(np.int64).max)
+    last = np.full(group_count, np.iinfo(np.int64).min)
+    np.minimum.at(first, groups, periods)
+    np.maximum.at(last, groups, periods)
+    return first, last
+
+
+def grouped_equivalent_values(periods, amounts, groups, rate, targets):
+    """Return the worth of each group of flows moved to that group's own target period.
+
+    groups gives the group number (0 .. len(targets) - 1) of each flow.
+    """
+    groups = np.asarray(groups)
+    targets = np.asarray(targets)
+    weighted = np.asarray(amounts, dtype=np.float64) * compounding_factors(periods, rate, targets[groups])
+    return np.bincount(groups, weights=weighted, minlength=len(targets))
+
+
+def net_worths(periods, amounts, rate, reference_period):
+    """Return the net present, future and equivalent annual worth of a whole set of flows.
+
+    Present worth is taken at reference_period and future worth at the last period
+    with a flow. The annual worth spreads the present worth uniformly over the periods
+    after reference_period up to the last one, and is None if there are none.
+    Returns (present, future, annual, last_period).
+    """
+    periods = np.asarray(periods)
+    if len(periods) == 0:
+        return 0.0, 0.0, None, reference_period
+
+    present = equivalent_value(periods, amounts, rate, reference_period)
+    last_period = int(periods.max())
+    span = last_period - reference_period
+    if isinstance(rate, RateSchedule):
+        future = present * float(rate.factors(reference_period, last_period))
+        annual = present * rate.ap(reference_period, span) if span > 0 else None
+    else:
+        future = present * float(factor_cache.powers(rate, span))
+        annual = present * factor_cache.ap(rate, span) if span > 0 else None
+    return present, future, annual, last_period
+
+
+def npv_profile(periods, amounts, rates, reference_period=0):
+    """Return the net present worth at reference_period for every rate in rates.
+
+    Flows are netted per period. When the periods are dense, the worth is a
+    polynomial in 1 / (1 + i), evaluated in blocks of POWER_BLOCK periods: one
+    matrix product of the (rates x POWER_BLOCK) discount factors with the
+    amounts laid out block by block, then each block shifted by its own factor.
+    That needs far fewer exponentials than one per rate and period. Sparse
+    periods use the full (rates x periods) matrix of discount factors.
+    """
+    periods, amounts = net_flows(periods, amounts)
+    log_growth = np.log1p(np.asarray(rates, dtype=np.float64))
+    if len(periods) == 0:
+        return np.zeros(len(log_growth))
+
+    first_period = periods[0]
+    span = int(periods[-1] - first_period) + 1
+    if span <= DENSE_SPAN_FACTOR * len(periods):
+        block_count = -(-span // POWER_BLOCK)
+        coefficients = np.zeros(block_count * POWER_BLOCK)
+        coefficients[periods - first_period] = amounts
+        within_block = np.exp(-np.outer(log_growth, np.arange(POWER_BLOCK)))
+        block_starts = POWER_BLOCK * np.arange(block_count) + float(first_period - reference_period)
+        block_shift = np.exp(-np.outer(log_growth, block_starts))
+        block_sums = within_block @ coefficients.reshape(block_count, POWER_BLOCK).T
+        return np.einsum("ij,ij->i", block_sums, block_shift)
+
+    offsets = (periods - reference_period).astype(np.float64)
+    values = np.empty(len(log_growth))
+    for start in range(0, len(log_growth), PROFILE_BLOCK):
+        block = log_growth[start:start + PROFILE_BLOCK]
+        values[start:start + PROFILE_BLOCK] = np.exp(-np.outer(block, offsets)) @ amounts
+    return values
@@ -0,0 +1,326 @@
+"""Headless diagram rendering module.
+
+Draws a cash flow diagram from a CashFlowStore with matplotlib's Agg canvas, so
+diagrams can be rendered and exported to PNG, SVG or PDF without Tk, for
+example in batch worker processes. The bar layout, axis styling, limits, legend
+and balance overlay here are shared with the interactive plot in
+scripts/Update_Plot.py.
+"""
+import os
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba_array
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
+import matplotlib.ticker as mtick
+from econogram.core.payback import crossing_period
+from econogram.core.tvm import net_flows, compounding_factors
+
+# Width of each bar in period units (matches the ax.bar default)
+BAR_WIDTH = 0.8
+
+# Fill color for the aggregated envelopes drawn when periods outnumber pixel columns
+ENVELOPE_COLOR = "dimgray"
+
+BALANCE_COLOR = "black"
+
+DEFAULT_TITLE = "Cash Flow Diagram"
+FIGURE_SIZE = (10, 8)
+EXPORT_FORMATS = ("png", "svg", "pdf")
+
+
+class BarLayout:
+    """Stacked bar geometry for the plotted cash flows, in drawing order."""
+
+    def __init__(self, row_ids, periods, bottoms, heights, colors):
+        self.row_ids = row_ids    # cash_flows index label of each bar
+        self.periods = periods    # x position (bar centre)
+        self.bottoms = bottoms    # y of the edge closest to the stacking base
+        self.heights = heights    # signed cash flow amount
+        self.colors = colors
+        self.positions = {row_id: pos for pos, row_id in enumerate(row_ids.tolist())}
+
+    def __len__(self):
+        return len(self.row_ids)
+
+
+def compute_bar_layout(store):
+    """Compute stacked bar offsets for every cash flow in one vectorized pass.
+
+    Within each period, flows are sorted by amount (largest first) and stacked
+    upward from zero for inflows and downward from zero for outflows.
+    """
+    periods = store.period
+    amounts = store.amount
+
+    # Sort by period, then by descending amount, so each (period, sign) group is contiguous
+    order = np.lexsort((-amounts, periods))
+    periods = periods[order]
+    amounts = amounts[order]
+    negative = amounts < 0
+
+    # Offsets are the running total within each (period, sign) group, excluding the bar itself
+    running = np.cumsum(amounts) - amounts
+    group_start = np.ones(len(amounts), dtype=bool)
+    group_start[1:] = (periods[1:] != periods[:-1]) | (negative[1:] != negative[:-1])
+    start_positions = np.maximum.accumulate(np.where(group_start, np.arange(len(amounts)), 0))
+    bottoms = running - running[start_positions]
+
+    return BarLayout(store.row_id[order], periods, bottoms, amounts, store.colors()[order])
+
+
+def bar_vertices(layout, positions=None):
+    """Return the rectangle corners of the bars at the given layout positions."""
+    periods = layout.periods if positions is None else layout.periods[positions]
+    bottoms = layout.bottoms if positions is None else layout.bottoms[positions]
+    heights = layout.heights if positions is None else layout.heights[positions]
+    left = periods - BAR_WIDTH / 2
+    right = periods + BAR_WIDTH / 2
+    top = bottoms + heights
+    return np.stack([
+        np.column_stack([left, bottoms]),
+        np.column_stack([left, top]),
+        np.column_stack([right, top]),
+        np.column_stack([right, bottoms]),
+    ], axis=1)
+
+
+def data_y_limits(layout):
+    """Return the y-range of the stacked bars, padded the way autoscaling pads ax.bar."""
+    tops = layout.bottoms + layout.heights
+    ymin = min(layout.bottoms.min(), tops.min())
+    ymax = max(layout.bottoms.max(), tops.max())
+    margin = 0.05 * (ymax - ymin)
+    # Bars are anchored at zero, so no padding is added past a zero edge
+    if ymin < 0:
+        ymin -= margin
+    if ymax > 0:
+        ymax += margin
+    if ymin == ymax:
+        # Only zero-amount flows; widen the empty range as autoscaling would
+        delta = 0.001 * abs(ymin) or 0.001
+        ymin, ymax = ymin - delta, ymax + delta
+    return ymin, ymax
+
+
+def create_envelopes(ax, layout, xmin, xmax, bucket_count):
+    """Draw per-bucket positive and negative envelopes instead of individual bars.
+
+    Each bucket spans several periods and is drawn from the largest stacked
+    inflow to the largest stacked outflow of any period inside it.
+    """
+    first_period = int(np.floor(xmin))
+    period_span = int(np.ceil(xmax)) - first_period + 1
+    start = np.searchsorted(layout.periods, first_period, side="left")
+    end = np.searchsorted(layout.periods, first_period + period_span, side="left")
+    if start == end:
+        return None
+    periods = layout.periods[start:end]
+    heights = layout.heights[start:end]
+
+    # Stacked inflow and outflow totals per period (layout is already sorted by period)
+    period_starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+    unique_periods = periods[period_starts]
+    positive_totals = np.add.reduceat(np.clip(heights, 0, None), period_starts)
+    negative_totals = np.add.reduceat(np.clip(heights, None, 0), period_starts)
+
+    # Reduce the period totals into fixed-width buckets
+    buckets = (unique_periods - first_period) * bucket_count // period_span
+    bucket_starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    bucket_tops = np.maximum.reduceat(positive_totals, bucket_starts)
+    bucket_bottoms = np.minimum.reduceat(negative_totals, bucket_starts)
+
+    bucket_width = period_span / bucket_count
+    left = first_period - 0.5 + buckets[bucket_starts] * bucket_width
+    right = left + bucket_width
+    verts = np.stack([
+        np.column_stack([left, bucket_bottoms]),
+        np.column_stack([left, bucket_tops]),
+        np.column_stack([right, bucket_tops]),
+        np.column_stack([right, bucket_bottoms]),
+    ], axis=1)
+
+    collection = PolyCollection(verts, facecolors=ENVELOPE_COLOR, linewidths=0)
+    ax.add_collection(collection, autolim=False)
+    return collection
+
+
+def set_y_limits_with_buffer(ax):
+    buffer_percentage = 0.25
+    ymin, ymax = ax.get_ylim()
+    y_range = ymax - ymin
+    ax.set_ylim(bottom=ymin - buffer_percentage * y_range, top=ymax + buffer_percentage * y_range)
+    ax.axhline(0, color='black', linewidth=0.5)
+
+
+def fit_y_limits(ax, store, layout, balance_rate=None, reference_period=0):
+    """Set the y-range to fit the stacked bars plus the buffer, and draw the zero line.
+
+    With balance_rate, the balance overlay is drawn too and the y-range widened
+    to fit it.
+    """
+    ax.set_ylim(*data_y_limits(layout))
+    if balance_rate is not None:
+        # Widen the y-range so the whole cumulative balance line is visible
+        low, high = draw_balance_overlay(ax, store, balance_rate, reference_period)
+        ymin, ymax = ax.get_ylim()
+        ax.set_ylim(min(ymin, low), max(ymax, high))
+    set_y_limits_with_buffer(ax)
+
+
+def envelope_buckets(ax):
+    """Return how many envelopes to draw for the current x-range, or None to draw bars."""
+    xmin, xmax = ax.get_xlim()
+    pixel_columns = max(int(ax.get_window_extent().width), 1)
+    # With more periods than pixel columns, individual bars can't be seen; draw envelopes instead
+    return pixel_columns if xmax - xmin > pixel_columns else None
+
+
+def style_axes(ax, title=DEFAULT_TITLE):
+    """Label the axes and set the dollar and whole-period tick formats."""
+    ax.set_xlabel("Period")
+    ax.set_ylabel("Dollars")
+    ax.set_title(title)
+
+    # Format y-axis ticks with dollar sign and comma separators, two decimal places
+    # Use StrMethodFormatter instead of FuncFormatter so we don't need ticklabel_format
+    ax.yaxis.set_major_formatter(mtick.StrMethodFormatter("${x:,.2f}"))
+
+    # Let the locator pick whole-period ticks that fit the current view at any horizon length
+    ax.xaxis.set_major_locator(mtick.MaxNLocator(nbins="auto", integer=True, steps=[1, 2, 5, 10]))
+
+
+def diagram_x_limits(periods):
+    """Return the x-range that shows every one of periods."""
+    max_period = periods.max()
+    min_period = periods.min()
+    tick_interval = 1 if max_period <= 20 else (2 if max_period <= 50 else 5)
+    next_tick_mark = ((max_period // tick_interval) + 1) * tick_interval
+    return min(-0.5, min_period - 0.5), next_tick_mark + 0.5
+
+
+def legend_handles(store, balance=False, picker=False):
+    """Return one legend patch per distinct series name and color, sorted by name.
+
+    With balance, the two balance overlay lines are listed after the series.
+    """
+    entries = {}
+    for info in store.series.values():
+        entries.setdefault((info.name, str(info.color)), info)
+    handles = [Patch(facecolor=info.color, edgecolor="black", label=info.name, picker=picker)
+               for info in sorted(entries.values(), key=lambda info: info.name)]
+    if balance:
+        handles.append(Line2D([], [], color=BALANCE_COLOR, label="Cumulative balance"))
+        handles.append(Line2D([], [], color=BALANCE_COLOR, linestyle="--", label="Discounted balance"))
+    return handles
+
+
+def draw_balance_overlay(ax, store, rate, reference_period):
+    """Draw the simple and discounted cumulative balances as step lines and mark the discounted payback.
+
+    Returns the lowest and highest balance drawn.
+    """
+    periods, totals = net_flows(store.period, store.amount)
+    simple = np.cumsum(totals)
+    discounted = np.cumsum(totals * compounding_factors(periods, rate, reference_period))
+    ax.step(periods, simple, where="post", color=BALANCE_COLOR, linewidth=1.2)
+    ax.step(periods, discounted, where="post", color=BALANCE_COLOR, linewidth=1.2, linestyle="--")
+
+    payback = crossing_period(periods, discounted)
+    if payback is not None:
+        ax.axvline(payback, color=BALANCE_COLOR, linestyle=":", linewidth=1)
+    balances = np.concatenate((simple, discounted))
+    finite = balances[np.isfinite(balances)]
+    return (finite.min(), finite.max()) if len(finite) else (0.0, 0.0)
+
+
+def export_format(path, format=None):
+    """Return the export format for path, from format or else the file extension."""
+    format = (format or os.path.splitext(path)[1].lstrip(".")).lower()
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Diagrams can be exported as {', '.join(EXPORT_FORMATS)}, not {format or 'no format'}.")
+    return format
+
+
+class DiagramRenderer:
+    """Draws diagrams into one figure that is reused for every diagram.
+
+    The figure has an Agg canvas and no window. Each diagram removes the
+    previous diagram's artists instead of creating a new figure, so rendering
+    many diagrams in a row does not grow memory. The axes are styled once and
+    keep their tick objects, which matplotlib would otherwise rebuild on every
+    ax.clear().
+    """
+
+    def __init__(self, figsize=FIGURE_SIZE, dpi=100):
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(self.figure)
+        self.figure.subplots_adjust(right=0.7)
+        self.ax = self.figure.add_subplot()
+        style_axes(self.ax)
+
+    def clear(self):
+        """Remove the bars, lines and legend of the previous diagram."""
+        ax = self.ax
+        for artist in list(ax.collections) + list(ax.lines) + list(ax.patches):
+            artist.remove()
+        if ax.get_legend() is not None:
+            ax.get_legend().remove()
+
+    def draw(self, store, title=DEFAULT_TITLE, xlim=None, balance_rate=None, reference_period=0):
+        """Draw the diagram of store.
+
+        xlim limits the view to a range of periods (default: every period). With
+        balance_rate, the cumulative balances discounted at that rate (a single
+        rate or a RateSchedule) to reference_period are drawn over the bars.
+        """
+        ax = self.ax
+        self.clear()
+        ax.set_title(title)
+        if store.empty:
+            return
+
+        layout = compute_bar_layout(store)
+        fit_y_limits(ax, store, layout, balance_rate, reference_period)
+        xmin, xmax = xlim if xlim is not None else diagram_x_limits(store.period)
+        ax.set_xlim(xmin, xmax)
+
+        bucket_count = envelope_buckets(ax)
+        if bucket_count is not None:
+            create_envelopes(ax, layout, xmin, xmax, bucket_count)
+        else:
+            bars = PolyCollection(bar_vertices(layout), facecolors=to_rgba_array(list(layout.colors)), linewidths=0)
+            ax.add_collection(bars, autolim=False)
+        ax.legend(handles=legend_handles(store, balance_rate is not None), loc="upper left",
+                  bbox_to_anchor=(1.05, 1), borderaxespad=0)
+
+    def save(self, store, path, title=DEFAULT_TITLE, format=None, **options):
+        """Draw the diagram of store and write it to path as png, svg or pdf.
+
+        The format defaults to the file extension; options are passed to draw().
+        """
+        format = export_format(path, format)
+        self.draw(store, title, **options)
+        self.figure.savefig(path, format=format)
+
+
+def export_diagram(store, path, format=None, title=DEFAULT_TITLE, **options):
+    """Export one diagram to a png, svg or pdf file; see DiagramRenderer.draw for the options."""
+    DiagramRenderer().save(store, path, title, format, **options)
+
+
+def export_diagrams(diagrams, format=None, renderer=None, **options):
+    """Export many diagrams through one reused figure.
+
+    diagrams yields (store, path) or (store, path, title) tuples. Returns the
+    number exported.
+    """
+    renderer = renderer or DiagramRenderer()
+    count = 0
+    for store, path, *title in diagrams:
+        renderer.save(store, path, title[0] if title else DEFAULT_TITLE, format, **options)
+        count += 1
+    return count
@@ -3,11 +3,14 @@
 This module initializes and launches the Econogram desktop application,
 a tool for creating and analyzing cash flow diagrams used in engineering economics.
 """
+import multiprocessing
 import tkinter as tk
 from scripts.Final_CFD import CashFlowDiagramApp
 
 
 if __name__ == "__main__":
+    # Lets the Monte Carlo worker processes start from a frozen executable
+    multiprocessing.freeze_support()
     root = tk.Tk()
     app = CashFlowDiagramApp(root)
     root.mainloop()
\ No newline at end of file
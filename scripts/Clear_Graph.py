@@ -3,7 +3,6 @@
 Provides the functionality to clear all cash flows from the diagram.
 """
 from tkinter import messagebox
-from scripts.Create_Table import create_table
 
 
 def clear_graph(app):
@@ -11,25 +10,12 @@ def clear_graph(app):
     user_confirmed = messagebox.askyesno("Confirm Clear", "Are you sure you want to clear the graph and all data?")
 
     if user_confirmed:
-        # Clear the DataFrame
-        app.cash_flows = app.cash_flows.iloc[0:0]  # Reset to an empty DataFrame
+        # Remove every cash flow from the store
+        app.store.clear()
 
-        # Clear any selection indices and rectangles
+        # Clear any selection indices (the highlight overlay is rebuilt by update_plot)
         app.selected_indices = []
-        if hasattr(app, 'selection_rects'):
-            for rect in app.selection_rects:
-                rect.set_visible(False)
-            app.selection_rects.clear()
+        app.view_xlim = None
 
-        # Clear the canvas
-        if app.canvas:
-            app.canvas.get_tk_widget().pack_forget()
-            app.canvas = None
-
-        create_table(app, [])
-
-        # Save the state after clearing
-        app._save_state()
-
-        # Update the plot to reflect changes
+        # Update the plot (and the state history) to reflect changes
         app.update_plot()
@@ -1,10 +1,10 @@
 """Combine cash flows module.
 
-Combines multiple cash flows occurring in the same period into a single aggregated value.
+Combines multiple cash flows occurring in the same period into a single aggregated value,
+either for the selected cash flows or for every period of the diagram at once.
 """
-import pandas as pd
 from tkinter import messagebox
-from scripts.Create_Table import create_table
+from econogram.core.operations import combine_flows, consolidate_periods
 
 
 def combine_cash_flows(app):
@@ -13,57 +13,47 @@ def combine_cash_flows(app):
         messagebox.showinfo("Info", "Please select multiple cash flows in the same period to combine.")
         return
 
-    # Check if the selected cash flows are from the same period
-    periods = app.cash_flows.loc[app.selected_indices, "Period"]
-    if len(periods.unique()) > 1:
-        messagebox.showerror("Error", "Selected cash flows must be in the same period to be combined.")
+    store = app.store
+    if not store.contains(app.selected_indices).all():
+        messagebox.showinfo("Selection Error", "Selected cash flows no longer exist.")
         return
 
     try:
-        # Calculate the combined cash flow value
-        combined_value = app.cash_flows.loc[app.selected_indices, "Cash Flow"].sum()
-        period = periods.iloc[0]
+        # Replace the selected cash flows as one undo step and one redraw
+        with app.transaction():
+            combine_flows(store, app.selected_indices, app._get_next_series_id, app.get_next_color)
 
-        # Extract the selected cash flows
-        selected_cash_flows = app.cash_flows.loc[app.selected_indices]
+            # Reset app selections and visuals
+            app.selected_indices = []  # Clear selected indices
+            for text in app.value_texts:
+                text.remove()  # Remove any text over the bars
+            app.value_texts = []
 
-        # Generate a new series ID for the combined entry
-        new_series_id = app._get_next_series_id()
-
-        # Combine series names into a single name
-        series_name = " + ".join(selected_cash_flows["Series_Name"].unique())
-
-        # Assign a new color using the color manager
-        color = app.get_next_color()
+    except Exception as e:
+        # Show error message if any exception occurs
+        messagebox.showerror("Error", str(e))
 
-        # Create a new entry for the combined cash flow
-        new_entry = pd.DataFrame({
-            "Period": [period],
-            "Cash Flow": [combined_value],
-            "Color": [color],
-            "Series_ID": [new_series_id],
-            "Series_Name": [series_name]
-        })
 
-        # Remove the selected cash flows from the DataFrame
-        app.cash_flows = app.cash_flows.drop(app.selected_indices).reset_index(drop=True)
+def consolidate_all_periods(app, make_new_series=None):
+    """Replace the whole diagram with one net cash flow per period.
 
-        # Add the new combined cash flow entry
-        app.cash_flows = pd.concat([app.cash_flows, new_entry], ignore_index=True)
+    The net flows are computed for every period in one grouped pass. With
+    make_new_series (default: the Make New Series toggle) they are added as a
+    new series and the existing cash flows are kept; otherwise they replace
+    every cash flow on the diagram. Periods that net to zero get no cash flow.
+    Either way it is a single undo step.
+    """
+    store = app.store
+    if store.empty:
+        messagebox.showinfo("Info", "There are no cash flows to consolidate.")
+        return
+    if make_new_series is None:
+        make_new_series = app.makeNewSeries
 
-        create_table(app, [])
+    with app.transaction():
+        consolidate_periods(store, make_new_series, app._get_next_series_id, app.get_next_color)
 
-        # Reset app selections and visuals
-        app.selected_indices = []  # Clear selected indices
-        for rect in app.selection_rects:
-            rect.set_bounds(0, 0, 0, 0)  # Reset highlighted rectangles
+        app.selected_indices = []
         for text in app.value_texts:
             text.remove()  # Remove any text over the bars
         app.value_texts = []
-
-        # Update the application plot with new data
-        app.update_plot()
-
-    except Exception as e:
-        # Show error message if any exception occurs
-        messagebox.showerror("Error", str(e))
@@ -0,0 +1,38 @@
+"""Diagram evaluation module.
+
+Shows the net present, future and equivalent annual worth of every cash flow on
+the diagram in the status bar without changing the diagram. The figures are
+recomputed in one pass over the store whenever the flows, the interest rate
+schedule or the reference period change.
+"""
+from tkinter import simpledialog
+from econogram.core.tvm import net_worths
+
+
+def refresh_worth_display(app):
+    """Update the status bar worth figures if anything they depend on has changed."""
+    key = (app.store.version, app.rate_schedule.version, app.reference_period)
+    if key == app.worth_key:
+        return
+    app.worth_key = key
+
+    if app.store.empty:
+        app.worth_label.config(text="")
+        return
+
+    reference = app.reference_period
+    present, future, annual, last_period = net_worths(app.store.period, app.store.amount, app.rate_schedule,
+                                                      reference)
+    text = f"NPW (period {reference}): ${present:,.2f}    NFW (period {last_period}): ${future:,.2f}"
+    if annual is not None:
+        text += f"    EUAW (periods {reference + 1}-{last_period}): ${annual:,.2f}"
+    app.worth_label.config(text=text)
+
+
+def prompt_reference_period(app):
+    """Ask for the period the diagram's net present worth is measured at."""
+    period = simpledialog.askinteger("Evaluate Diagram", "Enter the reference period for the net present worth:",
+                                     initialvalue=app.reference_period)
+    if period is not None:
+        app.reference_period = period
+        refresh_worth_display(app)
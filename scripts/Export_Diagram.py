@@ -0,0 +1,36 @@
+"""Diagram export module.
+
+Saves the diagram as it is shown (bars, legend, balance overlay and zoomed
+view) to a PNG, SVG or PDF file. It is drawn with the Agg canvas of
+econogram.render rather than the Tk canvas, into one figure the app reuses for
+every export.
+"""
+from tkinter import filedialog, messagebox
+from econogram.render import DiagramRenderer
+
+FILE_TYPES = [("PNG image", "*.png"), ("SVG image", "*.svg"), ("PDF document", "*.pdf")]
+
+
+def export_diagram(app, path, format=None):
+    """Export the current diagram to path; the format defaults to the file extension."""
+    if app.export_renderer is None:
+        app.export_renderer = DiagramRenderer()
+    balance_rate = app.rate_schedule if app.show_balance else None
+    app.export_renderer.save(app.store, path, format=format, xlim=app.view_xlim, balance_rate=balance_rate,
+                             reference_period=app.reference_period)
+
+
+def popup_export_diagram(app):
+    """Ask for a file name and export the current diagram to it."""
+    if app.store.empty:
+        messagebox.showinfo("Info", "Add cash flows to the diagram first.")
+        return
+
+    path = filedialog.asksaveasfilename(title="Export Diagram", defaultextension=".png", filetypes=FILE_TYPES)
+    if not path:
+        return
+
+    try:
+        export_diagram(app, path)
+    except (ValueError, OSError) as e:
+        messagebox.showerror("Export Error", str(e))
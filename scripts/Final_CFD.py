@@ -3,15 +3,15 @@
 This module contains the main application class (CashFlowDiagramApp) and the
 ColorManager class for managing color assignment to cash flow series.
 """
+from contextlib import contextmanager
 import tkinter as tk
 from tkinter import messagebox
-import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
-from scripts.Update_Plot import update_plot
+from scripts.Update_Plot import update_plot, update_selection_display, refresh_table, reset_view
 from scripts.UI_Setup import setup_ui, get_asset_path
 from scripts.Uniform_Series import popup_uniform_series
-from scripts.Combine_CashFlows import combine_cash_flows
+from scripts.Combine_CashFlows import combine_cash_flows, consolidate_all_periods
 from scripts.Single_CashFlow import popup_add_single_cash_flow
 from scripts.Gradient_Series import popup_gradient_series
 from scripts.Present_Value import popup_present_value
@@ -20,9 +20,19 @@ from scripts.Annual_Value import popup_annual_value
 from scripts.Geometric_Series import popup_geometric_series
 from scripts.Delete_Series import delete_selected_series
 from scripts.Invert_Series import invert_selected_series
-from scripts.Split_Series import split_selected_series
+from scripts.Split_Series import split_selected_series, split_series
 from scripts.Clear_Graph import clear_graph
 from scripts.Create_Table import create_table
+from econogram.core.store import CashFlowStore
+from econogram.core.journal import EditJournal
+from scripts.Evaluate_Diagram import refresh_worth_display, prompt_reference_period
+from scripts.Rate_Of_Return import popup_rate_of_return
+from scripts.Sensitivity_Panel import open_sensitivity_panel
+from scripts.Simulation_Panel import open_simulation_panel
+from econogram.core.rates import RateSchedule
+from scripts.Rate_Schedule_Dialog import popup_rate_schedule, refresh_rate_label
+from scripts.Payback import popup_payback
+from scripts.Export_Diagram import popup_export_diagram, export_diagram
 
 
 class ColorManager:
@@ -119,20 +129,45 @@ class CashFlowDiagramApp:
                 height = self.root.winfo_screenheight()
                 self.root.geometry(f'{width}x{height}+0+0')
 
-        self.state_history = []  # Track previous states for undo functionality
-        self.cash_flows = pd.DataFrame(columns=["Period", "Cash Flow", "Color", "Series_ID"])
+        self.store = CashFlowStore()  # All cash flows, read as a table through self.cash_flows
+        self.journal = EditJournal(self.store)  # Undo/redo history of store changes
         self.interest_rate = 5.0
+        self.rate_schedule = RateSchedule(self.interest_rate / 100)  # Rate of each period; interest_rate elsewhere
+        self.reference_period = 0  # Period the whole-diagram net present worth is measured at
+        self.worth_key = None  # (store version, schedule version, reference period) of the status bar figures
 
         # Color manager for robust color assignment
         self.color_manager = ColorManager()
 
         self.selected_indices = []
         self.value_texts = []
-        self.selection_rects = []
+        self.selection_overlay = None
+        self.selection_background = None
 
         self.makeNewSeries = False
+        self.show_balance = False  # Draw the cumulative balance line over the diagram
 
+        # Persistent render surface, created on the first update_plot and reused afterwards
+        self.figure = None
+        self.ax = None
         self.canvas = None
+        self.export_renderer = None  # Off-screen figure for exports, created on the first one
+
+        # Redraw scheduler: operations mark the plot/table dirty and one idle pass renders them
+        self._plot_dirty = False
+        self._table_dirty = False
+        self._redraw_pending = None
+        self.render_count = 0
+        self._transaction_depth = 0  # Nesting level of open transaction() blocks
+
+        # Rendered bar blocks, the zoomed x-range (None shows everything) and pan drag state
+        self.bar_chunks = {}
+        self.envelope_collection = None
+        self.view_xlim = None
+        self.pan_start = None
+
+        self.bar_layout = None
+        self.bar_index = None
         self.next_series_id = 0
 
         setup_ui(self)
@@ -140,32 +175,84 @@ class CashFlowDiagramApp:
         self._save_state()
         self.update_plot()
 
+    @property
+    def cash_flows(self):
+        """Read-only DataFrame view of the store; edits go through self.store."""
+        return self.store.to_frame()
+
     def update_canvas(self):
-        if self.canvas:
-            self.canvas.draw()
+        self.request_redraw(plot=True, table=False)
+
+    def request_redraw(self, plot=True, table=True):
+        """Mark the plot and/or table as dirty and render them once when Tk is idle."""
+        self._plot_dirty = self._plot_dirty or plot
+        self._table_dirty = self._table_dirty or table
+        # An open transaction renders once when it ends
+        if self._redraw_pending is None and self._transaction_depth == 0:
+            self._redraw_pending = self.root.after_idle(self._flush_redraw)
+
+    def _flush_redraw(self):
+        """Render everything marked dirty since the last pass."""
+        self._redraw_pending = None
+        if self._plot_dirty:
+            self._plot_dirty = False
+            self.render_count += 1
+            update_plot(self)
+        if self._table_dirty:
+            self._table_dirty = False
+            refresh_table(self)
+        refresh_worth_display(self)
 
     def update_interest_rate(self, new_rate):
         try:
             rate = float(new_rate)
             if -100 <= rate <= 100:
                 self.interest_rate = rate
-                self.interest_rate_label.config(text=f"{self.interest_rate}%")
+                self.rate_schedule.set_base_rate(rate / 100)
+                refresh_rate_label(self)
+                refresh_worth_display(self)
+                if self.show_balance:
+                    self.update_canvas()
             else:
                 messagebox.showerror("Input Error", "Please enter a number between -100 and 100.")
         except ValueError:
             messagebox.showerror("Input Error", "Please enter a valid number.")
 
     def _save_state(self):
-        if not self.state_history or not self.cash_flows.equals(self.state_history[-1]):
-            if len(self.state_history) >= 5:
-                self.state_history.pop(0)
-            self.state_history.append(self.cash_flows.copy())
+        # Close the changes made since the last call into one undo step
+        if self._transaction_depth == 0:
+            self.journal.checkpoint()
+
+    @contextmanager
+    def transaction(self):
+        """Group store edits into one undo step and one redraw.
+
+        Everything edited inside the block is undone together, and the plot and
+        table are rendered once when the outermost block exits. If the block
+        raises, its edits are rolled back.
+        """
+        self._save_state()
+        self._transaction_depth += 1
+        try:
+            yield self.store
+        except BaseException:
+            if self._transaction_depth == 1:
+                self.store.apply_changes(self.store.take_changes(), reverse=True)
+            raise
+        finally:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self._save_state()
+                self.request_redraw()
 
     def combine_cash_flows(self):
-        self._save_state()
         combine_cash_flows(self)
         self._cleanup_colors()
 
+    def consolidate_all_periods(self, make_new_series=None):
+        consolidate_all_periods(self, make_new_series)
+        self._cleanup_colors()
+
     def popup_uniform_series(self):
         self._save_state()
         popup_uniform_series(self, self._get_next_series_id())
@@ -179,16 +266,31 @@ class CashFlowDiagramApp:
         popup_gradient_series(self, self._get_next_series_id())
 
     def popup_present_value(self):
-        self._save_state()
         popup_present_value(self)
 
     def popup_future_value(self):
-        self._save_state()
         popup_future_value(self)
 
     def popup_annual_value(self):
-        self._save_state()
-        popup_annual_value(self, self._get_next_series_id())
+        popup_annual_value(self)
+
+    def evaluate_diagram(self):
+        prompt_reference_period(self)
+
+    def popup_rate_of_return(self):
+        popup_rate_of_return(self)
+
+    def open_sensitivity_panel(self):
+        open_sensitivity_panel(self)
+
+    def open_simulation_panel(self):
+        open_simulation_panel(self)
+
+    def popup_rate_schedule(self):
+        popup_rate_schedule(self)
+
+    def popup_payback(self):
+        popup_payback(self)
 
     def popup_geometric_series(self):
         self._save_state()
@@ -196,7 +298,7 @@ class CashFlowDiagramApp:
 
     def update_plot(self):
         self._save_state()
-        update_plot(self)
+        self.request_redraw(plot=True, table=True)
 
     def _get_next_series_id(self):
         self.next_series_id += 1
@@ -211,32 +313,39 @@ class CashFlowDiagramApp:
         self.color_manager.return_colors_not_in_dataframe(self.cash_flows)
 
     def select_series(self, series_id):
-        self.selected_indices = self.cash_flows[self.cash_flows["Series_ID"] == series_id].index.tolist()
-        self.update_canvas()
+        self.selected_indices = self.store.series_rows(series_id).tolist()
+        update_selection_display(self.ax, self)
 
     def delete_selected_series(self):
-        self._save_state()
         delete_selected_series(self)
         self._cleanup_colors()
 
     def invert_selected_series(self):
-        self._save_state()
         invert_selected_series(self)
 
     def split_selected_series(self):
         self._save_state()
         split_selected_series(self)
 
+    def split_series(self, series_id, cut_periods=(), segment_length=None):
+        return split_series(self, series_id, cut_periods, segment_length)
+
     def undo_last_action(self):
-        if len(self.state_history) > 1:
-            self.state_history.pop()
-            self.cash_flows = self.state_history[-1].copy()
+        if self.journal.undo():
+            self.selected_indices = []
             self._cleanup_colors()
-            create_table(self, [])
             self.update_plot()  # Ensure the plot is updated
         else:
             messagebox.showinfo("Undo", "No more actions to undo.")
 
+    def redo_last_action(self):
+        if self.journal.redo():
+            self.selected_indices = []
+            self._cleanup_colors()
+            self.update_plot()
+        else:
+            messagebox.showinfo("Redo", "No more actions to redo.")
+
     def toggle_makeNewSeries(self):
         # Update the makeNewSeries based on the menu checkbutton state
         if hasattr(self, 'makeNewSeries_var'):
@@ -245,6 +354,19 @@ class CashFlowDiagramApp:
             # Fallback for backward compatibility
             self.makeNewSeries = not self.makeNewSeries
 
+    def toggle_balance_overlay(self):
+        self.show_balance = self.show_balance_var.get()
+        self.update_canvas()
+
+    def reset_zoom(self):
+        reset_view(self)
+
+    def popup_export_diagram(self):
+        popup_export_diagram(self)
+
+    def export_diagram(self, path, format=None):
+        export_diagram(self, path, format)
+
     def clear_graph(self):
         self._save_state()
         clear_graph(self)
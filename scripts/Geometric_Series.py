@@ -5,8 +5,8 @@ A geometric series increases by a constant percentage each period.
 """
 import tkinter as tk
 from tkinter import messagebox
-import pandas as pd
 from scripts.UI_Setup import get_asset_path
+from econogram.core.operations import add_geometric_series
 
 
 def popup_geometric_series(app, series_id):
@@ -92,24 +92,9 @@ def popup_geometric_series(app, series_id):
             # Use a single color for all cash flows
             color = app.get_next_color()
 
-            # Calculate the geometric series
-            cash_flows = []
-            for year in range(start_year, start_year + num_years):
-                cash_flow_value = initial_value * ((1 + growth_rate) ** (year - start_year))
-                cash_flows.append({
-                    "Period": year,
-                    "Cash Flow": cash_flow_value,
-                    "Color": color,
-                    "Series_ID": series_id,
-                    "Series_Name": series_name
-                })
-
-            # Convert to DataFrame and ensure it has no all-NA columns
-            new_cash_flows = pd.DataFrame(cash_flows).dropna(axis=1, how='all')
-
-            # Update the app's cash flows
-            app.cash_flows = app.cash_flows.dropna(axis=1, how='all')
-            app.cash_flows = pd.concat([app.cash_flows, new_cash_flows], ignore_index=True)
+            # Store the series by its parameters; rows are expanded when the plot reads them
+            add_geometric_series(app.store, series_id, series_name, color, initial_value, growth_rate,
+                                 start_year, num_years)
 
             # Clear selections and update the plot
             app.selected_indices = []
@@ -5,8 +5,8 @@ A gradient series increases by a constant amount each period, starting from zero
 """
 import tkinter as tk
 from tkinter import messagebox
-import pandas as pd
 from scripts.UI_Setup import get_asset_path
+from econogram.core.operations import add_gradient_series
 
 def popup_gradient_series(app, series_id):
     def validate_cash_flow_input(entry_text, action_type):
@@ -79,23 +79,8 @@ def popup_gradient_series(app, series_id):
             # Assign a color to the series using the color manager
             color = app.get_next_color()
 
-            # Create gradient cash flow entries
-            for i in range(length):
-                period = start_year + i
-                cash_flow = gradient_value * i  # Calculate cash flow for each period
-                new_entry = pd.DataFrame({
-                    "Period": [period],
-                    "Cash Flow": [cash_flow],
-                    "Color": [color],
-                    "Series_ID": [series_id],
-                    "Series_Name": [series_name]
-                })
-
-                new_entry_filtered = new_entry.dropna(axis=1, how='all')
-
-                # Update the application's cash flows
-                app.cash_flows = app.cash_flows.dropna(axis=1, how='all')
-                app.cash_flows = pd.concat([app.cash_flows, new_entry_filtered], ignore_index=True)
+            # Store the series by its parameters (its first flow is zero); rows are expanded when the plot reads them
+            add_gradient_series(app.store, series_id, series_name, color, gradient_value, start_year, length)
 
             # Update the application plot and close the popup
             app.update_plot()
@@ -0,0 +1,43 @@
+"""Bar hit-test index module.
+
+Resolves a click position in data coordinates to the cash flow row under it
+without scanning every bar on the diagram.
+"""
+import numpy as np
+
+
+class BarHitIndex:
+    """Bars keyed by period, with their vertical extents sorted within each period."""
+
+    def __init__(self, layout, bar_width):
+        self.half_width = bar_width / 2
+        lowers = np.minimum(layout.bottoms, layout.bottoms + layout.heights)
+        uppers = np.maximum(layout.bottoms, layout.bottoms + layout.heights)
+
+        # Bars in one period never overlap, so sorting by lower edge keeps the upper edges sorted too
+        order = np.lexsort((lowers, layout.periods))
+        self.periods = layout.periods[order]
+        self.lowers = lowers[order]
+        self.uppers = uppers[order]
+        self.row_ids = layout.row_ids[order]
+
+    def lookup(self, x, y):
+        """Return the row id of the bar containing the point (x, y), or None."""
+        if x is None or y is None or len(self.row_ids) == 0:
+            return None
+
+        # Bars are centred on integer periods
+        period = int(np.floor(x + 0.5))
+        if abs(x - period) > self.half_width:
+            return None
+
+        start = np.searchsorted(self.periods, period, side="left")
+        end = np.searchsorted(self.periods, period, side="right")
+        if start == end:
+            return None
+
+        # Find the last bar in this period whose lower edge is at or below y
+        pos = start + np.searchsorted(self.lowers[start:end], y, side="right") - 1
+        if pos < start or y > self.uppers[pos]:
+            return None
+        return self.row_ids[pos]
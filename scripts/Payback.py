@@ -0,0 +1,38 @@
+"""Payback dialog module.
+
+Reports the simple and discounted payback periods of the whole diagram. The
+calculations are in econogram.core.payback; the cumulative balance overlay is
+drawn by econogram.render.draw_balance_overlay.
+"""
+from tkinter import simpledialog, messagebox
+from econogram.core.payback import payback_periods
+from scripts.Rate_Schedule_Dialog import describe_rate
+
+
+def popup_payback(app):
+    """Report the simple and discounted payback periods of the whole diagram."""
+    if app.store.empty:
+        messagebox.showinfo("Info", "Add cash flows to the diagram first.")
+        return
+
+    target = simpledialog.askfloat("Payback", "Enter the target balance (0 for the payback period):",
+                                   initialvalue=0.0)
+    if target is None:
+        return
+
+    store = app.store
+    simple, discounted = payback_periods(store.period, store.amount, app.rate_schedule, target,
+                                         app.reference_period)
+    first_period = int(store.period.min())
+    name = "Payback" if target == 0 else f"Balance of ${target:,.2f}"
+
+    def describe(period):
+        if period is None:
+            return "never reached"
+        return f"period {period} ({period - first_period} periods after the first cash flow)"
+
+    messagebox.showinfo("Payback",
+                        f"{name}:\n\n"
+                        f"Simple: {describe(simple)}\n"
+                        f"Discounted at {describe_rate(app)} to period {app.reference_period}: "
+                        f"{describe(discounted)}")
@@ -0,0 +1,47 @@
+"""Rate of return module.
+
+Reports the internal rate of return (IRR) of the whole diagram, warns when the
+cash flows allow more than one IRR, and computes the modified internal rate of
+return (MIRR) for chosen finance and reinvestment rates.
+"""
+from tkinter import simpledialog, messagebox
+from econogram.core.irr import solve_irr, mirr
+
+
+def popup_rate_of_return(app):
+    """Show the IRR and MIRR of every cash flow on the diagram."""
+    if app.store.empty:
+        messagebox.showinfo("Info", "Add cash flows to the diagram first.")
+        return
+
+    finance_rate = simpledialog.askfloat("Rate of Return", "Enter the finance rate for MIRR (%):",
+                                         initialvalue=app.interest_rate)
+    if finance_rate is None:
+        return
+    reinvestment_rate = simpledialog.askfloat("Rate of Return", "Enter the reinvestment rate for MIRR (%):",
+                                              initialvalue=app.interest_rate)
+    if reinvestment_rate is None:
+        return
+
+    periods = app.store.period
+    amounts = app.store.amount
+    result = solve_irr(periods, amounts)
+
+    if not result.roots:
+        lines = ["IRR: none between -99% and 1000%"]
+    elif len(result.roots) == 1:
+        lines = [f"IRR: {result.roots[0] * 100:.4f}%"]
+    else:
+        lines = ["IRR: " + ", ".join(f"{root * 100:.4f}%" for root in result.roots)]
+    if result.multiple:
+        lines.append(f"Warning: the net cash flow changes sign {result.sign_changes} times, "
+                     "so the IRR may not be unique. Consider using MIRR instead.")
+
+    modified_rate = mirr(periods, amounts, finance_rate / 100, reinvestment_rate / 100)
+    if modified_rate is None:
+        lines.append("MIRR: needs both outflows and inflows in different periods")
+    else:
+        lines.append(f"MIRR (finance {finance_rate}%, reinvestment {reinvestment_rate}%): "
+                     f"{modified_rate * 100:.4f}%")
+
+    messagebox.showinfo("Rate of Return", "\n\n".join(lines))
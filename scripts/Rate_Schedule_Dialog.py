@@ -0,0 +1,110 @@
+"""Interest rate schedule dialog module.
+
+Provides the dialog for giving ranges of periods their own interest rate, on
+top of the global interest rate that applies everywhere else.
+"""
+import tkinter as tk
+from tkinter import messagebox
+from scripts.UI_Setup import get_asset_path
+from scripts.Evaluate_Diagram import refresh_worth_display
+
+
+def describe_rate(app):
+    """Return the global interest rate as text, noting when some periods use other rates."""
+    text = f"{app.interest_rate}%"
+    if not app.rate_schedule.uniform:
+        count = len(app.rate_schedule.segments())
+        text += f" (schedule: {count} range{'s' if count != 1 else ''})"
+    return text
+
+
+def refresh_rate_label(app):
+    """Show the interest rate in the status bar."""
+    app.interest_rate_label.config(text=describe_rate(app))
+
+
+def popup_rate_schedule(app):
+    """Open the dialog for setting the interest rate of ranges of periods."""
+    top = tk.Toplevel(app.root)
+    top.title("Rate Schedule")
+    try:
+        top.iconbitmap(get_asset_path("app.ico"))
+    except Exception as e:
+        print(f"Could not load icon for rate schedule window: {e}")
+
+    tk.Label(top, text=f"Periods not listed use the global rate of {app.interest_rate}%.\n"
+                       "The rate of period t applies from period t - 1 to period t.",
+             font=("Arial", 10), justify="left").grid(row=0, column=0, columnspan=4, padx=10, pady=(10, 5), sticky="w")
+
+    segment_list = tk.Listbox(top, width=40, height=8, font=("Arial", 10))
+    segment_list.grid(row=1, column=0, columnspan=4, padx=10, pady=5, sticky="nsew")
+
+    entries = {}
+    for column, label in enumerate(("From period:", "To period:", "Rate (%):")):
+        tk.Label(top, text=label, font=("Arial", 10)).grid(row=2, column=column, padx=5, sticky="w")
+        entries[label] = tk.Entry(top, width=10, font=("Arial", 10))
+        entries[label].grid(row=3, column=column, padx=5, pady=(0, 5), sticky="w")
+
+    def show_segments():
+        segment_list.delete(0, tk.END)
+        for start, end, rate in app.rate_schedule.segments():
+            periods = f"Period {start}" if start == end else f"Periods {start} to {end}"
+            segment_list.insert(tk.END, f"{periods}: {rate * 100:g}%")
+
+    def on_changed():
+        show_segments()
+        refresh_rate_label(app)
+        refresh_worth_display(app)
+        if app.show_balance:
+            app.update_canvas()
+
+    def read_periods():
+        try:
+            start = int(entries["From period:"].get())
+            end = int(entries["To period:"].get())
+        except ValueError:
+            raise ValueError("The periods must be whole numbers.")
+        if end < start:
+            raise ValueError("The last period must not come before the first.")
+        return start, end
+
+    def on_set(event=None):
+        try:
+            start, end = read_periods()
+            try:
+                rate = float(entries["Rate (%):"].get())
+            except ValueError:
+                raise ValueError("The rate must be a number.")
+            if not -100 < rate <= 100:
+                raise ValueError("The rate must be greater than -100 and at most 100.")
+            app.rate_schedule.set_segment(start, end, rate / 100)
+            on_changed()
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e), parent=top)
+
+    def on_remove():
+        selection = segment_list.curselection()
+        if selection:
+            start, end, _ = app.rate_schedule.segments()[selection[0]]
+        else:
+            try:
+                start, end = read_periods()
+            except ValueError as e:
+                messagebox.showerror("Input Error", str(e), parent=top)
+                return
+        app.rate_schedule.clear_segment(start, end)
+        on_changed()
+
+    def on_clear():
+        app.rate_schedule.clear()
+        on_changed()
+
+    buttons = tk.Frame(top)
+    buttons.grid(row=4, column=0, columnspan=4, pady=10)
+    tk.Button(buttons, text="Set", command=on_set, font=("Arial", 10, "bold")).pack(side="left", padx=5)
+    tk.Button(buttons, text="Remove", command=on_remove, font=("Arial", 10)).pack(side="left", padx=5)
+    tk.Button(buttons, text="Clear All", command=on_clear, font=("Arial", 10)).pack(side="left", padx=5)
+    tk.Button(buttons, text="Close", command=top.destroy, font=("Arial", 10)).pack(side="left", padx=5)
+
+    top.bind("<Return>", on_set)
+    show_segments()
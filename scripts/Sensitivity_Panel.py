@@ -0,0 +1,126 @@
+"""Interest rate sensitivity module.
+
+Opens a panel that plots the net present worth of the whole diagram across a
+range of interest rates, marks the break-even rates, and shows a tornado chart
+of how much each series moves the net present worth when its amounts change by
+a chosen percentage.
+"""
+import tkinter as tk
+from tkinter import messagebox
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import matplotlib.ticker as mtick
+from scripts.UI_Setup import get_asset_path
+from econogram.core.tvm import npv_profile, group_flows, grouped_equivalent_values
+from econogram.core.irr import solve_irr
+
+# Rates evaluated along the NPV profile
+SWEEP_POINTS = 5000
+
+# Series shown in the tornado chart, largest swing first
+TORNADO_SERIES = 15
+
+
+def open_sensitivity_panel(app):
+    """Open the sensitivity panel for the current diagram."""
+    if app.store.empty:
+        messagebox.showinfo("Info", "Add cash flows to the diagram first.")
+        return
+
+    top = tk.Toplevel(app.root)
+    top.title("Sensitivity")
+    try:
+        top.iconbitmap(get_asset_path("app.ico"))
+    except Exception as e:
+        print(f"Could not load icon for sensitivity window: {e}")
+
+    # Sweep range and tornado perturbation
+    controls = tk.Frame(top)
+    controls.pack(side="top", fill="x", padx=10, pady=5)
+    min_rate_var = tk.StringVar(value="0")
+    max_rate_var = tk.StringVar(value=str(max(2 * app.interest_rate, 20.0)))
+    swing_var = tk.StringVar(value="10")
+    for label, variable in (("Min rate (%):", min_rate_var), ("Max rate (%):", max_rate_var),
+                            ("Amount change ± (%):", swing_var)):
+        tk.Label(controls, text=label, font=("Arial", 10)).pack(side="left", padx=(10, 2))
+        tk.Entry(controls, textvariable=variable, width=8).pack(side="left")
+
+    figure = Figure(figsize=(12, 5))
+    figure.subplots_adjust(wspace=0.45)
+    profile_ax, tornado_ax = figure.subplots(1, 2)
+    canvas = FigureCanvasTkAgg(figure, master=top)
+    canvas.get_tk_widget().pack(side="top", fill=tk.BOTH, expand=True)
+
+    def on_update():
+        try:
+            min_rate = float(min_rate_var.get())
+            max_rate = float(max_rate_var.get())
+            swing = float(swing_var.get())
+        except ValueError:
+            messagebox.showerror("Input Error", "Please enter valid numbers.", parent=top)
+            return
+        if not -100 < min_rate < max_rate:
+            messagebox.showerror("Input Error", "The rate range must satisfy -100 < min < max.", parent=top)
+            return
+        if app.store.empty:
+            messagebox.showinfo("Info", "The diagram has no cash flows.", parent=top)
+            return
+        draw_profile(profile_ax, app, min_rate / 100, max_rate / 100)
+        draw_tornado(tornado_ax, app, swing / 100)
+        canvas.draw_idle()
+
+    tk.Button(controls, text="Update", command=on_update, font=("Arial", 10, "bold")).pack(side="left", padx=10)
+    on_update()
+
+
+def draw_profile(ax, app, min_rate, max_rate):
+    """Plot net present worth against interest rate and mark the break-even rates."""
+    rates = np.linspace(min_rate, max_rate, SWEEP_POINTS)
+    values = npv_profile(app.store.period, app.store.amount, rates, app.reference_period)
+
+    ax.clear()
+    ax.plot(rates * 100, values, color="tab:blue")
+    ax.axhline(0, color="black", linewidth=0.8)
+    ax.axvline(app.interest_rate, color="gray", linestyle="--", linewidth=0.8, label="Current rate")
+
+    # Break-even rates are the IRRs that fall inside the swept range
+    break_even = solve_irr(app.store.period, app.store.amount, min_rate=min_rate, max_rate=max_rate).roots
+    if break_even:
+        break_even = np.array(break_even) * 100
+        ax.plot(break_even, np.zeros(len(break_even)), "o", color="tab:red", label="Break-even")
+        for rate in break_even:
+            ax.annotate(f"{rate:.2f}%", (rate, 0), textcoords="offset points", xytext=(5, 8))
+
+    ax.set_title(f"NPW at period {app.reference_period} vs interest rate")
+    ax.set_xlabel("Interest rate (%)")
+    ax.set_ylabel("Net present worth")
+    ax.yaxis.set_major_formatter(mtick.StrMethodFormatter("${x:,.0f}"))
+    ax.legend(loc="best")
+
+
+def draw_tornado(ax, app, swing):
+    """Plot how far each series moves the net present worth when its amounts change by ±swing."""
+    store = app.store
+    rate = app.interest_rate / 100
+    series_ids, groups, _ = group_flows(store.series_id)
+    targets = np.full(len(series_ids), app.reference_period)
+    series_values = grouped_equivalent_values(store.period, store.amount, groups, rate, targets)
+    total = series_values.sum()
+
+    # Worth is linear in the amounts, so scaling a series by (1 ± swing) moves the total by ± swing x its worth
+    deltas = swing * np.abs(series_values)
+    order = np.argsort(deltas)[::-1][:TORNADO_SERIES][::-1]
+    names = [store.series[series_id].name for series_id in series_ids[order].tolist()]
+    colors = [store.series[series_id].color for series_id in series_ids[order].tolist()]
+
+    ax.clear()
+    positions = np.arange(len(order))
+    ax.barh(positions, 2 * deltas[order], left=total - deltas[order], color=colors)
+    ax.axvline(total, color="black", linewidth=0.8)
+    ax.set_yticks(positions)
+    ax.set_yticklabels(names)
+    ax.set_title(f"NPW swing for ±{swing * 100:g}% amounts at {app.interest_rate}%")
+    ax.set_xlabel("Net present worth")
+    ax.xaxis.set_major_locator(mtick.MaxNLocator(nbins=5))
+    ax.xaxis.set_major_formatter(mtick.StrMethodFormatter("${x:,.0f}"))
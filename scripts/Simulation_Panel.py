@@ -0,0 +1,157 @@
+"""Monte Carlo simulation panel module.
+
+Opens a panel where the series amounts, their growth and the interest rate are
+given triangular or normal uncertainty, runs the simulation in a background
+thread (the samples themselves run across worker processes) and shows the
+histogram of net present worth with its percentiles.
+"""
+import multiprocessing
+import threading
+import time
+import tkinter as tk
+from tkinter import messagebox
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import matplotlib.ticker as mtick
+from scripts.UI_Setup import get_asset_path
+from econogram.core.monte_carlo import Distribution, SimulationModel, run_simulation
+
+HISTOGRAM_BINS = 60
+
+# How often the panel checks whether a running simulation has finished (ms)
+POLL_INTERVAL = 100
+
+# The pool is started from a background thread of the Tk process, which must not be forked
+WORKER_CONTEXT = multiprocessing.get_context("spawn")
+
+
+def open_simulation_panel(app):
+    """Open the Monte Carlo panel for the current diagram."""
+    if app.store.empty:
+        messagebox.showinfo("Info", "Add cash flows to the diagram first.")
+        return
+
+    top = tk.Toplevel(app.root)
+    top.title("Monte Carlo Simulation")
+    try:
+        top.iconbitmap(get_asset_path("app.ico"))
+    except Exception as e:
+        print(f"Could not load icon for simulation window: {e}")
+
+    controls = tk.Frame(top)
+    controls.pack(side="top", fill="x", padx=10, pady=5)
+    variables = {
+        "trials": tk.StringVar(value="100000"),
+        "seed": tk.StringVar(value="12345"),
+        "min_rate": tk.StringVar(value=str(max(app.interest_rate - 2, 0.0))),
+        "max_rate": tk.StringVar(value=str(app.interest_rate + 2)),
+        "amount_swing": tk.StringVar(value="10"),
+        "growth_sd": tk.StringVar(value="0"),
+    }
+    labels = (("Trials:", "trials"), ("Seed:", "seed"), ("Min rate (%):", "min_rate"),
+              ("Max rate (%):", "max_rate"), ("Amount ± (%):", "amount_swing"), ("Growth σ (%):", "growth_sd"))
+    for label, key in labels:
+        tk.Label(controls, text=label, font=("Arial", 10)).pack(side="left", padx=(10, 2))
+        tk.Entry(controls, textvariable=variables[key], width=8).pack(side="left")
+    irr_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(controls, text="IRR", variable=irr_var).pack(side="left", padx=10)
+
+    summary_label = tk.Label(top, text="", font=("Arial", 10), justify="left", anchor="w")
+    summary_label.pack(side="bottom", fill="x", padx=10, pady=5)
+
+    figure = Figure(figsize=(9, 5))
+    ax = figure.add_subplot(111)
+    canvas = FigureCanvasTkAgg(figure, master=top)
+    canvas.get_tk_widget().pack(side="top", fill=tk.BOTH, expand=True)
+
+    def on_run():
+        try:
+            trials = int(variables["trials"].get())
+            seed = int(variables["seed"].get())
+            min_rate, max_rate, swing, growth_sd = (float(variables[key].get()) / 100 for key in
+                                                    ("min_rate", "max_rate", "amount_swing", "growth_sd"))
+        except ValueError:
+            messagebox.showerror("Input Error", "Please enter valid numbers.", parent=top)
+            return
+        if trials <= 0 or not -1 < min_rate <= max_rate or swing < 0 or growth_sd < 0:
+            messagebox.showerror("Input Error", "Trials must be positive, -100 < min rate <= max rate, "
+                                                "and the amount and growth spreads must not be negative.", parent=top)
+            return
+        if app.store.empty:
+            messagebox.showinfo("Info", "The diagram has no cash flows.", parent=top)
+            return
+
+        rate = app.interest_rate / 100
+        compute_irr = irr_var.get()  # Tk variables are only read on the main thread
+        model = SimulationModel.from_store(
+            app.store,
+            Distribution("triangular", 1 - swing, 1, 1 + swing),
+            Distribution("normal", 0, growth_sd) if growth_sd else Distribution("fixed", 0),
+            Distribution("triangular", min_rate, min(max(rate, min_rate), max_rate), max_rate),
+            app.reference_period)
+        run_button.config(state="disabled")
+        summary_label.config(text=f"Running {trials:,} trials...")
+
+        # The model is a snapshot, so the diagram can keep changing while the trials run
+        outcome = {}
+
+        def work():
+            start = time.perf_counter()
+            try:
+                outcome["result"] = run_simulation(model, trials, seed, compute_irr=compute_irr,
+                                                   mp_context=WORKER_CONTEXT)
+            except Exception as e:
+                outcome["error"] = e
+            outcome["elapsed"] = time.perf_counter() - start
+
+        def poll():
+            if worker.is_alive():
+                top.after(POLL_INTERVAL, poll)
+                return
+            if not top.winfo_exists():
+                return
+            run_button.config(state="normal")
+            if "error" in outcome:
+                summary_label.config(text="")
+                messagebox.showerror("Simulation Error", str(outcome["error"]), parent=top)
+                return
+            show_result(ax, summary_label, outcome["result"], outcome["elapsed"], app.reference_period)
+            canvas.draw_idle()
+
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+        top.after(POLL_INTERVAL, poll)
+
+    run_button = tk.Button(controls, text="Run", command=on_run, font=("Arial", 10, "bold"))
+    run_button.pack(side="left", padx=10)
+
+
+def show_result(ax, summary_label, result, elapsed, reference_period):
+    """Draw the NPW histogram with its percentiles and summarise the run."""
+    p5, p50, p95 = result.percentiles((5, 50, 95))
+    counts, edges = result.histogram(HISTOGRAM_BINS)
+
+    ax.clear()
+    ax.stairs(counts / result.trials, edges, fill=True, color="tab:blue", alpha=0.7)
+    ax.axvline(0, color="black", linewidth=0.8)
+    for value, label in ((p5, "P5"), (p50, "P50"), (p95, "P95")):
+        ax.axvline(value, color="tab:red", linestyle="--", linewidth=0.8)
+        ax.annotate(label, (value, 1), xycoords=("data", "axes fraction"), textcoords="offset points",
+                    xytext=(3, -12))
+    ax.set_title(f"Distribution of NPW at period {reference_period}")
+    ax.set_xlabel("Net present worth")
+    ax.set_ylabel("Share of trials")
+    ax.xaxis.set_major_locator(mtick.MaxNLocator(nbins=6))
+    ax.xaxis.set_major_formatter(mtick.StrMethodFormatter("${x:,.0f}"))
+
+    summary = (f"{result.trials:,} trials in {elapsed:.2f} s   Mean: ${result.npv.mean():,.2f}   "
+               f"P5: ${p5:,.2f}   P50: ${p50:,.2f}   P95: ${p95:,.2f}   "
+               f"P(NPW < 0): {result.probability_negative:.2%}")
+    if result.irr is not None:
+        solved = result.irr[~np.isnan(result.irr)]
+        if len(solved):
+            summary += f"   Median IRR: {np.median(solved):.2%} ({len(solved) / result.trials:.0%} of trials have one)"
+        else:
+            summary += "   No trial has an IRR"
+    summary_label.config(text=summary)
@@ -2,10 +2,10 @@
 
 Provides the dialog for adding individual single cash flows to the diagram.
 """
-import pandas as pd
 import tkinter as tk
 from tkinter import messagebox
 from scripts.UI_Setup import get_asset_path
+from econogram.core.operations import add_single_flow
 
 
 def popup_add_single_cash_flow(app, series_id):
@@ -73,23 +73,8 @@ def popup_add_single_cash_flow(app, series_id):
             # Fetch the next color from the color manager
             color = app.get_next_color()
 
-            # Create a new DataFrame entry with the validated inputs
-            new_entry = pd.DataFrame({
-                "Period": [period],
-                "Cash Flow": [cash_flow],
-                "Color": [color],  # Use the next color in the cycle
-                "Series_ID": [series_id],
-                "Series_Name": [series_name]
-            })
-
-            # Filter out all-NA columns in the new entry
-            new_entry_filtered = new_entry.dropna(axis=1, how='all')
-
-            # Ensure app.cash_flows does not have all-NA columns
-            app.cash_flows = app.cash_flows.dropna(axis=1, how='all')
-
-            # Concatenate the filtered DataFrames
-            app.cash_flows = pd.concat([app.cash_flows, new_entry_filtered], ignore_index=True)
+            # Add the cash flow as a one-row series
+            add_single_flow(app.store, series_id, series_name, color, period, cash_flow)
             app.update_plot()
             top.destroy()
         except ValueError as e:
@@ -1,101 +1,87 @@
 """Split series module.
 
-Splits a multi-cash-flow series into two separate series at a chosen point
-using an interactive slider dialog.
+Splits a multi-cash-flow series into separate series, either at one point
+chosen with a slider, after a list of cut periods, or into segments of a fixed
+number of periods.
 """
 import tkinter as tk
 from tkinter import messagebox
-import pandas as pd
-from scripts.Create_Table import create_table
+import numpy as np
 from scripts.UI_Setup import get_asset_path
+from econogram.core.operations import split_series as split_store_series
 
 
 def split_selected_series(app):
-    """Split the selected series into two separate series at a chosen point using a slider."""
+    """Split the selected series into separate series at the points chosen in the split dialog."""
     if not app.selected_indices:
         messagebox.showinfo("Selection Error", "No series selected for splitting.")
         return
 
     # Ensure all selected indices are within bounds and exist
-    if not all(index in app.cash_flows.index for index in app.selected_indices):
+    if not app.store.contains(app.selected_indices).all():
         messagebox.showinfo("Selection Error", "Selected series no longer exist.")
         return
 
     # Get the series ID from the selected indices
-    selected_series_ids = app.cash_flows.loc[app.selected_indices, "Series_ID"].unique()
+    selected_series_ids = app.store.series_of(app.selected_indices)
 
     if len(selected_series_ids) > 1:
         messagebox.showinfo("Selection Error", "Please select only one series to split.")
         return
 
     series_id = selected_series_ids[0]
-    series_data = app.cash_flows[app.cash_flows["Series_ID"] == series_id].sort_values("Period")
 
     # Check if series has more than 1 entry
-    if len(series_data) <= 1:
+    if app.store.series_size(series_id) <= 1:
         messagebox.showinfo("Split Error", "Cannot split a series with length of 1 or less.")
         return
 
-    # Get the periods in the series
-    periods = series_data["Period"].tolist()
+    # Get the periods of the series in order
+    periods = np.sort(app.store.period[app.store.positions(app.store.series_rows(series_id))])
 
-    # Open dialog to select split point
-    show_split_dialog(app, series_id, series_data, periods)
+    # Open dialog to select split points
+    show_split_dialog(app, series_id, periods)
 
 
-def show_split_dialog(app, series_id, series_data, periods):
-    """Display dialog for selecting the split point."""
+def split_series(app, series_id, cut_periods=(), segment_length=None):
+    """Split a series after each of cut_periods, or into segments of segment_length periods, as one undo step.
 
-    def on_split_button_click():
-        """Handle the split operation."""
-        try:
-            # Get the split point index from the slider
-            split_idx = slider_var.get()
-
-            # The split point is between periods[split_idx] and periods[split_idx + 1]
-            # So the first series includes periods[0] to periods[split_idx] (inclusive)
-            # And the second series includes periods[split_idx + 1] to periods[-1] (inclusive)
-
-            split_period = periods[split_idx]
-
-            # Get original series name
-            original_name = series_data.iloc[0]["Series_Name"]
-
-            # Create names for the two new series
-            series1_name = f"{original_name}_1"
-            series2_name = f"{original_name}_2"
-
-            # Get new series IDs
-            series1_id = app._get_next_series_id()
-            series2_id = app._get_next_series_id()
+    See econogram.core.split_series. Returns the new series ids.
+    """
+    with app.transaction() as store:
+        series_ids = split_store_series(store, series_id, cut_periods, segment_length,
+                                        app._get_next_series_id, app.get_next_color)
+        app.selected_indices = []
+    return series_ids
 
-            # Get the color for the series and assign different colors
-            original_color = series_data.iloc[0]["Color"]
-            color1 = original_color
-            color2 = app.get_next_color()
 
-            # Split the data
-            series1_mask = (app.cash_flows["Series_ID"] == series_id) & (app.cash_flows["Period"] <= split_period)
-            series2_mask = (app.cash_flows["Series_ID"] == series_id) & (app.cash_flows["Period"] > split_period)
-
-            # Update the first part
-            series1_indices = app.cash_flows[series1_mask].index
-            app.cash_flows.loc[series1_mask, "Series_ID"] = series1_id
-            app.cash_flows.loc[series1_mask, "Series_Name"] = series1_name
-            app.cash_flows.loc[series1_mask, "Color"] = pd.Series([color1] * len(series1_indices), index=series1_indices)
-
-            # Update the second part
-            series2_indices = app.cash_flows[series2_mask].index
-            app.cash_flows.loc[series2_mask, "Series_ID"] = series2_id
-            app.cash_flows.loc[series2_mask, "Series_Name"] = series2_name
-            app.cash_flows.loc[series2_mask, "Color"] = pd.Series([color2] * len(series2_indices), index=series2_indices)
-
-            # Clear selection and update display
-            app.selected_indices = []
-            create_table(app, [])
-            app.update_plot()
-            app.update_canvas()
+def show_split_dialog(app, series_id, periods):
+    """Display dialog for selecting the split points."""
+    periods = periods.tolist()
 
+    def on_split_button_click():
+        """Handle the split operation."""
+        try:
+            length_text = length_entry.get().strip()
+            cuts_text = cuts_entry.get().strip()
+            cut_periods, segment_length = (), None
+            if length_text:
+                # Fixed-length segments from the first period
+                try:
+                    segment_length = int(length_text)
+                except ValueError:
+                    raise ValueError("Segment length must be a whole number.")
+            elif cuts_text:
+                # Cut after each listed period
+                try:
+                    cut_periods = [int(cut) for cut in cuts_text.replace(",", " ").split()]
+                except ValueError:
+                    raise ValueError("Cut periods must be whole numbers separated by commas.")
+            else:
+                # The slider's split point is between periods[split_idx] and periods[split_idx + 1]
+                cut_periods = [periods[slider_var.get()]]
+
+            split_series(app, series_id, cut_periods, segment_length)
             top.destroy()
 
         except Exception as e:
@@ -156,6 +142,18 @@ def show_split_dialog(app, series_id, series_data, periods):
     split_label = tk.Label(top, text=f"Split between period {periods[0]} and {periods[1]}", font=("Arial", 10))
     split_label.pack(padx=20, pady=(5, 15))
 
+    # Several cuts at once: a list of periods or a fixed segment length (used instead of the slider)
+    multi_frame = tk.Frame(top)
+    multi_frame.pack(padx=20, pady=(0, 10))
+    tk.Label(multi_frame, text="Or cut after periods (e.g. 5, 10, 15):", font=("Arial", 10)).grid(
+        row=0, column=0, sticky="w", pady=2)
+    cuts_entry = tk.Entry(multi_frame, width=20, font=("Arial", 10))
+    cuts_entry.grid(row=0, column=1, padx=5, pady=2)
+    tk.Label(multi_frame, text="Or split into segments of length:", font=("Arial", 10)).grid(
+        row=1, column=0, sticky="w", pady=2)
+    length_entry = tk.Entry(multi_frame, width=20, font=("Arial", 10))
+    length_entry.grid(row=1, column=1, padx=5, pady=2)
+
     # Add split button
     split_button = tk.Button(top, text="Split", command=on_split_button_click, font=("Arial", 10, "bold"))
     split_button.pack(pady=(0, 15))
@@ -95,6 +95,7 @@ def create_menu_bar(app):
     file_menu = tk.Menu(menubar, tearoff=0)
     menubar.add_cascade(label="File", menu=file_menu)
     file_menu.add_command(label="Clear Graph", command=app.clear_graph)
+    file_menu.add_command(label="Export Diagram...", command=app.popup_export_diagram)
     file_menu.add_separator()
     file_menu.add_command(label="Exit", command=app.root.quit)
 
@@ -102,11 +103,13 @@ def create_menu_bar(app):
     edit_menu = tk.Menu(menubar, tearoff=0)
     menubar.add_cascade(label="Edit", menu=edit_menu)
     edit_menu.add_command(label="Undo", command=app.undo_last_action, accelerator="Ctrl+Z")
+    edit_menu.add_command(label="Redo", command=app.redo_last_action, accelerator="Ctrl+Y")
     edit_menu.add_command(label="Delete Selection", command=app.delete_selected_series, accelerator="Delete")
     edit_menu.add_command(label="Invert Series", command=app.invert_selected_series)
     edit_menu.add_command(label="Split Series", command=app.split_selected_series)
     edit_menu.add_separator()
     edit_menu.add_command(label="Combine Cash Flows", command=app.combine_cash_flows)
+    edit_menu.add_command(label="Consolidate All Periods", command=app.consolidate_all_periods)
 
     # Insert Menu
     insert_menu = tk.Menu(menubar, tearoff=0)
@@ -122,16 +125,27 @@ def create_menu_bar(app):
     calculate_menu.add_command(label="Present Value", command=app.popup_present_value)
     calculate_menu.add_command(label="Future Value", command=app.popup_future_value)
     calculate_menu.add_command(label="Annual Value", command=app.popup_annual_value)
+    calculate_menu.add_separator()
+    calculate_menu.add_command(label="Evaluate Diagram...", command=app.evaluate_diagram)
+    calculate_menu.add_command(label="Rate of Return...", command=app.popup_rate_of_return)
+    calculate_menu.add_command(label="Sensitivity...", command=app.open_sensitivity_panel)
+    calculate_menu.add_command(label="Monte Carlo...", command=app.open_simulation_panel)
+    calculate_menu.add_command(label="Payback...", command=app.popup_payback)
 
     # Options Menu
     options_menu = tk.Menu(menubar, tearoff=0)
     menubar.add_cascade(label="Options", menu=options_menu)
     options_menu.add_command(label="Set Interest Rate...", command=lambda: prompt_interest_rate_change(app))
+    options_menu.add_command(label="Rate Schedule...", command=app.popup_rate_schedule)
+    options_menu.add_command(label="Reset Zoom", command=app.reset_zoom)
     options_menu.add_separator()
     # Add checkbutton for Make New Series toggle
     app.makeNewSeries_var = tk.BooleanVar(value=False)
     options_menu.add_checkbutton(label="Make New Series", variable=app.makeNewSeries_var,
                                  command=app.toggle_makeNewSeries)
+    app.show_balance_var = tk.BooleanVar(value=False)
+    options_menu.add_checkbutton(label="Show Cumulative Balance", variable=app.show_balance_var,
+                                 command=app.toggle_balance_overlay)
 
     # Help Menu
     help_menu = tk.Menu(menubar, tearoff=0)
@@ -152,11 +166,11 @@ def create_menu_bar(app):
 
     help_menu.add_command(label="Combining Cash Flows", command=lambda: show_help_message(
         "Combining Cash Flows",
-        "This function sums single cash flows that occur in the same period."))
+        "This function sums single cash flows that occur in the same period. Edit > Consolidate All Periods does this for every period of the diagram at once."))
 
     help_menu.add_command(label="Interest Rate", command=lambda: show_help_message(
         "Interest Rate",
-        "The interest rate is the global time value of money across the entire program and applies to all functions."))
+        "The interest rate is the global time value of money across the entire program and applies to all functions, except in periods given their own rate under Options > Rate Schedule."))
 
     help_menu.add_separator()
 
@@ -180,18 +194,19 @@ def create_menu_bar(app):
 
     help_menu.add_command(label="FAQs", command=lambda: show_help_message(
         "FAQs",
-        "1. If your problem includes a negative period, consider reframing the problem with your most negative value being set as Period 0.\n\n2. If the problem requires multiple interest rates, you are able to manipulate the cash flow to its final point and change the interest rate for the other parts of the problem.\n\n3. Just note that any changes across periods will involve the current interest rate displayed at the top of the screen."))
+        "1. If your problem includes a negative period, consider reframing the problem with your most negative value being set as Period 0.\n\n2. If the problem requires multiple interest rates, use Options > Rate Schedule to give ranges of periods their own rate. Present, future and annual values and the status bar then use the rate of each period.\n\n3. Just note that any changes across periods will involve the current interest rate displayed at the top of the screen, or the scheduled rate for periods that have one."))
 
     help_menu.add_separator()
     help_menu.add_command(label="About", command=_open_help_docs)
 
     # Bind keyboard shortcuts
     app.root.bind('<Control-z>', lambda e: app.undo_last_action())
+    app.root.bind('<Control-y>', lambda e: app.redo_last_action())
     app.root.bind('<Delete>', lambda e: app.delete_selected_series())
 
 
 def create_status_bar(app):
-    """Create a status bar at the top to display the interest rate."""
+    """Create a status bar at the top to display the interest rate and the diagram's net worth."""
     status_bar = tk.Frame(app.root, relief=tk.SUNKEN, bd=1)
     status_bar.pack(side="top", fill="x")
 
@@ -200,6 +215,10 @@ def create_status_bar(app):
     app.interest_rate_label = tk.Label(status_bar, text=f"{app.interest_rate}%", font=("Arial", 10, "bold"))
     app.interest_rate_label.pack(side="left", padx=5)
 
+    # Net present/future/annual worth of the whole diagram
+    app.worth_label = tk.Label(status_bar, text="", font=("Arial", 10))
+    app.worth_label.pack(side="left", padx=20)
+
 
 def _open_help_docs():
     webbrowser.open("https://github.com/tmaier-kettering/Econogram")
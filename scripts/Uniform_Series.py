@@ -4,8 +4,8 @@ Provides the dialog for adding uniform (constant) cash flow series to the diagra
 """
 import tkinter as tk
 from tkinter import messagebox
-import pandas as pd
 from scripts.UI_Setup import get_asset_path
+from econogram.core.operations import add_uniform_series
 
 
 def popup_uniform_series(app, series_id):
@@ -81,20 +81,8 @@ def popup_uniform_series(app, series_id):
             # Assign a color to the series using the color manager
             color = app.get_next_color()
 
-            # Create uniform cash flow entries
-            for period in range(start_year, start_year + length):
-                new_entry = pd.DataFrame({
-                    "Period": [period],
-                    "Cash Flow": [amount],
-                    "Color": [color],
-                    "Series_ID": [series_id],
-                    "Series_Name": [series_name]
-                })
-                new_entry_filtered = new_entry.dropna(axis=1, how='all')
-
-                # Update the application's cash flows
-                app.cash_flows = app.cash_flows.dropna(axis=1, how='all')
-                app.cash_flows = pd.concat([app.cash_flows, new_entry_filtered], ignore_index=True)
+            # Store the series by its parameters; rows are expanded when the plot reads them
+            add_uniform_series(app.store, series_id, series_name, color, amount, start_year, length)
 
             # Update the application plot and close the popup
             app.update_plot()
@@ -5,104 +5,214 @@ using matplotlib.
 """
 import tkinter as tk
 from tkinter import messagebox, simpledialog
-from matplotlib import pyplot as plt
-from matplotlib.patches import Rectangle, Patch
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba_array
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from scripts.Create_Table import create_table
 from scripts.Clear_Graph import clear_graph
-import matplotlib.ticker as mtick
+from scripts.Hit_Test import BarHitIndex
+from econogram.render import (BAR_WIDTH, compute_bar_layout, bar_vertices, fit_y_limits, envelope_buckets,
+                              create_envelopes, style_axes, diagram_x_limits, legend_handles)
 
+# Bars are materialized in blocks of this many periods as they scroll into view
+CHUNK_PERIODS = 256
+
+# Zoom factor per mouse-wheel step, and the narrowest view allowed (in periods)
+ZOOM_STEP = 1.25
+MIN_VIEW_PERIODS = 5
 
-def update_plot(app):
-    # Initialize or clear previous canvas
-    if hasattr(app, 'canvas') and app.canvas:
-        app.canvas.get_tk_widget().pack_forget()
 
-    # Create new figure and axes
-    fig, ax = plt.subplots(figsize=(10, 8))
-    fig.subplots_adjust(right=0.7)
-    app.selection_rects = []
+def update_plot(app):
+    # Create the figure and canvas once; later updates redraw into the same axes
+    if app.figure is None:
+        create_canvas(app)
+    ax = app.ax
+
+    # Clear the previous diagram in place
+    ax.clear()
+    app.bar_chunks = {}
+    app.envelope_collection = None
+    app.bar_layout = None
+    app.bar_index = None
 
     # Ensure there are cash flows to plot
-    if not app.cash_flows.empty:
-        create_bars(ax, app)
-        set_y_limits_with_buffer(ax)
+    if not app.store.empty:
+        # Stack every flow once; artists are only created for the visible part of it
+        app.bar_layout = compute_bar_layout(app.store)
+        app.bar_index = BarHitIndex(app.bar_layout, BAR_WIDTH)
+        balance_rate = app.rate_schedule if app.show_balance else None
+        fit_y_limits(ax, app.store, app.bar_layout, balance_rate, app.reference_period)
         configure_axes(ax, app)
         add_legend(ax, app)
-    
-    # Configure event handling regardless of whether there are cash flows
+        render_view(app)
+
+    # The highlight layer is drawn separately on top of the cached diagram
+    create_selection_overlay(ax, app)
+    set_selection_overlay(app)
+
+    app.canvas.draw()
+
+
+def create_canvas(app):
+    """Create the persistent figure, axes and Tk canvas owned by the app."""
+    # Use a plain Figure rather than pyplot so no global figure manager keeps references
+    app.figure = Figure(figsize=(10, 8))
+    app.figure.subplots_adjust(right=0.7)
+    app.ax = app.figure.add_subplot()
+
+    app.canvas = FigureCanvasTkAgg(app.figure, master=app.graph_frame)
+    app.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+    # Configure event handling once, regardless of whether there are cash flows
     # This ensures the right-click context menu works even on an empty graph
-    configure_event_handling(fig, ax, app)
-
-    # Display the canvas within the GUI
-    display_canvas(app, fig)
-
-
-def create_bars(ax, app):
-    # Loop through each period and create bars for cash flows
-    for period in app.cash_flows["Period"].unique():
-        period_cash_flows = app.cash_flows[app.cash_flows["Period"] == period].sort_values(
-            by="Cash Flow", ascending=False
-        )
-        bottom_positive, bottom_negative = 0, 0
-        for i, row in period_cash_flows.iterrows():
-            cash_flow = row["Cash Flow"]
-            bottom = bottom_positive if cash_flow >= 0 else bottom_negative
-            bar = ax.bar(period, cash_flow, bottom=bottom, color=row["Color"], align='center')[0]
-            if cash_flow >= 0:
-                bottom_positive += cash_flow
-            else:
-                bottom_negative += cash_flow
-            bar.set_gid(i)
+    configure_event_handling(app.figure, app)
+
+    # Cache the rendered diagram after every full draw so selection changes can be blitted
+    app.canvas.mpl_connect("draw_event", lambda event: on_full_draw(app))
+
 
+def render_view(app):
+    """Create artists only for the flows whose periods fall inside the visible x-range."""
+    ax = app.ax
+    layout = app.bar_layout
+    if layout is None:
+        return
+
+    xmin, xmax = ax.get_xlim()
+    bucket_count = envelope_buckets(ax)
+    if bucket_count is not None:
+        for key in list(app.bar_chunks):
+            remove_bar_chunk(app, key)
+        if app.envelope_collection is not None:
+            app.envelope_collection.remove()
+        app.envelope_collection = create_envelopes(ax, layout, xmin, xmax, bucket_count)
+        return
+
+    if app.envelope_collection is not None:
+        app.envelope_collection.remove()
+        app.envelope_collection = None
+
+    # Keep half a view of margin on either side so small pans don't need new artists
+    margin = (xmax - xmin) / 2
+    first_chunk = int(np.floor((xmin - margin) / CHUNK_PERIODS))
+    last_chunk = int(np.floor((xmax + margin) / CHUNK_PERIODS))
+
+    for key in list(app.bar_chunks):
+        if not first_chunk <= key <= last_chunk:
+            remove_bar_chunk(app, key)
+    for key in range(first_chunk, last_chunk + 1):
+        if key not in app.bar_chunks:
+            app.bar_chunks[key] = create_bar_chunk(ax, layout, key)
+
+
+def create_bar_chunk(ax, layout, key):
+    """Draw the bars of one block of CHUNK_PERIODS periods as a single collection."""
+    # The layout is sorted by period, so the block is a contiguous slice
+    start = np.searchsorted(layout.periods, key * CHUNK_PERIODS, side="left")
+    end = np.searchsorted(layout.periods, (key + 1) * CHUNK_PERIODS, side="left")
+    if start == end:
+        return None
 
-def set_y_limits_with_buffer(ax):
-    buffer_percentage = 0.25
-    ymin, ymax = ax.get_ylim()
-    y_range = ymax - ymin
-    ax.set_ylim(bottom=ymin - buffer_percentage * y_range, top=ymax + buffer_percentage * y_range)
-    ax.axhline(0, color='black', linewidth=0.5)
+    rows = slice(start, end)
+    collection = PolyCollection(bar_vertices(layout, rows), facecolors=to_rgba_array(list(layout.colors[rows])),
+                                linewidths=0)
+    ax.add_collection(collection, autolim=False)
+    return collection
+
+
+def remove_bar_chunk(app, key):
+    collection = app.bar_chunks.pop(key)
+    if collection is not None:
+        collection.remove()
 
 
 def configure_axes(ax, app):
-    ax.set_xlabel("Period")
-    ax.set_ylabel("Dollars")
-    ax.set_title("Cash Flow Diagram")
+    style_axes(ax)
 
-    # Format y-axis ticks with dollar sign and comma separators, two decimal places
-    # Use StrMethodFormatter instead of FuncFormatter so we don't need ticklabel_format
-    ax.yaxis.set_major_formatter(mtick.StrMethodFormatter("${x:,.2f}"))
+    # Keep the user's zoomed view across edits; otherwise show the whole diagram
+    ax.set_xlim(app.view_xlim if app.view_xlim is not None else full_x_limits(app))
 
-    max_period = app.cash_flows["Period"].max()
-    min_period = app.cash_flows["Period"].min()
-    tick_interval = 1 if max_period <= 20 else (2 if max_period <= 50 else 5)
-    next_tick_mark = ((max_period // tick_interval) + 1) * tick_interval
-    ax.set_xticks(range(min(0, min_period), next_tick_mark + 1, tick_interval))
-    ax.set_xlim(left=min(-0.5, min_period - 0.5), right=next_tick_mark + 0.5)
+
+def full_x_limits(app):
+    """Return the x-range that shows every period of the diagram."""
+    return diagram_x_limits(app.store.period)
 
 
 def add_legend(ax, app):
-    series_info = app.cash_flows[['Series_Name', 'Color']].drop_duplicates().sort_values('Series_Name')
-    if not series_info.empty:
-        legend_handles = [
-            Patch(facecolor=row['Color'], edgecolor='black', label=row["Series_Name"], picker=True)
-            for _, row in series_info.iterrows()
-        ]
-        ax.legend(handles=legend_handles, loc='upper left', bbox_to_anchor=(1.05, 1), borderaxespad=0)
+    if not app.store.empty:
+        handles = legend_handles(app.store, app.show_balance, picker=True)
+        ax.legend(handles=handles, loc='upper left', bbox_to_anchor=(1.05, 1), borderaxespad=0)
 
 
-def configure_event_handling(fig, ax, app):
+def configure_event_handling(fig, app):
     def on_click(event):
-        handle_click(event, ax, app)
+        # Middle-drag or Shift+left-drag pans; any other press selects or opens a menu
+        if event.inaxes and (event.button == 2 or (event.button == 1 and event.key == "shift")):
+            start_pan(event, app)
+            return
+        handle_click(event, app.ax, app)
 
     fig.canvas.mpl_connect("button_press_event", on_click)
+    fig.canvas.mpl_connect("motion_notify_event", lambda event: drag_pan(event, app))
+    fig.canvas.mpl_connect("button_release_event", lambda event: end_pan(app))
+    fig.canvas.mpl_connect("scroll_event", lambda event: zoom_view(event, app))
+
+
+def set_view(app, left, right):
+    """Show the x-range [left, right], clamped to the diagram, and render what became visible."""
+    full_left, full_right = full_x_limits(app)
+    span = min(max(right - left, MIN_VIEW_PERIODS), full_right - full_left)
+    left = min(max(left, full_left), full_right - span)
+    right = left + span
+
+    # A view that covers the whole diagram follows the data again on later edits
+    app.view_xlim = None if span >= full_right - full_left else (left, right)
+    app.ax.set_xlim(left, right)
+    render_view(app)
+    set_selection_overlay(app)
+    app.canvas.draw_idle()
+
+
+def zoom_view(event, app):
+    """Zoom the period axis around the mouse position."""
+    if not event.inaxes or app.bar_layout is None:
+        return
+    xmin, xmax = app.ax.get_xlim()
+    scale = ZOOM_STEP ** -event.step
+    set_view(app, event.xdata - (event.xdata - xmin) * scale, event.xdata + (xmax - event.xdata) * scale)
+
+
+def start_pan(event, app):
+    if app.bar_layout is not None:
+        app.pan_start = (event.x, app.ax.get_xlim())
+
+
+def drag_pan(event, app):
+    if app.pan_start is None or event.x is None:
+        return
+    start_x, (xmin, xmax) = app.pan_start
+    periods_per_pixel = (xmax - xmin) / app.ax.get_window_extent().width
+    shift = (event.x - start_x) * periods_per_pixel
+    set_view(app, xmin - shift, xmax - shift)
+
+
+def end_pan(app):
+    app.pan_start = None
+
+
+def reset_view(app):
+    """Zoom back out to the whole diagram."""
+    app.view_xlim = None
+    app.update_canvas()
 
 
 def handle_click(event, ax, app):
     if event.inaxes:
         try:
-            clicked_bar = next((bar for bar in ax.patches if bar.contains(event)[0]), None)
-            if clicked_bar:
+            clicked_bar = find_clicked_bar(event, app)
+            if clicked_bar is not None:
                 if event.button == 3:  # Right-click on a bar
                     handle_bar_selection(clicked_bar, ax, app, right_click=True)
                     update_selection_display(ax, app)
@@ -121,6 +231,14 @@ def handle_click(event, ax, app):
     update_selection_display(ax, app)
 
 
+def find_clicked_bar(event, app):
+    """Return the cash flow row id of the bar under the mouse, or None."""
+    # Envelopes stand for many flows at once, so there is no single bar to pick
+    if app.bar_index is None or app.envelope_collection is not None:
+        return None
+    return app.bar_index.lookup(event.xdata, event.ydata)
+
+
 def rename_series(app):
     """Rename the selected series."""
     if not app.selected_indices:
@@ -137,8 +255,8 @@ def rename_series(app):
                                       initialvalue=current_name)
     
     if new_name and new_name.strip():
-        # Update all rows with this series ID
-        app.cash_flows.loc[app.cash_flows["Series_ID"] == series_id, "Series_Name"] = new_name.strip()
+        # The name is stored once per series, so this renames every row in it
+        app.store.rename_series(series_id, new_name.strip())
         app.update_plot()
 
 
@@ -150,12 +268,9 @@ def show_context_menu(event, app):
     # Check if selected series has length > 1
     show_split_option = False
     if app.selected_indices:
-        selected_series_ids = app.cash_flows.loc[app.selected_indices, "Series_ID"].unique()
-        if len(selected_series_ids) == 1:
-            series_id = selected_series_ids[0]
-            series_data = app.cash_flows[app.cash_flows["Series_ID"] == series_id]
-            if len(series_data) > 1:
-                show_split_option = True
+        selected_series_ids = app.store.series_of(app.selected_indices)
+        if len(selected_series_ids) == 1 and app.store.series_size(selected_series_ids[0]) > 1:
+            show_split_option = True
     
     # Add menu items for each operation
     context_menu.add_command(label="Present Value", command=app.popup_present_value)
@@ -172,6 +287,7 @@ def show_context_menu(event, app):
     context_menu.add_command(label="Delete Selection", command=app.delete_selected_series)
     context_menu.add_command(label="Clear", command=lambda: clear_graph(app))
     context_menu.add_command(label="Undo", command=app.undo_last_action)
+    context_menu.add_command(label="Redo", command=app.redo_last_action)
     
     # Display the menu at the cursor position
     x = app.root.winfo_pointerx()
@@ -198,13 +314,10 @@ def show_insert_menu(event, app):
     insert_menu.grab_release()
 
 
-def handle_bar_selection(clicked_bar, ax, app, right_click=False):
-    bar_id = clicked_bar.get_gid()
-    cash_flow_row = app.cash_flows.loc[bar_id] if bar_id is not None else None
-
-    if cash_flow_row is not None:
-        series_indices = app.cash_flows[
-            app.cash_flows["Series_ID"] == cash_flow_row['Series_ID']].index.tolist()
+def handle_bar_selection(bar_id, ax, app, right_click=False):
+    if bar_id is not None:
+        series_id = app.store.series_of([bar_id])[0]
+        series_indices = app.store.series_rows(series_id).tolist()
         is_single_cash_flow_series = len(series_indices) == 1
 
         if is_single_cash_flow_series:
@@ -226,39 +339,64 @@ def toggle_single_cash_flow_selection(bar_id, app, right_click=False):
 def toggle_series_selection(series_indices, app, right_click=False):
     # Toggle selection of a series
     # On right-click, only select (don't deselect if already selected)
-    if all(index in app.selected_indices for index in series_indices):
+    selected = set(app.selected_indices)
+    if selected.issuperset(series_indices):
         if not right_click:
-            app.selected_indices = [index for index in app.selected_indices if index not in series_indices]
+            series_set = set(series_indices)
+            app.selected_indices = [index for index in app.selected_indices if index not in series_set]
     else:
-        app.selected_indices.extend(index for index in series_indices if index not in app.selected_indices)
+        app.selected_indices.extend(index for index in series_indices if index not in selected)
 
 
-def update_selection_display(ax, app):
-    for rect in app.selection_rects:
-        rect.set_visible(False)
-    app.selection_rects.clear()
+def create_selection_overlay(ax, app):
+    """Add the animated highlight collection that outlines the selected bars."""
+    app.selection_overlay = PolyCollection([], facecolors='none', edgecolors='r', linewidths=2, animated=True)
+    ax.add_collection(app.selection_overlay, autolim=False)
 
-    selected_values = []
-    for bar in ax.patches:
-        bar_id = bar.get_gid()
-        if bar_id in app.selected_indices:
-            selection_rect = Rectangle(
-                (bar.get_x(), bar.get_y()), bar.get_width(), bar.get_height(),
-                linewidth=2, edgecolor='r', facecolor='none'
-            )
-            ax.add_patch(selection_rect)
-            app.selection_rects.append(selection_rect)
-
-            period = app.cash_flows.loc[bar_id, "Period"]
-            cash_flow_value = app.cash_flows.loc[bar_id, "Cash Flow"]
-            series_name = app.cash_flows.loc[bar_id, "Series_Name"]
-            selected_values.append([series_name, period, cash_flow_value])
-
-    create_table(app, selected_values) if selected_values else create_table(app, [])
-    app.update_canvas()
 
+def set_selection_overlay(app):
+    """Point the highlight collection at the currently selected bars."""
+    layout = app.bar_layout
+    if layout is None or not app.selected_indices or app.envelope_collection is not None:
+        app.selection_overlay.set_verts([])
+        return []
+    positions = [layout.positions[bar_id] for bar_id in app.selected_indices if bar_id in layout.positions]
+    app.selection_overlay.set_verts(bar_vertices(layout, np.array(positions, dtype=np.intp)))
+    return layout.row_ids[positions]
 
-def display_canvas(app, fig):
-    app.canvas = FigureCanvasTkAgg(fig, master=app.graph_frame)
-    app.canvas.draw()
-    app.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+def on_full_draw(app):
+    """Cache the freshly drawn diagram and paint the highlight layer over it."""
+    app.selection_background = app.canvas.copy_from_bbox(app.ax.bbox)
+    app.ax.draw_artist(app.selection_overlay)
+
+
+def blit_selection(app):
+    """Repaint only the highlight layer on top of the cached diagram."""
+    if app.selection_background is None:
+        app.canvas.draw()
+        return
+    app.canvas.restore_region(app.selection_background)
+    app.ax.draw_artist(app.selection_overlay)
+    app.canvas.blit(app.ax.bbox)
+
+
+def update_selection_display(ax, app):
+    set_selection_overlay(app)
+    blit_selection(app)
+    refresh_table(app)
+
+
+def refresh_table(app):
+    """Show the currently selected cash flows in the table."""
+    store = app.store
+    selected_values = []
+    if app.selected_indices and not store.empty:
+        # Read the selected rows from the store columns rather than building the DataFrame view
+        selected_ids = np.unique(np.asarray(app.selected_indices, dtype=np.int64))
+        positions = store.positions(selected_ids[store.contains(selected_ids)])
+        selected_values = [[store.series[series_id].name, period, amount] for series_id, period, amount
+                           in zip(store.series_id[positions].tolist(), store.period[positions].tolist(),
+                                  store.amount[positions].tolist())]
+
+    create_table(app, selected_values)
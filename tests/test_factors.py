@@ -0,0 +1,39 @@
+"""Tests for the cached interest factor tables."""
+import numpy as np
+
+from econogram.core.factors import InterestFactorCache, factor_cache
+from econogram.core.tvm import net_worths
+
+
+def test_powers_match_direct_computation():
+    cache = InterestFactorCache(max_horizon=1000)
+    for rate in (0.05, -0.02, 0.0):
+        for exponents in (np.arange(-40, 41), np.array([-900, 3, 950]), np.array([-5000, 0, 7000])):
+            assert np.array_equal(cache.powers(rate, exponents), np.power(1 + rate, exponents.astype(np.float64)))
+        assert cache.power(rate, 5000) == float(np.power(1 + rate, 5000.0))
+
+
+def test_discounting_only_builds_the_negative_side():
+    cache = InterestFactorCache()
+    cache.powers(0.05, -np.arange(1000))
+    table = cache.tables[0.05]
+    assert table.low == -999
+    assert table.high == 0
+
+
+def test_far_apart_exponents_are_not_cached():
+    cache = InterestFactorCache(max_horizon=1000)
+    cache.powers(0.05, [0, -50_000_000])
+    assert cache.stats()["direct"] == 1
+    assert 0.05 not in cache.tables
+
+    # A dense request may cache past max_horizon, in proportion to its size
+    cache.powers(0.05, -np.arange(3000))
+    assert cache.tables[0.05].low == -2999
+
+
+def test_net_worths_of_a_far_flow_stays_small():
+    # The future worth 50M periods out overflows to infinity
+    with np.errstate(over="ignore"):
+        net_worths(np.array([0, 50_000_000]), np.array([-100.0, 100.0]), 0.07, 0)
+    assert all(len(table.values) <= 2 * factor_cache.max_horizon + 1 for table in factor_cache.tables.values())
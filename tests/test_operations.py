@@ -0,0 +1,33 @@
+"""Tests for the diagram operations in econogram.core.operations."""
+import pytest
+
+from econogram.core.factors import factor_cache
+from econogram.core.operations import annual_value
+from econogram.core.store import CashFlowStore
+
+
+def test_annual_value_in_place_keeps_the_series_name():
+    store = CashFlowStore()
+    row_ids = store.append_series(1, "Plant", "C3", [0, 5], [-1000.0, 200.0])
+
+    new_series_id = annual_value(store, row_ids[0], 4, 0.05)
+    assert new_series_id != 1
+    assert store.series[1].name == "Plant"
+    assert store.series_rows(1).tolist() == [row_ids[1]]
+
+    info = store.series[new_series_id]
+    assert (info.name, info.color) == ("AV of Plant", "C3")
+    rows = store.positions(store.series_rows(new_series_id))
+    assert store.period[rows].tolist() == [1, 2, 3, 4]
+    assert store.amount[rows] == pytest.approx(-1000.0 * factor_cache.ap(0.05, 4))
+    store.check_consistency()
+
+
+def test_annual_value_as_new_series_keeps_the_flow():
+    store = CashFlowStore()
+    row_ids = store.append_series(1, "Plant", "C3", [0], [-1000.0])
+
+    new_series_id = annual_value(store, row_ids[0], 4, 0.05, make_new_series=True, next_color=lambda: "C4")
+    assert store.series_rows(1).tolist() == row_ids.tolist()
+    assert (store.series[new_series_id].name, store.series[new_series_id].color) == ("AV of Plant", "C4")
+    assert len(store) == 5
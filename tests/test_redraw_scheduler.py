@@ -0,0 +1,90 @@
+"""Tests for the coalesced redraw scheduler of CashFlowDiagramApp."""
+import numpy as np
+
+import scripts.Delete_Series as Delete_Series
+import scripts.Final_CFD as Final_CFD
+from econogram.core.journal import EditJournal
+from econogram.core.store import CashFlowStore
+from scripts.Final_CFD import CashFlowDiagramApp, ColorManager
+
+SERIES_COUNT = 50
+
+
+class IdleRoot:
+    """Collects after_idle callbacks instead of running a Tk event loop."""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after_idle(self, callback):
+        self.callbacks.append(callback)
+        return f"after#{len(self.callbacks)}"
+
+    def run_idle(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+def scheduler_app(monkeypatch):
+    """An app with only the state the scheduler and the bulk edits use, and no window."""
+    monkeypatch.setattr(Final_CFD, "update_plot", lambda app: None)
+    monkeypatch.setattr(Final_CFD, "refresh_table", lambda app: None)
+    monkeypatch.setattr(Final_CFD, "refresh_worth_display", lambda app: None)
+    store = CashFlowStore()
+    for series_id in range(1, SERIES_COUNT + 1):
+        store.append_series(series_id, f"Series {series_id}", f"C{series_id % 10}", np.arange(10), float(series_id))
+
+    app = CashFlowDiagramApp.__new__(CashFlowDiagramApp)
+    app.root = IdleRoot()
+    app.store = store
+    app.journal = EditJournal(store)
+    app.color_manager = ColorManager()
+    app.selected_indices = []
+    app._plot_dirty = False
+    app._table_dirty = False
+    app._redraw_pending = None
+    app.render_count = 0
+    app._transaction_depth = 0
+    return app
+
+
+def test_multi_series_edits_render_once(monkeypatch):
+    monkeypatch.setattr(Delete_Series.messagebox, "askyesno", lambda *args: True)
+    app = scheduler_app(monkeypatch)
+
+    app.selected_indices = app.store.row_id.tolist()
+    app.invert_selected_series()
+    assert len(app.root.callbacks) == 1
+    app.root.run_idle()
+    assert app.render_count == 1
+    assert len(app.journal.undo_stack) == 1
+
+    # Several bulk edits in one outer transaction are still one render and one undo step
+    with app.transaction():
+        app.selected_indices = app.store.series_rows(1).tolist() + app.store.series_rows(2).tolist()
+        app.invert_selected_series()
+        app.selected_indices = app.store.row_id[:200].tolist()
+        app.delete_selected_series()
+    assert len(app.root.callbacks) == 1
+    app.root.run_idle()
+    assert app.render_count == 2
+    assert len(app.journal.undo_stack) == 2
+    assert len(app.store.series) == SERIES_COUNT - 20
+
+
+def test_consecutive_redraw_requests_coalesce(monkeypatch):
+    app = scheduler_app(monkeypatch)
+    app.request_redraw()
+    app.update_canvas()
+    app.update_plot()
+    app.request_redraw(plot=False, table=True)
+    assert len(app.root.callbacks) == 1
+    app.root.run_idle()
+    assert app.render_count == 1
+
+    # Once rendered, the next request schedules a new pass
+    app.update_canvas()
+    assert len(app.root.callbacks) == 1
+    app.root.run_idle()
+    assert app.render_count == 2
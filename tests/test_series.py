@@ -0,0 +1,78 @@
+"""Tests that the closed-form series worths match summing the expanded flows."""
+import numpy as np
+import pytest
+
+from econogram.core.operations import present_worths, future_worths, split_series
+from econogram.core.series import UniformSeries, GradientSeries, GeometricSeries
+from econogram.core.store import CashFlowStore
+
+RATES = (0.06, 0.04, 0.0, -0.02)
+SERIES = [
+    UniformSeries(250, 1, 12),
+    UniformSeries(-40, -5, 30),
+    GradientSeries(75, 3, 20),
+    GradientSeries(-10, -10, 15),
+    GeometricSeries(1000, 0.04, 1, 25),
+    GeometricSeries(1000, 0.06, 2, 25),
+    GeometricSeries(500, -0.03, -4, 10),
+]
+
+
+def expanded_worth(periods, amounts, rate, period):
+    """The worth of the flows at period, one flow at a time."""
+    return float(np.sum(amounts * (1 + rate) ** -(periods - period).astype(np.float64)))
+
+
+@pytest.mark.parametrize("rate", RATES)
+@pytest.mark.parametrize("spec", SERIES, ids=lambda spec: f"{type(spec).__name__}@{spec.start}")
+def test_closed_form_matches_expanded_flows(spec, rate):
+    periods, amounts = spec.periods(), spec.amounts()
+    assert spec.present_worth(rate) == pytest.approx(expanded_worth(periods, amounts, rate, spec.start - 1))
+    assert spec.future_worth(rate) == pytest.approx(expanded_worth(periods, amounts, rate, spec.end))
+    for period in (-12, spec.start, spec.end + 7):
+        assert spec.worth_at(rate, period) == pytest.approx(expanded_worth(periods, amounts, rate, period))
+
+
+def test_geometric_growth_equal_to_rate():
+    # With g == i every flow is worth A1 / (1 + i) at period start - 1
+    spec = GeometricSeries(1000, 0.05, 1, 40)
+    assert spec.present_worth(0.05) == pytest.approx(40 * 1000 / 1.05)
+    assert spec.present_worth(0.05) == pytest.approx(expanded_worth(spec.periods(), spec.amounts(), 0.05, 0))
+
+
+def store_of(specs):
+    store = CashFlowStore()
+    for series_id, spec in enumerate(specs, start=1):
+        store.append_spec(series_id, f"Series {series_id}", "C0", spec)
+    return store
+
+
+def check_worths(store, row_ids, rate):
+    """present_worths/future_worths of row_ids agree with summing each series' selected flows."""
+    for worths, forward in ((present_worths, False), (future_worths, True)):
+        for equivalent in worths(store, row_ids, rate):
+            rows = store.positions(equivalent.row_ids)
+            periods, amounts = store.period[rows], store.amount[rows]
+            assert equivalent.period == (periods.max() if forward else periods.min() - 1)
+            assert equivalent.value == pytest.approx(expanded_worth(periods, amounts, rate, equivalent.period))
+
+
+@pytest.mark.parametrize("rate", RATES)
+def test_store_worths_of_whole_series(rate):
+    store = store_of(SERIES)
+    assert all(info.spec is not None for info in store.series.values())
+    check_worths(store, store.row_id, rate)
+
+
+@pytest.mark.parametrize("rate", RATES)
+def test_store_worths_after_the_pattern_breaks(rate):
+    store = store_of(SERIES)
+    # Split the first series, delete flows from the middle of two others, and select part of the last
+    parts = split_series(store, 1, cut_periods=[5])
+    store.remove_rows(store.series_rows(2)[[3, 10]])
+    store.remove_rows(store.series_rows(5)[5:9])
+    assert all(store.series[series_id].spec is None for series_id in parts + [2, 5])
+
+    selection = store.row_id[store.series_id != 7]
+    selection = np.concatenate((selection, store.series_rows(7)[:6]))
+    check_worths(store, selection, rate)
@@ -0,0 +1,34 @@
+"""Tests for the cash flow store's bulk edits."""
+import numpy as np
+
+from econogram.core.journal import EditJournal
+from econogram.core.series import UniformSeries
+from econogram.core.store import CashFlowStore
+
+
+def test_scale_series_is_one_pass_and_undoes():
+    store = CashFlowStore()
+    for series_id in range(500):
+        if series_id % 2:
+            store.append_series(series_id, f"Series {series_id}", "C0", np.arange(20), float(series_id))
+        else:
+            store.append_spec(series_id, f"Series {series_id}", "C0", UniformSeries(float(series_id), 1, 20))
+    journal = EditJournal(store)
+    before = store.to_frame().copy()
+    specs = {series_id: info.spec for series_id, info in store.series.items()}
+
+    store.scale_series(range(500), -1)
+    assert [change[0] for change in store._changes] == ["set", "series_many"]
+    journal.checkpoint()
+    after = store.to_frame().copy()
+    assert np.array_equal(after["Cash Flow"], -before["Cash Flow"])
+    for series_id, spec in specs.items():
+        if spec is not None:
+            assert store.series[series_id].spec.present_worth(0.05) == -spec.present_worth(0.05)
+
+    journal.undo()
+    assert store.to_frame().equals(before)
+    assert all(store.series[series_id].spec is spec for series_id, spec in specs.items())
+    journal.redo()
+    assert store.to_frame().equals(after)
+    store.check_consistency()
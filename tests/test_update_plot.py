@@ -0,0 +1,66 @@
+"""Regression tests for the persistent figure and canvas of update_plot."""
+import gc
+
+from matplotlib import pyplot as plt
+from matplotlib.figure import Figure
+
+from econogram.core.store import CashFlowStore
+from scripts.Update_Plot import update_plot
+from benchmarks.common import PlotApp, use_agg_canvas, rss_bytes
+
+UPDATES = 100
+WARM_UP = 20
+RSS_GROWTH_LIMIT = 10 * 1024 * 1024
+
+
+def sample_store(series_count=4, periods=20):
+    """A small diagram: an initial cost and a few overlapping series of alternating sign."""
+    store = CashFlowStore()
+    store.append_series(1, "Initial cost", "C0", [0], [-5000.0])
+    for series_id in range(2, series_count + 2):
+        sign = 1 if series_id % 2 else -1
+        store.append_series(series_id, f"Series {series_id}", f"C{series_id % 10}", range(1, periods + 1),
+                            [sign * 100.0 * series_id] * periods)
+    return store
+
+
+def live_figures():
+    return sum(isinstance(obj, Figure) for obj in gc.get_objects())
+
+
+def test_update_plot_reuses_one_figure(monkeypatch):
+    use_agg_canvas(monkeypatch)
+    app = PlotApp(sample_store())
+    update_plot(app)
+    figure, canvas = app.figure, app.canvas
+
+    update_plot(app)
+    assert app.figure is figure
+    assert app.canvas is canvas
+    # Clearing in place leaves only the diagram drawn by the last update
+    assert len(app.ax.legend_.legend_handles) == len(app.store.series)
+
+
+def test_update_plot_memory_and_figures_stay_flat(monkeypatch):
+    use_agg_canvas(monkeypatch)
+    app = PlotApp(sample_store())
+    update_plot(app)
+    # A small canvas keeps each redraw cheap; a leak still shows as growth
+    app.figure.set_size_inches(4, 3)
+    app.figure.set_dpi(50)
+    for _ in range(WARM_UP):
+        update_plot(app)
+    gc.collect()
+    figures_before = live_figures()
+    children_before = len(app.ax.get_children())
+    rss_before = rss_bytes()
+
+    for _ in range(UPDATES):
+        update_plot(app)
+    gc.collect()
+
+    assert live_figures() == figures_before
+    assert len(app.ax.get_children()) == children_before
+    assert plt.get_fignums() == []
+    if rss_before is not None:
+        assert rss_bytes() - rss_before < RSS_GROWTH_LIMIT